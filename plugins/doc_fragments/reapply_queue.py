@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+# (C) Copyright 2020-2025 Hewlett Packard Enterprise Development LP.
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Reapply queue option of the modules supporting operation reapply
+    DOCUMENTATION = r"""
+options:
+    reapply_queue:
+        description: >
+            Path of a reapply queue file on the host running the module. When
+            set, operation reapply does not reapply the configuration but
+            records it in the queue, once per object however many tasks
+            request it. The queued reapplies are sent to AFC by the
+            afc_reapply module, typically from a handler at the end of the
+            play, lower layers first. The task reports a change only when
+            the reapply is added to the queue. The file is created when
+            missing and holds the pending reapplies of each afc_ip. It is
+            locked while it is read or updated and replaced atomically, so
+            the tasks of several hosts or playbook runs can share it.
+            Reapplies failing in afc_reapply stay queued for its next run.
+        type: path
+        required: false
+"""
@@ -9,6 +9,15 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import fcntl
+import ipaddress
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
 try:
     from pyafc.afc import afc
 
@@ -18,6 +27,10 @@ except ImportError as import_error:
     HAS_PYAFC = False
     PYAFC_IMPORT_ERROR = import_error
 
+DEFAULT_MAX_WORKERS = 8
+
+SWITCH_ROLES = ["spine", "leaf", "sub_leaf", "border_leaf"]
+
 
 def instantiate_afc_object(data=None):
     afc_instance = afc.Afc(data=data)
@@ -58,3 +71,454 @@ def build_auth_data(ansible_module):
         }
     auth_data["verify"] = not params["disable_tls_verification"]
     return auth_data
+
+
+def chunked(items, size):
+    """Yield consecutive lists of at most size items."""
+    items = list(items)
+    size = max(int(size or 1), 1)
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
+def _timed(worker, item):
+    """Run worker on item and return its outcome with the elapsed time."""
+    start = time.monotonic()
+    try:
+        message, status, changed = worker(item)
+    except Exception as exc:
+        message, status, changed = str(exc), False, False
+    return {
+        "message": message,
+        "status": status,
+        "changed": changed,
+        "elapsed": round(time.monotonic() - start, 3),
+    }
+
+
+def run_concurrently(worker, items, max_workers=DEFAULT_MAX_WORKERS):
+    """Run worker on every item using a bounded thread pool.
+
+    The worker follows the pyafc convention and returns a
+    (message, status, changed) tuple. An exception raised by the worker is
+    reported as a failed result so one item cannot abort the others.
+    Results are returned in the order of items, each as a dict holding
+    message, status, changed and the elapsed time in seconds.
+    """
+    items = list(items)
+    if not items:
+        return []
+    workers = max(min(int(max_workers or 1), len(items)), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda item: _timed(worker, item), items))
+
+
+def run_grouped(worker, items, key, max_workers=DEFAULT_MAX_WORKERS):
+    """Run worker on items, concurrently across groups of items.
+
+    Items sharing the same key, such as the same VRF, are processed one
+    after the other while the groups run concurrently. The results follow
+    run_concurrently and are returned in the order of items.
+    """
+    items = list(items)
+    groups = {}
+    for index, item in enumerate(items):
+        groups.setdefault(key(item), []).append(index)
+    outcomes = {}
+
+    def process(indexes):
+        for index in indexes:
+            outcomes[index] = _timed(worker, items[index])
+        return "", True, False
+
+    run_concurrently(process, groups.values(), max_workers=max_workers)
+    return [outcomes[index] for index in range(len(items))]
+
+
+def run_rolling(
+    worker,
+    items,
+    batch_size,
+    max_workers=DEFAULT_MAX_WORKERS,
+    max_fail_percentage=0,
+    gate=None,
+):
+    """Run worker on items one batch after the other.
+
+    The items of a batch run concurrently through run_concurrently. Once a
+    batch is done, gate, when given, is called with the items and outcomes
+    of the batch and may mark outcomes as failed, for instance when a
+    switch does not come back healthy. When the failed items of a batch
+    exceed max_fail_percentage of the batch, the following batches are
+    skipped and reported as failed. Results follow run_concurrently, with
+    the 1-based batch number, and are returned in the order of items.
+    """
+    results = []
+    aborted = 0
+    for number, batch in enumerate(chunked(items, batch_size), start=1):
+        if aborted:
+            results.extend(
+                {
+                    "message": (
+                        "Skipped - max_fail_percentage exceeded in batch "
+                        f"{aborted}"
+                    ),
+                    "status": False,
+                    "changed": False,
+                    "elapsed": 0,
+                    "batch": number,
+                }
+                for _ in batch
+            )
+            continue
+        outcomes = run_concurrently(worker, batch, max_workers=max_workers)
+        if gate is not None:
+            gate(batch, outcomes)
+        failed = [outcome for outcome in outcomes if not outcome["status"]]
+        if len(failed) * 100 > max_fail_percentage * len(batch):
+            aborted = number
+        results.extend({**outcome, "batch": number} for outcome in outcomes)
+    return results
+
+
+def summarize_results(results, kind="items"):
+    """Reduce per-item results into a single (message, status, changed).
+
+    Each result is a dict with at least name, message, status and changed.
+    The summary message counts changed, unchanged and failed items and
+    lists the failure messages.
+    """
+    failed = [item for item in results if not item["status"]]
+    changed = [item for item in results if item["changed"]]
+    unchanged = [
+        item for item in results if item["status"] and not item["changed"]
+    ]
+    message = (
+        f"Processed {len(results)} {kind}: {len(changed)} changed, "
+        f"{len(unchanged)} unchanged, {len(failed)} failed"
+    )
+    if failed:
+        message += " - " + "; ".join(
+            f"{item['name']}: {item['message']}" for item in failed
+        )
+    return message, not failed, bool(changed)
+
+
+def find_overlaps(intervals):
+    """Return the pairs of keys whose closed intervals overlap.
+
+    intervals is an iterable of (start, end, key) tuples. The intervals are
+    sorted once by start and swept while keeping the furthest reaching
+    interval seen so far, so checking n intervals costs O(n log n) instead
+    of comparing every pair. Every interval overlapping another one appears
+    in at least one of the returned pairs.
+    """
+    overlaps = []
+    reach = None
+    for start, end, key in sorted(intervals, key=lambda entry: entry[:2]):
+        if reach is not None and start <= reach[0]:
+            overlaps.append((reach[1], key))
+        if reach is None or end > reach[0]:
+            reach = (end, key)
+    return overlaps
+
+
+def expand_range(value):
+    """Return the IPv4 addresses of a single address or a first-last range."""
+    if "-" not in value:
+        return [str(ipaddress.IPv4Address(value.strip()))]
+    first, last = (
+        ipaddress.IPv4Address(bound.strip()) for bound in value.split("-", 1)
+    )
+    if last < first:
+        raise ValueError(f"Invalid address range {value}")
+    return [
+        str(ipaddress.IPv4Address(address))
+        for address in range(int(first), int(last) + 1)
+    ]
+
+
+def _vlan_ranges(value):
+    """Yield the (first, last) VLAN ranges of a VLAN list."""
+    entries = value if isinstance(value, list) else [value]
+    for entry in entries:
+        for part in str(entry).split(","):
+            if not part.strip():
+                continue
+            first, _, last = part.partition("-")
+            first = int(first)
+            last = int(last) if last else first
+            if not 1 <= first <= last <= 4094:
+                raise ValueError(f"Invalid VLAN range {part.strip()}")
+            yield first, last
+
+
+def expand_vlans(value):
+    """Return the sorted VLAN IDs of a VLAN list such as 10,20-30.
+
+    A list of such strings or of VLAN IDs is accepted as well.
+    """
+    vlans = set()
+    for first, last in _vlan_ranges(value):
+        vlans.update(range(first, last + 1))
+    return sorted(vlans)
+
+
+def vlan_intervals(value):
+    """Return a VLAN list as sorted and merged (first, last) intervals.
+
+    The VLANs are never expanded, so the cost only depends on the number of
+    ranges of the list.
+    """
+    intervals = []
+    for first, last in sorted(_vlan_ranges(value)):
+        if intervals and first <= intervals[-1][1] + 1:
+            intervals[-1] = (intervals[-1][0], max(intervals[-1][1], last))
+        else:
+            intervals.append((first, last))
+    return intervals
+
+
+def subtract_intervals(intervals, removed):
+    """Return the parts of sorted intervals not covered by removed ones.
+
+    Both lists are sorted and merged, as returned by vlan_intervals, and
+    are walked once together.
+    """
+    result = []
+    index = 0
+    for first, last in intervals:
+        while index < len(removed) and removed[index][1] < first:
+            index += 1
+        cursor = first
+        probe = index
+        while probe < len(removed) and removed[probe][0] <= last:
+            low, high = removed[probe]
+            if low > cursor:
+                result.append((cursor, low - 1))
+            cursor = max(cursor, high + 1)
+            probe += 1
+        if cursor <= last:
+            result.append((cursor, last))
+    return result
+
+
+def format_intervals(intervals):
+    """Return intervals as a VLAN list such as 10,20-30."""
+    return ",".join(
+        str(first) if first == last else f"{first}-{last}"
+        for first, last in intervals
+    )
+
+
+def compress_vlans(vlans):
+    """Return VLAN IDs as the shortest VLAN list, such as 10,20-30."""
+    return format_intervals(vlan_intervals(list(vlans)))
+
+
+def resolve_switches(fabric_switches, entries):
+    """Return the UUIDs of the fabric switches matching the entries.
+
+    An entry is a switch IP address, an IP range, a switch name, a role or
+    all.
+    """
+    uuids = []
+    for entry in entries or []:
+        if entry == "all":
+            matches = list(fabric_switches)
+        elif entry in SWITCH_ROLES:
+            matches = [
+                switch for switch in fabric_switches
+                if switch.get("role") == entry
+            ]
+        else:
+            try:
+                targets = set(expand_range(entry))
+            except ValueError:
+                targets = {entry}
+            matches = [
+                switch for switch in fabric_switches
+                if switch.get("ip_address") in targets
+                or switch.get("name") in targets
+            ]
+        if not matches:
+            raise ValueError(f"Switch {entry} not found in the fabric")
+        uuids.extend(
+            switch["uuid"] for switch in matches
+            if switch["uuid"] not in uuids
+        )
+    return uuids
+
+
+def switch_ports(client, switches, max_workers=DEFAULT_MAX_WORKERS):
+    """Return the ports of the switches, concurrently read per switch.
+
+    Each request filters the ports on a single switch, the form pyafc uses
+    for the ports collection.
+    """
+    ports = {}
+
+    def read(switch):
+        request = client.get(f"ports?switches={switch['uuid']}")
+        ports[switch["uuid"]] = request.json()["result"] or []
+        return "", True, False
+
+    run_concurrently(read, switches, max_workers=max_workers)
+    return [
+        port for switch in switches for port in ports.get(switch["uuid"], [])
+    ]
+
+
+def adjacency_index(ports):
+    """Return the links between switches seen by LLDP on their ports.
+
+    Links are keyed by the pair of switch UUIDs, and each link is stored
+    once whichever end reported it, so looking up the links of a pair does
+    not depend on the number of ports of the fabric.
+    """
+    links = {}
+    for port in ports:
+        for neighbor in port.get("neighbors") or []:
+            peer = neighbor.get("switch_uuid")
+            if not peer or peer == port["switch_uuid"]:
+                continue
+            links.setdefault(
+                frozenset((port["switch_uuid"], peer)),
+                set(),
+            ).add(frozenset((port["uuid"], neighbor.get("port_uuid"))))
+    return links
+
+
+def _comparable_items(items, keys):
+    """Return list items as sorted strings, dicts limited to keys."""
+    return sorted(
+        json.dumps(
+            {key: value for key, value in item.items() if key in keys},
+            sort_keys=True,
+        )
+        if isinstance(item, dict)
+        else str(item)
+        for item in items
+    )
+
+
+def config_differences(current, wanted, prefix=""):
+    """Return the paths of the wanted values differing from current.
+
+    Dicts are compared on the wanted keys only and keys missing from
+    current are ignored, so values AFC adds or omits in what it returns do
+    not count as differences. Lists are compared regardless of order, and
+    dicts in lists on the keys used by the wanted ones.
+    """
+    paths = []
+    for key, value in wanted.items():
+        if key not in current:
+            continue
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and isinstance(current[key], dict):
+            paths.extend(config_differences(current[key], value, path + "."))
+        elif isinstance(value, list) and isinstance(current[key], list):
+            keys = {
+                item_key
+                for item in value
+                if isinstance(item, dict)
+                for item_key in item
+            }
+            if _comparable_items(value, keys) != _comparable_items(
+                current[key],
+                keys,
+            ):
+                paths.append(path)
+        elif current[key] != value:
+            paths.append(path)
+    return paths
+
+
+def fabric_vrf_index(client):
+    """Return the fabric UUIDs by name and the VRF UUIDs by fabric and name.
+
+    Both are read with one request each, for modules processing many VRFs.
+    """
+    fabrics = {
+        item["name"]: item["uuid"]
+        for item in client.get("fabrics").json()["result"] or []
+    }
+    vrfs = {
+        (item.get("fabric_uuid"), item["name"]): item["uuid"]
+        for item in client.get("vrfs").json()["result"] or []
+    }
+    return fabrics, vrfs
+
+
+def resource_pool_index(client, pool_type):
+    """Return the UUIDs of the resource pools of a type by name."""
+    request = client.get(f"resource_pool?resource_type={pool_type}")
+    return {
+        pool["name"]: pool["uuid"] for pool in request.json()["result"] or []
+    }
+
+
+def describe_reapply(target):
+    """Return a readable name for a reapply queue entry."""
+    parts = [target["type"], target["fabric"]]
+    parts.extend(
+        target[key] for key in ["vrf", "name"] if target.get(key) is not None
+    )
+    return "/".join(parts)
+
+
+@contextmanager
+def locked_json_file(path):
+    """Load a JSON object file shared between tasks under an exclusive lock.
+
+    Tasks of several hosts or runs may update the file at the same time,
+    so it is only read and written while holding a lock on a companion
+    .lock file. The object is yielded for in place updates and written
+    back with an atomic rename when it changed. A missing or unreadable
+    file reads as an empty object.
+    """
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(path) as json_file:
+                content = json.load(json_file)
+        except (IOError, OSError, ValueError):
+            content = {}
+        original = json.dumps(content, sort_keys=True)
+        yield content
+        if json.dumps(content, sort_keys=True) == original:
+            return
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(handle, "w") as temp_file:
+            json.dump(content, temp_file, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+
+
+def locked_reapply_queue(path):
+    """Load the reapply queue file under an exclusive lock.
+
+    The queue is a JSON object mapping each AFC IP address to its list of
+    pending reapply entries, handled by locked_json_file.
+    """
+    return locked_json_file(path)
+
+
+def queue_reapply(path, afc_ip, target):
+    """Record a reapply in the queue instead of sending it to AFC.
+
+    target is a dict holding the type (vrf, underlay, overlay, evpn or
+    vsx), the fabric and, depending on the type, the vrf and name. An entry
+    already pending is not added again, so the afc_reapply module issues
+    one reapply per object however many tasks requested it. Only adding an
+    entry reports a change, so a handler notified by the task runs when
+    there is something to flush.
+    """
+    target = {key: value for key, value in target.items() if value is not None}
+    with locked_reapply_queue(path) as queue:
+        pending = queue.setdefault(afc_ip, [])
+        if target in pending:
+            message = f"Reapply of {describe_reapply(target)} already queued"
+            return message, True, False
+        pending.append(target)
+    return f"Reapply of {describe_reapply(target)} queued", True, True
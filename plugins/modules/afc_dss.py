@@ -11,7 +11,9 @@ module: afc_dss
 version_added: "0.0.1"
 short_description: Create a DSS configuration item.
 description: >
-    This module creates a DSS configuration item.
+    This module creates a DSS configuration item. A whole policy bundle made
+    of qualifiers, endpoint groups, rules and policies can also be applied
+    in one task with the bundle option.
 options:
     afc_ip:
         description: >
@@ -44,12 +46,15 @@ options:
     operation:
         description: >
             Operation to be performed on the DSS configuration,
-            create or update (only network).
+            create or update (only network). sync (only endpoint_group)
+            aligns the members of an existing endpoint group with the
+            endpoints of data by sending only the members to add and remove.
         type: str
         choices:
             - create
             - delete
             - update
+            - sync
         required: true
     data:
         description: >
@@ -179,6 +184,12 @@ options:
                 elements: dict
                 required: false
                 suboptions:
+                    ip:
+                        description: >
+                            IPv4 address or network of the endpoint. Only
+                            IP endpoints are supported by operation sync.
+                        type: str
+                        required: false
                     vm_name:
                         description: Name of the VM
                         type: str
@@ -227,7 +238,73 @@ options:
                     Enable Service Bypass on this Network
                 type: str
                 required: true
-        required: true
+        required: false
+    bundle:
+        description: >
+            DSS policy bundle applied in one task. Mutually exclusive with
+            data. On create, the objects are created in dependency order,
+            qualifiers first, then endpoint groups, rules and policies, and
+            the objects of each level are submitted concurrently. On delete,
+            the reverse order is used. Objects that already exist are
+            compared with the bundle and only their differing attributes are
+            updated, and objects referencing an unknown or failed object
+            are not submitted.
+        type: dict
+        suboptions:
+            qualifiers:
+                description: >
+                    List of qualifiers, using the qualifier structure of data.
+                type: list
+                elements: dict
+                required: false
+            endpoint_groups:
+                description: >
+                    List of endpoint groups, using the endpoint group
+                    structure of data.
+                type: list
+                elements: dict
+                required: false
+            rules:
+                description: >
+                    List of rules, using the rule structure of data.
+                type: list
+                elements: dict
+                required: false
+            policies:
+                description: >
+                    List of policies, using the policy structure of data.
+                type: list
+                elements: dict
+                required: false
+        required: false
+    max_parallel:
+        description: >
+            Maximum number of objects of the same level submitted to AFC at
+            the same time when bundle is used.
+        type: int
+        default: 8
+        required: false
+    chunk_size:
+        description: >
+            Maximum number of endpoint additions and removals sent in one
+            request with operation sync.
+        type: int
+        default: 500
+        required: false
+    cache_path:
+        description: >
+            Path of a JSON file on the host running the module where the
+            content hashes of successfully created bundles are stored. When
+            set, creating a bundle whose canonical content hash is already
+            recorded for this AFC reads each DSS collection once and, when
+            every object of the bundle still exists with the same settings,
+            returns changed false without sending anything. Objects changed
+            or removed on AFC since the bundle was applied make the bundle
+            be applied again. The endpoints of vSphere endpoint groups are
+            not compared. The file is locked while it is read or updated,
+            so runs sharing it do not lose each other's updates.
+        type: path
+        required: false
 
 author: Aruba Networks (@ArubaNetworks)
 """
@@ -327,6 +404,21 @@ EXAMPLES = r"""
                     vnic_name: "Network adapter 1"
         operation: "create"
 
+-   name: Synchronize endpoint group members using username and password
+    arubanetworks.afc.afc_dss:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "sync"
+        chunk_size: 500
+        data:
+            name: "test_eg"
+            type: "endpoint_group"
+            endpoints:
+                -   ip: "10.1.1.10"
+                -   ip: "10.1.1.11"
+                -   ip: "10.1.2.0/24"
+
 -   name: Delete endpoint group using username and password
     arubanetworks.afc.afc_dss:
         afc_ip: "10.10.10.10"
@@ -376,6 +468,48 @@ EXAMPLES = r"""
             service_bypass: true
         operation: "create"
 
+-   name: Create a DSS policy bundle using username and password
+    arubanetworks.afc.afc_dss:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "create"
+        bundle:
+            qualifiers:
+                -   name: "https"
+                    protocol_identifier:
+                        -   dst_port: "443"
+                            ip_protocol: "tcp"
+            endpoint_groups:
+                -   name: "web"
+                    eg_type: "layer3"
+                    endpoints:
+                        -   ip: "10.1.1.0/24"
+                -   name: "clients"
+                    eg_type: "layer3"
+                    endpoints:
+                        -   ip: "10.2.0.0/16"
+            rules:
+                -   name: "AllowHttps"
+                    action: "allow"
+                    source_endpoint_groups:
+                        - "clients"
+                    destination_endpoint_groups:
+                        - "web"
+                    service_qualifiers:
+                        - "https"
+            policies:
+                -   name: "web_policy"
+                    policy_subtype: "firewall"
+                    priority: 1
+                    enforcers:
+                        - direction: egress
+                          enforcer_type: vrf
+                          fabric: Aruba-Fabric
+                          vrf: Aruba-VRF
+                    rules:
+                        - AllowHttps
+
 -   name: Update network using username and password
     arubanetworks.afc.afc_dss:
         afc_ip: "10.10.10.10"
@@ -557,17 +691,490 @@ changed:
     type: bool
     returned: always
     sample: True
+bundle_hash:
+    description: SHA-256 hash of the canonicalized bundle
+    type: str
+    returned: when bundle is provided
+    sample: "5d0d8b0f6c7e6a1e9f7c2b0a4f3d2e1c0b9a8f7e6d5c4b3a2918f7e6d5c4b3a2"
+results:
+    description: Per object outcome when bundle is used, in apply order
+    type: list
+    elements: dict
+    returned: when bundle is provided
+    sample:
+        -   name: "https"
+            type: "qualifier"
+            message: "Successfully created qualifier https"
+            status: True
+            changed: True
 """
 
+import hashlib
+import ipaddress
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
+    chunked,
+    config_differences,
     instantiate_afc_object,
+    locked_json_file,
+    run_concurrently,
+    summarize_results,
 )
-from pyafc.dss import endpoint_groups, policies, qualifiers, rules
+from pyafc.common import utils
+from pyafc.dss import endpoint_groups, models, policies, qualifiers, rules
 from pyafc.fabric import fabric
-from pyafc.vrf import vrf
+from pyafc.vrf import networks, vrf
+
+# Bundle levels in dependency order: (bundle key, object type, AFC collection)
+BUNDLE_LEVELS = [
+    ("qualifiers", "qualifier", "qualifiers"),
+    ("endpoint_groups", "endpoint_group", "endpoint_groups"),
+    ("rules", "rule", "rules"),
+    ("policies", "policy", "policies"),
+]
+
+# Attributes holding references to other objects: (attribute, collection)
+BUNDLE_REFERENCES = {
+    "rule": [
+        ("source_endpoint_groups", "endpoint_groups"),
+        ("destination_endpoint_groups", "endpoint_groups"),
+        ("service_qualifiers", "qualifiers"),
+        ("applications", "applications"),
+    ],
+    "policy": [("rules", "rules"), ("rules_disabled", "rules")],
+}
+
+
+def canonicalize(value):
+    """Drop unset values so equivalent definitions serialize identically."""
+    if isinstance(value, dict):
+        return {
+            key: canonicalize(item)
+            for key, item in value.items()
+            if item is not None
+        }
+    if isinstance(value, list):
+        return [canonicalize(item) for item in value]
+    return value
+
+
+def bundle_digest(bundle):
+    """Return the SHA-256 hash of the canonical JSON form of a bundle."""
+    content = {
+        key: canonicalize(bundle[key])
+        for key, _object_type, _collection in BUNDLE_LEVELS
+        if bundle.get(key)
+    }
+    serialized = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def record_bundle(cache_path, afc_ip, digest, entry):
+    """Record or, when entry is None, forget a bundle hash in the cache."""
+    with locked_json_file(cache_path) as cache:
+        afc_cache = cache.setdefault(afc_ip, {})
+        if entry is None:
+            afc_cache.pop(digest, None)
+        else:
+            afc_cache[digest] = entry
+        if not afc_cache:
+            cache.pop(afc_ip)
+
+
+def cached_bundle_is_current(engine, bundle):
+    """Check that every object of a bundle exists on AFC and matches it.
+
+    Each object is compared with its AFC payload, references resolved, as
+    on update, so the bundle is only skipped when applying it would change
+    nothing. vSphere endpoint groups are only checked for existence.
+    """
+    engine.load_all(bundle)
+    for key, object_type, collection in BUNDLE_LEVELS:
+        for values in bundle.get(key) or []:
+            current = engine.inventory[collection].get(values["name"])
+            if current is None:
+                return False
+            try:
+                payload = engine.payload(object_type, values)
+            except (KeyError, ValueError):
+                return False
+            if payload is not None and config_differences(
+                current,
+                payload.dict(exclude_none=True),
+            ):
+                return False
+    return True
+
+
+def get_inventory(client, collection):
+    """Return the objects of an AFC collection indexed by name."""
+    request = client.get(collection)
+    return {item["name"]: item for item in request.json()["result"]}
+
+
+def get_references(object_type, values):
+    """Yield the (collection, name) pairs referenced by a bundle object."""
+    for attribute, collection in BUNDLE_REFERENCES.get(object_type, []):
+        for name in values.get(attribute) or []:
+            yield collection, name
+
+
+def endpoint_key(endpoint):
+    """Return the normalized IPv4 range identifying an endpoint group member."""
+    value = endpoint.get("ipv4_range") or endpoint.get("ip")
+    return str(ipaddress.ip_network(str(value).strip(), strict=False))
+
+
+def sync_endpoint_group(client, values, chunk_size):
+    """Align the members of an endpoint group with the requested endpoints.
+
+    The current members are indexed in a dict and the requested ones in a
+    set, so the differences are computed in linear time. Removals are sent
+    first, highest index first so the remaining indices stay valid, then
+    additions are appended, each in PATCH requests of chunk_size operations.
+    """
+    name = values["name"]
+    current = get_inventory(client, "endpoint_groups").get(name)
+    if current is None:
+        eg_instance = endpoint_groups.EndpointGroup(client, **values)
+        return eg_instance.create_eg(**values)
+
+    desired = []
+    try:
+        for endpoint in values.get("endpoints") or []:
+            if not (endpoint.get("ip") or endpoint.get("ipv4_range")):
+                return (
+                    "Only IP endpoints are supported by operation sync",
+                    False,
+                    False,
+                )
+            desired.append(endpoint_key(endpoint))
+    except ValueError as exc:
+        return f"Invalid endpoint for group {name}: {exc}", False, False
+    desired_keys = set(desired)
+
+    existing = {}
+    removals = []
+    for index, endpoint in enumerate(current.get("endpoints") or []):
+        try:
+            key = endpoint_key(endpoint)
+        except ValueError:
+            key = None
+        if key in desired_keys and key not in existing:
+            existing[key] = index
+        else:
+            removals.append(index)
+    additions = [
+        key for key in dict.fromkeys(desired) if key not in existing
+    ]
+
+    if not removals and not additions:
+        return (
+            f"Endpoint group {name} members are already in sync. "
+            "No action taken",
+            True,
+            False,
+        )
+
+    operations = [
+        {"op": "remove", "path": f"/endpoints/{index}"}
+        for index in sorted(removals, reverse=True)
+    ]
+    operations.extend(
+        {
+            "op": "add",
+            "path": "/endpoints/-",
+            "value": models.Endpoints(ipv4_range=key).dict(exclude_none=True),
+        }
+        for key in additions
+    )
+    sent = 0
+    for chunk in chunked(operations, chunk_size):
+        request = client.patch(
+            "endpoint_groups",
+            data=json.dumps([{"uuids": [current["uuid"]], "patch": chunk}]),
+        )
+        if request.status_code not in utils.response_ok:
+            return (
+                f"Endpoint group {name} sync stopped after {sent} of "
+                f"{len(operations)} changes: {request.json()['result']}",
+                False,
+                sent > 0,
+            )
+        sent += len(chunk)
+
+    return (
+        f"Successfully synchronized endpoint group {name}: "
+        f"{len(additions)} added, {len(removals)} removed",
+        True,
+        True,
+    )
+
+
+class BundleEngine:
+    """Apply a DSS bundle level by level over a single AFC client.
+
+    The existing objects are fetched once per collection and kept indexed by
+    name, so references are resolved locally instead of one lookup per
+    referenced object. Each collection is fetched again only after objects
+    were created in it, to learn their UUIDs before the next level.
+    """
+
+    def __init__(self, client, max_parallel):
+        self.client = client
+        self.max_parallel = max_parallel
+        self.inventory = {}
+        self.enforcers = {}
+
+    def load(self, collection):
+        self.inventory[collection] = get_inventory(self.client, collection)
+        return self.inventory[collection]
+
+    def uuids(self, collection, names):
+        return [self.inventory[collection][name]["uuid"] for name in names]
+
+    def enforcer_uuid(self, fabric_name, vrf_name, network=None):
+        key = (fabric_name, vrf_name, network)
+        if key not in self.enforcers:
+            fabric_uuid = fabric.Fabric.get_fabric_uuid(
+                self.client,
+                fabric_name,
+            )
+            if not fabric_uuid:
+                raise ValueError(f"Fabric {fabric_name} not found")
+            uuid = vrf.Vrf.get_vrf_uuid(self.client, vrf_name, fabric_uuid)
+            if not uuid:
+                raise ValueError(
+                    f"VRF {vrf_name} not found in Fabric {fabric_name}",
+                )
+            if network:
+                uuid = networks.Network.get_network_uuid(
+                    self.client,
+                    network,
+                    uuid,
+                )
+                if not uuid:
+                    raise ValueError(
+                        f"Network {network} not found in VRF {vrf_name}",
+                    )
+            self.enforcers[key] = uuid
+        return self.enforcers[key]
+
+    def post(self, object_type, collection, payload):
+        request = self.client.post(
+            collection,
+            data=json.dumps(payload.dict(exclude_none=True)),
+        )
+        if request.status_code in utils.response_ok:
+            return (
+                f"Successfully created {object_type} {payload.name}",
+                True,
+                True,
+            )
+        return request.json()["result"], False, False
+
+    def payload(self, object_type, values):
+        """Return the AFC model of a bundle object.
+
+        None is returned for endpoint groups of vSphere endpoints, which
+        are resolved by pyafc when created.
+        """
+        values = {**values, "type": object_type}
+        name = values.pop("name")
+        if object_type == "qualifier":
+            values.pop("type")
+            return models.PsmQualifiers(name=name, **values)
+        if object_type == "endpoint_group":
+            endpoints = values.get("endpoints") or []
+            if any(
+                endpoint.get("vm_name")
+                or endpoint.get("vm_tag")
+                or endpoint.get("vmkernel_adapter_name")
+                for endpoint in endpoints
+            ):
+                return None
+            values["endpoints"] = [
+                {**endpoint, "ipv4_range": endpoint.get("ip")}
+                for endpoint in endpoints
+            ]
+            return models.PsmEndpointGroups(name=name, **values)
+        for attribute, collection in BUNDLE_REFERENCES[object_type]:
+            if values.get(attribute):
+                values[attribute] = self.uuids(collection, values[attribute])
+        if object_type == "rule":
+            return models.PsmRule(name=name, **values)
+        values["enforcers"] = [
+            {
+                **enforcer,
+                "uuid": self.enforcer_uuid(
+                    enforcer.get("fabric"),
+                    enforcer.get("vrf"),
+                    enforcer.get("network"),
+                ),
+            }
+            for enforcer in values.get("enforcers") or []
+        ]
+        return models.PsmPolicies(name=name, **values)
+
+    def create(self, object_type, collection, values):
+        payload = self.payload(object_type, values)
+        if payload is None:
+            # vSphere backed endpoints are resolved by pyafc
+            values = {**values, "type": object_type}
+            eg_instance = endpoint_groups.EndpointGroup(
+                self.client,
+                name=values.pop("name"),
+            )
+            return eg_instance.create_eg(**values)
+        return self.post(object_type, collection, payload)
+
+    def update(self, object_type, collection, values):
+        """Patch the attributes of an existing object differing from values."""
+        name = values["name"]
+        current = self.inventory[collection][name]
+        payload = self.payload(object_type, values)
+        if payload is None:
+            return (
+                f"The {object_type} {name} already exists. vSphere "
+                "endpoints are not compared. No action taken",
+                True,
+                False,
+            )
+        wanted = payload.dict(exclude_none=True)
+        attributes = list(
+            dict.fromkeys(
+                path.split(".")[0]
+                for path in config_differences(current, wanted)
+            ),
+        )
+        if not attributes:
+            return (
+                f"The {object_type} {name} already matches. "
+                "No action taken",
+                True,
+                False,
+            )
+        patch = [
+            {
+                "op": "replace",
+                "path": f"/{attribute}",
+                "value": wanted[attribute],
+            }
+            for attribute in attributes
+        ]
+        request = self.client.patch(
+            collection,
+            data=json.dumps([{"uuids": [current["uuid"]], "patch": patch}]),
+        )
+        if request.status_code in utils.response_ok:
+            return (
+                f"Successfully updated {object_type} {name}: "
+                + ", ".join(attributes),
+                True,
+                True,
+            )
+        return request.json()["result"], False, False
+
+    def delete(self, object_type, collection, name):
+        uuid = self.inventory[collection][name]["uuid"]
+        request = self.client.delete(f"{collection}/{uuid}")
+        if request.status_code in utils.response_ok:
+            return f"Successfully deleted {object_type} {name}", True, True
+        return request.json()["result"], False, False
+
+    def load_all(self, bundle):
+        """Fetch the collections the objects of a bundle are resolved in."""
+        for _key, _object_type, collection in BUNDLE_LEVELS:
+            self.load(collection)
+        self.inventory["applications"] = {}
+        if any(
+            values.get("applications") for values in bundle.get("rules") or []
+        ):
+            self.load("applications")
+
+    def apply(self, operation, bundle):
+        """Apply the bundle and return the per object results."""
+        results = []
+        levels = [
+            level for level in BUNDLE_LEVELS if bundle.get(level[0])
+        ]
+        self.load_all(bundle)
+        if operation == "delete":
+            levels.reverse()
+
+        pending = {
+            (collection, values["name"])
+            for key, _object_type, collection in levels
+            for values in bundle[key]
+        }
+        failed = set()
+
+        for key, object_type, collection in levels:
+            submitted = []
+            for values in bundle[key]:
+                name = values["name"]
+                item = {"name": name, "type": object_type}
+                exists = name in self.inventory[collection]
+                missing = [
+                    reference
+                    for reference in get_references(object_type, values)
+                    if reference[1] not in self.inventory[reference[0]]
+                    and reference not in pending
+                ]
+                broken = [
+                    reference
+                    for reference in get_references(object_type, values)
+                    if reference in failed
+                ]
+                if operation == "delete" and not exists:
+                    message = (
+                        f"The {object_type} {name} does not exist. "
+                        "No action taken"
+                    )
+                    item.update(message=message, status=True, changed=False)
+                elif operation == "create" and (missing or broken):
+                    message = "Unresolved references: " + ", ".join(
+                        f"{collection_name}/{reference}"
+                        for collection_name, reference in missing + broken
+                    )
+                    item.update(message=message, status=False, changed=False)
+                    failed.add((collection, name))
+                else:
+                    submitted.append((values, item))
+                    continue
+                results.append(item)
+
+            if operation == "create":
+                outcomes = run_concurrently(
+                    lambda entry, kind=object_type, coll=collection: (
+                        self.update(kind, coll, entry[0])
+                        if entry[0]["name"] in self.inventory[coll]
+                        else self.create(kind, coll, entry[0])
+                    ),
+                    submitted,
+                    max_workers=self.max_parallel,
+                )
+            else:
+                outcomes = run_concurrently(
+                    lambda entry, kind=object_type, coll=collection: (
+                        self.delete(kind, coll, entry[0]["name"])
+                    ),
+                    submitted,
+                    max_workers=self.max_parallel,
+                )
+            for (values, item), outcome in zip(submitted, outcomes):
+                item.update(outcome)
+                if not item["status"]:
+                    failed.add((collection, values["name"]))
+                results.append(item)
+            if any(item["changed"] for _values, item in submitted):
+                self.load(collection)
+
+        return results
 
 
 def main():
@@ -575,10 +1182,25 @@ def main():
         **afc_argument_spec(),
         "operation": {"type": "str", "required": True},
         "data": {"type": "dict", "required": False},
+        "bundle": {
+            "type": "dict",
+            "required": False,
+            "options": {
+                "qualifiers": {"type": "list", "elements": "dict"},
+                "endpoint_groups": {"type": "list", "elements": "dict"},
+                "rules": {"type": "list", "elements": "dict"},
+                "policies": {"type": "list", "elements": "dict"},
+            },
+        },
+        "max_parallel": {"type": "int", "required": False, "default": 8},
+        "chunk_size": {"type": "int", "required": False, "default": 500},
+        "cache_path": {"type": "path", "required": False},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "bundle")],
+        required_one_of=[("data", "bundle")],
         supports_check_mode=True,
     )
 
@@ -587,8 +1209,15 @@ def main():
     password = ansible_module.params["afc_password"]
     data = ansible_module.params["data"]
     operation = ansible_module.params["operation"]
+    bundle = ansible_module.params["bundle"]
+    max_parallel = ansible_module.params["max_parallel"]
+    chunk_size = ansible_module.params["chunk_size"]
+    cache_path = ansible_module.params["cache_path"]
+    afc_ip = ansible_module.params["afc_ip"]
 
     result = {"changed": False}
+    results = None
+    digest = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -603,7 +1232,50 @@ def main():
 
     if afc_instance.afc_connected:
 
-        if operation == "create":
+        if bundle is not None:
+            digest = bundle_digest(bundle)
+            cached = None
+            if cache_path:
+                with locked_json_file(cache_path) as cache:
+                    cached = cache.get(afc_ip, {}).get(digest)
+            if not any(bundle.get(level[0]) for level in BUNDLE_LEVELS):
+                message = "Empty DSS bundle - No action taken"
+                status = True
+            elif (
+                operation == "create"
+                and cached
+                and cached_bundle_is_current(
+                    BundleEngine(afc_instance.client, max_parallel),
+                    bundle,
+                )
+            ):
+                message = (
+                    f"DSS bundle {digest} is unchanged. No action taken"
+                )
+                status = True
+            elif operation in ["create", "delete"]:
+                engine = BundleEngine(afc_instance.client, max_parallel)
+                results = engine.apply(operation, bundle)
+                message, status, changed = summarize_results(
+                    results,
+                    "DSS objects",
+                )
+                if cache_path and operation == "create" and status:
+                    top_level = [
+                        level for level in BUNDLE_LEVELS
+                        if bundle.get(level[0])
+                    ][-1]
+                    record_bundle(
+                        cache_path,
+                        afc_ip,
+                        digest,
+                        {"collection": top_level[2]},
+                    )
+                elif cache_path:
+                    record_bundle(cache_path, afc_ip, digest, None)
+            else:
+                message = "Operation not supported - No action taken"
+        elif operation == "create":
             if data["type"] == "policy":
                 policy_instance = policies.Policy(
                     afc_instance.client,
@@ -659,6 +1331,15 @@ def main():
                 message, status, changed = vrf_instance.update_network(
                     **data,
                 )
+        elif operation == "sync":
+            if data["type"] == "endpoint_group":
+                message, status, changed = sync_endpoint_group(
+                    afc_instance.client,
+                    data,
+                    chunk_size,
+                )
+            else:
+                message = "Type not supported - No action taken"
         elif operation == "delete":
             if data["type"] == "policy":
                 policy_instance = policies.Policy(
@@ -710,11 +1391,17 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if digest is not None:
+        exit_args["bundle_hash"] = digest
+    if results is not None:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
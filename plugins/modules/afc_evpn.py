@@ -12,6 +12,8 @@ version_added: "0.0.1"
 short_description: Create or delete EVPN.
 description: >
     This module is used to create and delete EVPN.
+    With vni_pool, the VNIs of many VLANs are allocated from a pool without
+    overlapping the VNIs of the existing EVPN instances.
 options:
     afc_ip:
         description: >
@@ -90,15 +92,32 @@ options:
                 default: 'AUTO'
                 required: false
             vlans:
-                description: VLANs to be mapped to EVPN
-                type: str
+                description: >
+                    VLANs to be mapped to EVPN, such as 100-200,300. A list
+                    of VLANs or VLAN ranges is accepted as well.
+                type: raw
                 required: true
             vni_base:
-                description: Used to combine with VLAN to form L2VNI
+                description: >
+                    Used to combine with VLAN to form L2VNI. Required unless
+                    vni_pool is set.
                 type: str
-                required: true
+                required: false
+            vni_pool:
+                description: >
+                    Range of VNIs, such as 10000-19999, from which the VNIs
+                    of the VLANs are allocated with the create operation.
+                    VLANs already mapped to EVPN in the fabric are skipped
+                    and the VNIs of the existing EVPN instances are never
+                    reused. The route targets follow the allocated VNIs with
+                    the AUTO and ASN:VNI route target types. Nothing is sent
+                    when an EVPN instance with the name already exists.
+                type: str
+                required: false
 
         required: true
+extends_documentation_fragment:
+    - arubanetworks.afc.reapply_queue
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -120,6 +139,24 @@ EXAMPLES = r"""
             vni_base: "10000"
             description: "Test EVPN"
 
+-   name: Create EVPN for 2000 VLANs with VNIs allocated from a pool
+    arubanetworks.afc.afc_evpn:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "create"
+        data:
+            fabric: "Aruba-Fabric"
+            vrf: "Aruba-VRF"
+            name: "Bulk-EVPN"
+            system_mac_range: "MAC Range Name"
+            as_number: "65000"
+            rt_type: "ASN:VNI"
+            vlans:
+                - "100-1999"
+                - "2100-2199"
+            vni_pool: "100000-199999"
+
 -   name: Delete EVPN using username and password
     arubanetworks.afc.afc_evpn:
         afc_ip: "10.10.10.10"
@@ -191,15 +228,193 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each VLAN group created with vni_pool
+    type: list
+    elements: dict
+    returned: when vni_pool is used
+    sample:
+        -   name: "100-1999,2100-2199"
+            vni_base: 100000
+            message: "EVPN Bulk-EVPN created successfully"
+            status: True
+            changed: True
 """
 
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
+    compress_vlans,
+    expand_vlans,
     instantiate_afc_object,
+    queue_reapply,
+    summarize_results,
 )
-from pyafc.fabric import fabric
+from pyafc.common import utils
+from pyafc.fabric import fabric, models
+from pyafc.services import resource_pools
+
+MAX_VNI = 16777214
+
+
+class VniAllocator:
+    """Allocate VNI bases from a pool tracked as a bitmap.
+
+    Bit n of the bitmap is set when VNI first + n is used. AFC maps each
+    VLAN to vni_base + VLAN, so a VLAN set is placed at the lowest base
+    where all its VNIs are free. The candidate bases are found for the
+    whole set at once with shifts of the bitmap, one per VLAN range.
+    """
+
+    def __init__(self, pool, used_vnis):
+        first, _, last = pool.partition("-")
+        self.first = int(first)
+        self.last = int(last or first)
+        if not 1 <= self.first <= self.last <= MAX_VNI:
+            raise ValueError(f"Invalid VNI pool {pool}")
+        self.used = 0
+        for vni in used_vnis:
+            if self.first <= vni <= self.last:
+                self.used |= 1 << (vni - self.first)
+
+    def _busy_windows(self, length):
+        """Return the bitmap of the starts of windows holding a used VNI."""
+        bits = self.used
+        width = 1
+        while width < length:
+            step = min(width, length - width)
+            bits |= bits >> step
+            width += step
+        return bits
+
+    def allocate(self, vlans):
+        """Reserve the VNIs of sorted VLANs and return their VNI base.
+
+        Returns None when the pool has no room for the VLANs.
+        """
+        low = vlans[0]
+        span = vlans[-1] - low + 1
+        starts = self.last - self.first - span + 2
+        if starts <= 0:
+            return None
+        busy = 0
+        runs = []
+        for vlan in vlans:
+            if runs and vlan == runs[-1][0] + runs[-1][1]:
+                runs[-1][1] += 1
+            else:
+                runs.append([vlan, 1])
+        for vlan, length in runs:
+            busy |= self._busy_windows(length) >> (vlan - low)
+        # The VNI base must not be negative
+        lowest = max(low - self.first, 0)
+        free = ~busy & ((1 << starts) - 1) & ~((1 << lowest) - 1)
+        if not free:
+            return None
+        start = (free & -free).bit_length() - 1
+        for vlan, length in runs:
+            self.used |= ((1 << length) - 1) << (start + vlan - low)
+        return self.first + start - low
+
+
+def allocate_vlan_groups(allocator, vlans):
+    """Split VLANs into groups sharing a VNI base and allocate them.
+
+    All VLANs share a single base when the pool allows it, otherwise each
+    VLAN range gets its own base. Returns (vlans, vni_base) pairs.
+    """
+    base = allocator.allocate(vlans)
+    if base is not None:
+        return [(vlans, base)]
+    groups = []
+    for group in compress_vlans(vlans).split(","):
+        group_vlans = expand_vlans(group)
+        base = allocator.allocate(group_vlans)
+        if base is None:
+            raise ValueError(f"VNI pool exhausted for VLANs {group}")
+        groups.append((group_vlans, base))
+    return groups
+
+
+def create_evpn_bulk(client, fabric_uuid, data):
+    """Create the EVPN of many VLANs with VNIs allocated from vni_pool.
+
+    The existing EVPN instances are read once to seed the allocator and
+    to skip the VLANs already mapped in the fabric. As in pyafc, nothing
+    is sent when an instance already holds the name, and "already exists"
+    responses leave the VLAN group unchanged. Returns the message, status,
+    changed and the per VLAN group results.
+    """
+    vlans = expand_vlans(data["vlans"])
+    mapped = set()
+    used_vnis = []
+    instances = client.get("evpn").json()["result"] or []
+    for instance in instances:
+        if instance.get("vni") is not None:
+            used_vnis.append(int(instance["vni"]))
+        if (
+            instance.get("vlan") is not None
+            and instance.get("fabric_uuid") in (None, fabric_uuid)
+        ):
+            mapped.add(int(instance["vlan"]))
+    pending = [vlan for vlan in vlans if vlan not in mapped]
+    if not pending:
+        message = (
+            f"EVPN already configured for VLANs {compress_vlans(vlans)} - "
+            "No action taken"
+        )
+        return message, True, False, []
+    if any(data["name"] in instance.get("name", "") for instance in instances):
+        message = f"EVPN {data['name']} already exists. No action taken"
+        return message, True, False, []
+
+    groups = allocate_vlan_groups(
+        VniAllocator(data["vni_pool"], used_vnis),
+        pending,
+    )
+    mac_pool = resource_pools.Pool.get_resource_pool(
+        client,
+        data["system_mac_range"],
+        "MAC",
+    )
+    if not mac_pool:
+        raise ValueError(
+            f"MAC POOL with ID {data['system_mac_range']} not found",
+        )
+
+    results = []
+    for group_vlans, base in groups:
+        payload = models.EVPN(
+            fabric_uuid=fabric_uuid,
+            name=data["name"],
+            description=data.get("description") or "",
+            as_number=data.get("as_number"),
+            rt_type=data.get("rt_type") or "AUTO",
+            system_mac_range=mac_pool["uuid"],
+            vlans=compress_vlans(group_vlans),
+            vni_base=base,
+        ).dict(exclude_none=True)
+        request = client.post("evpn", data=json.dumps(payload))
+        created = request.status_code in utils.response_ok
+        message = (
+            f"EVPN {data['name']} created successfully"
+            if created
+            else request.json()["result"]
+        )
+        results.append(
+            {
+                "name": payload["vlans"],
+                "vni_base": base,
+                "message": message,
+                "status": created or "already exists" in str(message),
+                "changed": created,
+            },
+        )
+    message, status, changed = summarize_results(results, "VLAN groups")
+    return message, status, changed, results
 
 
 def main():
@@ -207,6 +422,7 @@ def main():
         **afc_argument_spec(),
         "operation": {"type": "str", "required": True},
         "data": {"type": "dict", "required": False},
+        "reapply_queue": {"type": "path", "required": False},
     }
 
     ansible_module = AnsibleModule(
@@ -219,12 +435,22 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    reapply_queue = ansible_module.params["reapply_queue"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
 
+    if operation == "reapply" and reapply_queue:
+        message, status, changed = queue_reapply(
+            reapply_queue,
+            ansible_module.params["afc_ip"],
+            {"type": "evpn", "fabric": data["fabric"]},
+        )
+        ansible_module.exit_json(changed=changed, msg=message)
+
     status = False
     changed = False
     message = ""
@@ -241,7 +467,18 @@ def main():
         )
 
         if fabric_instance.uuid:
-            if operation == "create":
+            if operation == "create" and data.get("vni_pool"):
+                try:
+                    message, status, changed, results = create_evpn_bulk(
+                        afc_instance.client,
+                        fabric_instance.uuid,
+                        data,
+                    )
+                except ValueError as exc:
+                    message = str(exc)
+            elif operation == "create":
+                if isinstance(data.get("vlans"), list):
+                    data["vlans"] = compress_vlans(expand_vlans(data["vlans"]))
                 message, status, changed = fabric_instance.create_evpn(**data)
             elif operation == "reapply":
                 message, status, changed = fabric_instance.reapply_evpn()
@@ -263,11 +500,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
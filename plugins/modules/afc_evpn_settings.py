@@ -13,6 +13,10 @@ short_description: Update the global EVPN settings of a fabric.
 description: >
     This module updates the global (fabric-wide) EVPN settings such as ARP
     suppression, local SVI, local MAC and the VXLAN tunnel bridging mode.
+    When a list of fabrics is given, their settings are read concurrently
+    and compared with data, and only the drifted fabrics are updated. Their
+    update carries the full settings, the current values being kept for
+    the settings missing from data.
 options:
     afc_ip:
         description: >
@@ -55,8 +59,10 @@ options:
         type: dict
         suboptions:
             fabric:
-                description: Fabric Name.
-                type: str
+                description: >
+                    Fabric Name. A list of fabrics applies data as a template
+                    to each of them, reporting the differences found.
+                type: raw
                 required: true
             arp_suppression:
                 description: Enable or disable ARP suppression.
@@ -80,11 +86,18 @@ options:
             switches:
                 description: >
                     List of switches on which to apply the settings. If not
-                    specified, the settings apply to the whole fabric.
+                    specified, the settings apply to the whole fabric. Only
+                    supported with a single fabric.
                 type: list
                 elements: str
                 required: false
         required: true
+    max_parallel:
+        description: >
+            Maximum number of fabrics read or updated at the same time when
+            a list of fabrics is given.
+        type: int
+        default: 8
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -123,6 +136,20 @@ EXAMPLES = r"""
             switches:
                 - "DC-8100-Leaf5"
                 - "DC-8100-Leaf6"
+
+-   name: Align the EVPN settings of several fabrics
+    arubanetworks.afc.afc_evpn_settings:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        operation: "update"
+        data:
+            fabric:
+                - "Aruba-Fabric-DC1"
+                - "Aruba-Fabric-DC2"
+                - "Aruba-Fabric-DC3"
+            arp_suppression: true
+            local_svi: true
+            vxlan_tunnel_bridging_mode: "ibgp-ebgp"
 """
 
 RETURN = r"""
@@ -141,6 +168,22 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome and settings differences of each fabric
+    type: list
+    elements: dict
+    returned: when a list of fabrics is given
+    sample:
+        -   name: "Aruba-Fabric-DC2"
+            diff:
+                local_svi:
+                    before: false
+                    after: true
+            message: "Successfully updated EVPN Settings for fabric
+                Aruba-Fabric-DC2"
+            status: True
+            changed: True
+            elapsed: 0.8
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -148,15 +191,114 @@ from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
     instantiate_afc_object,
+    run_concurrently,
+    summarize_results,
 )
 from pyafc.fabric import fabric
 
+SETTINGS_FIELDS = [
+    "arp_suppression",
+    "local_svi",
+    "local_mac",
+    "vxlan_tunnel_bridging_mode",
+]
+
+
+def read_evpn_settings(client, fabric_uuid):
+    """Return the fabric-wide EVPN settings of a fabric."""
+    request = client.get(f"fabrics/{fabric_uuid}/evpn_settings")
+    settings = request.json()["result"] or {}
+    if isinstance(settings, list):
+        settings = settings[0] if settings else {}
+    return {key: settings.get(key) for key in SETTINGS_FIELDS}
+
+
+def settings_diff(current, template):
+    """Return the before and after values of the drifted settings."""
+    return {
+        key: {"before": current.get(key), "after": value}
+        for key, value in template.items()
+        if current.get(key) != value
+    }
+
+
+def align_evpn_settings(client, data, max_parallel):
+    """Apply the settings of data to a list of fabrics.
+
+    The settings of every fabric are read concurrently and compared with
+    data, then only the drifted fabrics are updated, concurrently. As the
+    pyafc update sets every omitted setting to false, the update sends the
+    current settings with the drifted ones replaced. Returns the per
+    fabric results with their differences.
+    """
+    if data.get("switches"):
+        raise ValueError("switches is only supported with a single fabric")
+    template = {
+        key: data[key] for key in SETTINGS_FIELDS if data.get(key) is not None
+    }
+    fabric_uuids = {
+        item["name"]: item["uuid"]
+        for item in client.get("fabrics").json()["result"]
+    }
+    found = [name for name in data["fabric"] if name in fabric_uuids]
+
+    current = {}
+
+    def read(name):
+        current[name] = read_evpn_settings(client, fabric_uuids[name])
+        return "", True, False
+
+    outcomes = {}
+    diffs = {}
+    for name, outcome in zip(
+        found,
+        run_concurrently(read, found, max_workers=max_parallel),
+    ):
+        if outcome["status"]:
+            diffs[name] = settings_diff(current[name], template)
+            if not diffs[name]:
+                outcome["message"] = (
+                    "EVPN Settings already up to date. No action taken"
+                )
+        outcomes[name] = outcome
+
+    def update(name):
+        fabric_instance = fabric.Fabric(client, name=name)
+        if not fabric_instance.uuid:
+            return "Fabric not found - No action taken", False, False
+        # pyafc defaults the omitted flags to false, send them all
+        settings = {
+            key: value
+            for key, value in current[name].items()
+            if value is not None
+        }
+        settings.update(template)
+        return fabric_instance.update_evpn_settings(**settings)
+
+    drifted = [name for name, diff in diffs.items() if diff]
+    for name, outcome in zip(
+        drifted,
+        run_concurrently(update, drifted, max_workers=max_parallel),
+    ):
+        outcomes[name] = outcome
+
+    results = []
+    for name in data["fabric"]:
+        outcome = outcomes.get(name) or {
+            "message": "Fabric not found - No action taken",
+            "status": False,
+            "changed": False,
+        }
+        results.append({"name": name, "diff": diffs.get(name, {}), **outcome})
+    return results
+
 
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": True},
         "data": {"type": "dict", "required": True},
+        "max_parallel": {"type": "int", "required": False, "default": 8},
     }
 
     ansible_module = AnsibleModule(
@@ -169,8 +311,10 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    max_parallel = ansible_module.params["max_parallel"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -185,25 +329,42 @@ def main():
 
     if afc_instance.afc_connected:
 
-        fabric_instance = fabric.Fabric(
-            afc_instance.client,
-            name=data["fabric"],
-        )
-
-        if fabric_instance.uuid:
-            settings_data = {
-                key: value
-                for key, value in data.items()
-                if key != "fabric"
-            }
+        if isinstance(data["fabric"], list):
             if operation == "update":
-                message, status, changed = (
-                    fabric_instance.update_evpn_settings(**settings_data)
-                )
+                try:
+                    results = align_evpn_settings(
+                        afc_instance.client,
+                        data,
+                        max_parallel,
+                    )
+                    message, status, changed = summarize_results(
+                        results,
+                        "fabrics",
+                    )
+                except ValueError as exc:
+                    message = str(exc)
             else:
                 message = "Operation not supported - No action taken"
         else:
-            message = "Fabric not found - No action taken"
+            fabric_instance = fabric.Fabric(
+                afc_instance.client,
+                name=data["fabric"],
+            )
+
+            if fabric_instance.uuid:
+                settings_data = {
+                    key: value
+                    for key, value in data.items()
+                    if key != "fabric"
+                }
+                if operation == "update":
+                    message, status, changed = (
+                        fabric_instance.update_evpn_settings(**settings_data)
+                    )
+                else:
+                    message = "Operation not supported - No action taken"
+            else:
+                message = "Fabric not found - No action taken"
 
         # Disconnect session if username and password are passed
         if username and password:
@@ -216,11 +377,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
@@ -55,9 +55,10 @@ options:
         required: true
     data:
         description: >
-            Device assignment or Fabric Data.
+            Device assignment or Fabric Data. Mutually exclusive with
+            fabrics.
         type: dict
-        required: true
+        required: false
         suboptions:
             name:
                 description: Fabric Name
@@ -83,6 +84,28 @@ options:
                     ["spine", "leaf", "border_leaf", "sub_leaf"]
                 type: dict
                 required: false
+    fabrics:
+        description: >
+            Switches to assign to several fabrics with the assign operation.
+            Each key is a fabric name and each value maps devices, given as
+            IPv4 addresses, IPv4 ranges or switch names, to their role. The
+            fabrics and the switch inventory are read once, switches already
+            part of a fabric are skipped and the fabrics are assigned
+            concurrently. Mutually exclusive with data.
+        type: dict
+        required: false
+    max_parallel:
+        description: >
+            Maximum number of fabrics assigned at the same time when fabrics
+            is used.
+        type: int
+        default: 8
+    sync_timeout:
+        description: >
+            Time in seconds to wait for the assigned switches of a fabric to
+            be synchronized when fabrics is used.
+        type: int
+        default: 600
 
 author: Aruba Networks (@ArubaNetworks)
 """
@@ -124,6 +147,21 @@ EXAMPLES = r"""
                 10.10.10.16: "leaf"
                 10.10.10.17: "subleaf"
 
+-   name: Assign switches to several Fabrics using usename
+    arubanetworks.afc.afc_fabric:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "assign"
+        fabrics:
+            Aruba-Fabric-DC1:
+                10.10.10.11-10.10.10.12: "spine"
+                10.10.10.13-10.10.10.20: "leaf"
+            Aruba-Fabric-DC2:
+                10.10.20.11-10.10.20.12: "spine"
+                10.10.20.13-10.10.20.20: "leaf"
+                DC2-Border-1: "border_leaf"
+
 -   name: Create Fabric using token
     arubanetworks.afc.afc_fabric:
         afc_ip: "10.10.10.10"
@@ -175,26 +213,226 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each fabric when fabrics is used
+    type: list
+    elements: dict
+    returned: when fabrics is used
+    sample:
+        -   name: "Aruba-Fabric-DC1"
+            assigned:
+                - "10.10.10.11"
+                - "10.10.10.12"
+            skipped:
+                - "10.10.10.13"
+            undiscovered: []
+            message: "Successfully added devices 10.10.10.11 10.10.10.12 to
+                the Fabric Aruba-Fabric-DC1."
+            status: True
+            changed: True
+            elapsed: 12.5
 """
 
+import json
+import time
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
+    SWITCH_ROLES,
     afc_argument_spec,
     build_auth_data,
+    expand_range,
     instantiate_afc_object,
+    run_concurrently,
+    summarize_results,
 )
+from pyafc.common import utils
 from pyafc.fabric import fabric
 
+SYNC_POLL_INTERVAL = 2
+
+
+def is_synced(switch):
+    """Return True once an assigned switch is considered ready, as pyafc."""
+    return (
+        switch.get("status") == "SYNCED"
+        or (switch.get("health") or {}).get("status") == "healthy"
+    )
+
+
+def plan_assignments(fabrics, inventory, assignments):
+    """Return the switches to assign per fabric and the per fabric results.
+
+    Each fabric maps devices, IP ranges or switch names to a role. Switches
+    are resolved against the switch inventory, switches already in a
+    fabric are skipped and a switch requested for two fabrics is only
+    assigned to the first one.
+    """
+    by_ip = {switch.get("ip_address"): switch for switch in inventory}
+    by_name = {switch.get("name"): switch for switch in inventory}
+    requested = {}
+    plans = []
+    for fabric_name, roles in assignments.items():
+        result = {
+            "name": fabric_name,
+            "assigned": [],
+            "skipped": [],
+            "undiscovered": [],
+        }
+        plan = {"result": result, "uuid": fabrics.get(fabric_name)}
+        plans.append(plan)
+        if plan["uuid"] is None:
+            result.update(
+                message="Fabric does not exist - Create it first",
+                status=False,
+                changed=False,
+            )
+            continue
+        plan["roles"] = {}
+        for device, role in (roles or {}).items():
+            if role not in SWITCH_ROLES:
+                result.update(
+                    message=f"Invalid role {role} for {device}",
+                    status=False,
+                    changed=False,
+                )
+                break
+            try:
+                devices = expand_range(device)
+            except ValueError:
+                devices = [device]
+            for item in devices:
+                switch = by_ip.get(item) or by_name.get(item)
+                if switch is None:
+                    result["undiscovered"].append(item)
+                elif switch.get("fabric_uuid"):
+                    result["skipped"].append(item)
+                elif switch["uuid"] in requested:
+                    if requested[switch["uuid"]] == fabric_name:
+                        continue
+                    result.update(
+                        message=f"Switch {item} is also assigned to "
+                        f"{requested[switch['uuid']]}",
+                        status=False,
+                        changed=False,
+                    )
+                    break
+                else:
+                    requested[switch["uuid"]] = fabric_name
+                    plan["roles"].setdefault(role, []).append(switch["uuid"])
+                    result["assigned"].append(item)
+            if "status" in result:
+                break
+        if "status" in result:
+            # Nothing is assigned to a fabric whose request is invalid
+            for uuids in plan["roles"].values():
+                for uuid in uuids:
+                    requested.pop(uuid)
+            plan["roles"] = {}
+            result["assigned"] = []
+    return plans
+
+
+def assign_fabric(client, plan, sync_timeout):
+    """Assign the planned switches to a fabric and wait for them to sync."""
+    result = plan["result"]
+    if not plan["roles"]:
+        message = "No new switch to assign - No action taken"
+        if result["undiscovered"]:
+            message += (
+                f". Not discovered yet: {' '.join(result['undiscovered'])}"
+            )
+        return message, True, False
+    payload = [
+        {
+            "uuids": uuids,
+            "patch": [
+                {
+                    "path": "/fabric_uuid",
+                    "value": plan["uuid"],
+                    "op": "replace",
+                },
+                {"path": "/role", "value": role, "op": "replace"},
+            ],
+        }
+        for role, uuids in plan["roles"].items()
+    ]
+    request = client.patch("switches", data=json.dumps(payload))
+    if request.status_code not in utils.response_ok:
+        return request.json()["result"], False, False
+
+    pending = {uuid for uuids in plan["roles"].values() for uuid in uuids}
+    deadline = time.monotonic() + sync_timeout
+    while pending:
+        switches_request = client.get(f"switches?fabrics={plan['uuid']}")
+        pending -= {
+            switch["uuid"]
+            for switch in switches_request.json()["result"] or []
+            if is_synced(switch)
+        }
+        if not pending:
+            break
+        if time.monotonic() > deadline:
+            return (
+                f"Assigned {len(result['assigned'])} switches, "
+                f"{len(pending)} not synchronized after {sync_timeout}s",
+                False,
+                True,
+            )
+        time.sleep(SYNC_POLL_INTERVAL)
+    message = (
+        f"Successfully added devices {' '.join(result['assigned'])} "
+        f"to the Fabric {result['name']}."
+    )
+    if result["skipped"]:
+        message += (
+            f" Devices {' '.join(result['skipped'])} are already part of a "
+            "fabric."
+        )
+    if result["undiscovered"]:
+        message += (
+            f" Devices {' '.join(result['undiscovered'])} are not "
+            "discovered yet."
+        )
+    return message, True, True
+
+
+def assign_fabrics(client, assignments, max_parallel, sync_timeout):
+    """Assign switches to several fabrics, the fabrics running concurrently.
+
+    The fabrics and the switch inventory are read once for all of them.
+    """
+    fabrics = {
+        item["name"]: item["uuid"]
+        for item in client.get("fabrics").json()["result"]
+    }
+    inventory = client.get("switches").json()["result"] or []
+    plans = plan_assignments(fabrics, inventory, assignments)
+    ready = [plan for plan in plans if "status" not in plan["result"]]
+    outcomes = run_concurrently(
+        lambda plan: assign_fabric(client, plan, sync_timeout),
+        ready,
+        max_workers=max_parallel,
+    )
+    for plan, outcome in zip(ready, outcomes):
+        plan["result"].update(outcome)
+    return [plan["result"] for plan in plans]
+
 
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": True},
         "data": {"type": "dict", "required": False},
+        "fabrics": {"type": "dict", "required": False},
+        "max_parallel": {"type": "int", "required": False, "default": 8},
+        "sync_timeout": {"type": "int", "required": False, "default": 600},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "fabrics")],
+        required_one_of=[("data", "fabrics")],
         supports_check_mode=True,
     )
 
@@ -203,8 +441,10 @@ def main():
     password = ansible_module.params["afc_password"]
     data = ansible_module.params["data"]
     operation = ansible_module.params["operation"]
+    fabrics = ansible_module.params["fabrics"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -219,7 +459,21 @@ def main():
 
     if afc_instance.afc_connected:
 
-        if operation == "create":
+        if fabrics is not None:
+            if operation == "assign":
+                results = assign_fabrics(
+                    afc_instance.client,
+                    fabrics,
+                    ansible_module.params["max_parallel"],
+                    ansible_module.params["sync_timeout"],
+                )
+                message, status, changed = summarize_results(
+                    results,
+                    "fabrics",
+                )
+            else:
+                message = "Operation not supported - No action taken"
+        elif operation == "create":
             fabric_instance = fabric.Fabric(afc_instance.client, **data)
             message, status, changed = fabric_instance.create_fabric(**data)
         else:
@@ -250,11 +504,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
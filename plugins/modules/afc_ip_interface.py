@@ -9,9 +9,10 @@ DOCUMENTATION = r"""
 ---
 module: afc_ip_interface
 version_added: "0.0.1"
-short_description: Create or delete a SVI, a Loopback or a Routed Port.
+short_description: Create, update or delete a SVI, a Loopback or a Routed Port.
 description: >
-    This module is used to create and delete SVI, a Loopback or a Routed Port.
+    This module is used to create, update and delete SVI, a Loopback or a
+    Routed Port.
 options:
     afc_ip:
         description: >
@@ -44,10 +45,18 @@ options:
     operation:
         description: >
             Operation to be performed with the IP Interface, ROP,
-            loopback or SVI, create or delete.
+            loopback or SVI, create, update or delete. Update changes the
+            existing interfaces in place and only sends the attributes
+            differing from AFC. The interface is found by name on the given
+            switches, or on every switch having it when switches is omitted,
+            and only name and the attributes to change are needed. When an
+            address range is given, interfaces keep their address if it is
+            part of the range. Only create and update are supported with
+            interfaces.
         type: str
         choices:
             - create
+            - update
             - delete
         required: true
     data:
@@ -55,7 +64,8 @@ options:
             IP Interface data containing if_type, vlan, active_gateway,
             ipv4_primary_address, local_proxy_arp_enabled and the switches.
             The values vlan and the prefix_length need to be integers.
-            Structure is provided in the example.
+            Structure is provided in the example. Mutually exclusive with
+            interfaces.
         type: dict
         suboptions:
             fabric:
@@ -124,7 +134,36 @@ options:
                 type: list
                 elements: str
                 required: false
-        required: true
+        required: false
+    interfaces:
+        description: >
+            List of IP Interfaces, each using the data structure, created in
+            one task. Mutually exclusive with data. The switches and VRFs of
+            each fabric and the IP interfaces of each VRF are read once.
+            Before anything is sent, every interface is checked against the
+            existing interfaces of its VRF and the other requested ones, and
+            interfaces with a duplicate address or an overlapping subnet
+            fail. Two interfaces may only share a subnet when they are SVIs
+            of the same VLAN or routed ports, on different switches.
+            Interfaces already present on a switch are skipped, and address
+            ranges are allocated from the unused addresses. The missing SVIs
+            and loopbacks are then posted in batches per VRF. With update,
+            the changed attributes are patched in batches per VRF.
+        type: list
+        elements: dict
+        required: false
+    batch_size:
+        description: >
+            Maximum number of IP interfaces posted or patched in one request
+            to AFC.
+        type: int
+        default: 100
+    max_parallel:
+        description: >
+            Maximum number of requests sent to AFC at the same time when
+            interfaces is used or an IP interface is updated.
+        type: int
+        default: 4
 
 author: Aruba Networks (@ArubaNetworks)
 """
@@ -272,6 +311,38 @@ EXAMPLES = r"""
             switches:
                 - "10.10.10.7"
 
+-   name: Create SVIs in several VRFs using username and password
+    arubanetworks.afc.afc_ip_interface:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "create"
+        batch_size: 100
+        interfaces:
+            -   fabric: "Aruba-Fabric"
+                vrf: "Aruba-VRF"
+                name: "VLAN250"
+                vlan: 250
+                if_type: vlan
+                ipv4_primary_address:
+                    address: "10.10.10.11-10.10.10.50"
+                    prefix_length: 24
+                active_gateway:
+                    ipv4_address: "10.10.10.1"
+                    mac_address: "00:00:00:00:00:01"
+                switches:
+                    - "leaf"
+            -   fabric: "Aruba-Fabric"
+                vrf: "Tenant-VRF"
+                name: "VLAN300"
+                vlan: 300
+                if_type: vlan
+                ipv4_primary_address:
+                    address: "10.30.0.11-10.30.0.50"
+                    prefix_length: 24
+                switches:
+                    - "10.10.10.7-10.10.10.9"
+
 -   name: Create IP Interface using token
     arubanetworks.afc.afc_ip_interface:
         afc_ip: "10.10.10.10"
@@ -356,6 +427,38 @@ EXAMPLES = r"""
             switches:
                 - "10.10.10.7"
 
+-   name: Change the Active Gateway of an SVI on all its switches
+    arubanetworks.afc.afc_ip_interface:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        operation: "update"
+        data:
+            fabric: "Aruba-Fabric"
+            vrf: "Aruba-VRF"
+            name: "VLAN250"
+            active_gateway:
+                ipv4_address: "10.10.10.254"
+                mac_address: "00:00:00:00:00:01"
+
+-   name: Update several IP Interfaces using token
+    arubanetworks.afc.afc_ip_interface:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        operation: "update"
+        interfaces:
+            -   fabric: "Aruba-Fabric"
+                vrf: "Aruba-VRF"
+                name: "VLAN250"
+                ipv4_primary_address:
+                    address: "10.10.10.11-10.10.10.50"
+                    prefix_length: 23
+            -   fabric: "Aruba-Fabric"
+                vrf: "Aruba-VRF"
+                name: "loopback10"
+                enable: False
+                switches:
+                    - "10.10.10.7"
+
 -   name: Delete IP Interface using token
     arubanetworks.afc.afc_ip_interface:
         afc_ip: "10.10.10.10"
@@ -423,27 +526,654 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each IP Interface when interfaces is used
+    type: list
+    elements: dict
+    returned: when interfaces is used
+    sample:
+        -   name: "VLAN250"
+            fabric: "Aruba-Fabric"
+            vrf: "Aruba-VRF"
+            message: "Successfully created IP Interface VLAN250 on 3 switches"
+            status: True
+            changed: True
 """
 
+import ipaddress
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
+    chunked,
+    expand_range,
     instantiate_afc_object,
+    resolve_switches,
+    run_concurrently,
+    summarize_results,
 )
+from pyafc.common import utils
 from pyafc.fabric import fabric
-from pyafc.vrf import vrf
+from pyafc.vrf import models, vrf
+
+# IP interface attributes changed in place by the update operation
+UPDATABLE_FIELDS = [
+    "enable",
+    "description",
+    "vlan",
+    "active_gateway",
+    "ipv4_primary_address",
+    "ipv4_secondary_addresses",
+    "local_proxy_arp_enabled",
+    "vsx_shutdown_on_split",
+    "vsx_active_forwarding",
+]
+
+
+def interface_key(record):
+    """Return what identifies an IP interface on a switch."""
+    if record["if_type"] == "vlan":
+        return record["switch_uuid"], "vlan", record.get("vlan")
+    if record["if_type"] == "loopback":
+        return (
+            record["switch_uuid"],
+            "loopback",
+            record.get("loopback_name") or record.get("name"),
+        )
+    return record["switch_uuid"], record["if_type"], record.get("name")
+
+
+class SubnetIndex:
+    """Index of the IPv4 interface subnets of one VRF.
+
+    Every interface is stored under its network and under each of its
+    supernets, so the interfaces overlapping a subnet are found with at most
+    33 dictionary lookups instead of comparing it with every interface of
+    the VRF. Addresses are indexed separately to find duplicates.
+    """
+
+    def __init__(self):
+        self.networks = {}
+        self.covered = {}
+        self.addresses = {}
+
+    @staticmethod
+    def network(record):
+        address = record["ipv4_primary_address"]
+        return ipaddress.IPv4Network(
+            f"{address['address']}/{address['prefix_length']}",
+            strict=False,
+        )
+
+    def add(self, record):
+        network = self.network(record)
+        self.networks.setdefault(network, []).append(record)
+        for prefix_length in range(network.prefixlen + 1):
+            self.covered.setdefault(
+                network.supernet(new_prefix=prefix_length),
+                [],
+            ).append(record)
+        address = record["ipv4_primary_address"]["address"]
+        self.addresses.setdefault(address, []).append(record)
+
+    def remove(self, record):
+        network = self.network(record)
+        self.networks[network].remove(record)
+        for prefix_length in range(network.prefixlen + 1):
+            self.covered[network.supernet(new_prefix=prefix_length)].remove(
+                record,
+            )
+        address = record["ipv4_primary_address"]["address"]
+        self.addresses[address].remove(record)
+        if not self.addresses[address]:
+            del self.addresses[address]
+
+    def is_used(self, address):
+        return address in self.addresses
+
+    @staticmethod
+    def compatible(record, other):
+        """Return True if two interfaces may share a subnet or address.
+
+        SVIs of the same VLAN share their subnet, and may share their
+        address, on different switches. Routed ports of different switches
+        may use the same subnet, as for point-to-point links.
+        """
+        if interface_key(record) == interface_key(other):
+            return True
+        if record["switch_uuid"] == other["switch_uuid"]:
+            return False
+        if record["if_type"] == other["if_type"] == "vlan":
+            return record.get("vlan") == other.get("vlan")
+        same_address = (
+            record["ipv4_primary_address"]["address"]
+            == other["ipv4_primary_address"]["address"]
+        )
+        return record["if_type"] == other["if_type"] == "routed" and (
+            not same_address
+        )
+
+    def conflicts(self, record):
+        """Return the indexed interfaces conflicting with record."""
+        network = self.network(record)
+        candidates = list(self.covered.get(network, []))
+        for prefix_length in range(network.prefixlen):
+            candidates.extend(
+                self.networks.get(
+                    network.supernet(new_prefix=prefix_length),
+                    [],
+                ),
+            )
+        candidates.extend(
+            self.addresses.get(record["ipv4_primary_address"]["address"], []),
+        )
+        conflicts = []
+        for other in candidates:
+            if other is not record and other not in conflicts and not (
+                self.compatible(record, other)
+            ):
+                conflicts.append(other)
+        return conflicts
+
+
+def interface_changes(current, values):
+    """Return the updatable values differing from the current interface.
+
+    Dictionaries are compared on the requested keys only, so an active
+    gateway given without its IPv6 part keeps the existing one.
+    """
+    changes = {}
+    for field in UPDATABLE_FIELDS:
+        if field not in values:
+            continue
+        wanted = values[field]
+        existing = current.get(field)
+        if isinstance(wanted, dict) and isinstance(existing, dict):
+            if all(existing.get(key) == wanted[key] for key in wanted):
+                continue
+            wanted = {**existing, **wanted}
+        elif wanted == existing:
+            continue
+        changes[field] = wanted
+    return changes
+
+
+def describe_interface(record):
+    address = record["ipv4_primary_address"]
+    return (
+        f"{record.get('name') or record.get('loopback_name')} "
+        f"({address['address']}/{address['prefix_length']} on "
+        f"{record.get('switch_name') or record['switch_uuid']})"
+    )
+
+
+class InterfacePlanner:
+    """Plan the IP interfaces of a batch against the existing ones.
+
+    The fabrics, the switches and VRFs of each fabric and the IP interfaces
+    of each VRF are read once, whatever the number of requested interfaces.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.fabrics = {
+            item["name"]: item["uuid"]
+            for item in client.get("fabrics").json()["result"]
+        }
+        self.switches = {}
+        self.vrfs = {}
+        self.existing = {}
+        self.named = {}
+        self.indexes = {}
+
+    def fabric_switches(self, fabric_uuid):
+        if fabric_uuid not in self.switches:
+            request = self.client.get(f"switches?fabrics={fabric_uuid}")
+            self.switches[fabric_uuid] = request.json()["result"] or []
+        return self.switches[fabric_uuid]
+
+    def vrf_uuid(self, fabric_uuid, name):
+        if fabric_uuid not in self.vrfs:
+            request = self.client.get(f"vrfs?fabrics={fabric_uuid}")
+            self.vrfs[fabric_uuid] = {
+                item["name"]: item["uuid"]
+                for item in request.json()["result"]
+            }
+        return self.vrfs[fabric_uuid].get(name)
+
+    def index(self, vrf_uuid):
+        if vrf_uuid not in self.indexes:
+            request = self.client.get(f"vrfs/{vrf_uuid}/ip_interfaces")
+            interfaces = request.json()["result"] or []
+            self.existing[vrf_uuid] = {
+                interface_key(item): item for item in interfaces
+            }
+            self.named[vrf_uuid] = {
+                (item["switch_uuid"], item.get("name") or item.get(
+                    "loopback_name",
+                )): item
+                for item in interfaces
+            }
+            self.indexes[vrf_uuid] = SubnetIndex()
+            for item in interfaces:
+                if item.get("ipv4_primary_address"):
+                    self.indexes[vrf_uuid].add(item)
+        return self.indexes[vrf_uuid]
+
+    def resolve(self, item):
+        """Return the VRF UUID, switch names, switch UUIDs and item values.
+
+        Raises ValueError when the fabric, the VRF or a switch is not found.
+        """
+        fabric_uuid = self.fabrics.get(item.get("fabric"))
+        if fabric_uuid is None:
+            raise ValueError("Fabric not found")
+        vrf_uuid = self.vrf_uuid(fabric_uuid, item.get("vrf"))
+        if vrf_uuid is None:
+            raise ValueError("VRF not found")
+        self.index(vrf_uuid)
+        fabric_switches = self.fabric_switches(fabric_uuid)
+        names = {
+            switch["uuid"]: switch.get("name") for switch in fabric_switches
+        }
+        switch_uuids = resolve_switches(fabric_switches, item.get("switches"))
+        values = {
+            key: value
+            for key, value in item.items()
+            if key not in ["fabric", "vrf", "switches"] and value is not None
+        }
+        return vrf_uuid, names, switch_uuids, values
+
+    def plan(self, item):
+        """Return the VRF UUID and the per switch records of an item.
+
+        Records of interfaces already present are left out. Raises
+        ValueError when the item cannot be resolved or conflicts with an
+        existing or previously planned interface.
+        """
+        vrf_uuid, names, switch_uuids, values = self.resolve(item)
+        if not switch_uuids:
+            raise ValueError("No switch selected")
+        index = self.indexes[vrf_uuid]
+        primary = values.get("ipv4_primary_address") or {}
+        addresses = expand_range(str(primary.get("address", "")))
+        is_range = len(addresses) > 1 or "-" in str(primary.get("address"))
+        # Range addresses are handed out in order, skipping used ones
+        free = (address for address in addresses if not index.is_used(address))
+
+        records = []
+        for switch_uuid in switch_uuids:
+            record = {**values, "switch_uuid": switch_uuid}
+            if record["if_type"] == "loopback":
+                record.setdefault("loopback_name", record.get("name"))
+            if interface_key(record) in self.existing[vrf_uuid]:
+                continue
+            if is_range:
+                address = next(free, None)
+                if address is None:
+                    for planned in records:
+                        index.remove(planned)
+                    raise ValueError(
+                        f"Not enough IP addresses in {primary['address']}",
+                    )
+            else:
+                address = addresses[0]
+            record["ipv4_primary_address"] = {
+                "address": address,
+                "prefix_length": int(primary["prefix_length"]),
+            }
+            record["switch_name"] = names.get(switch_uuid)
+            conflicts = index.conflicts(record)
+            if conflicts:
+                for planned in records:
+                    index.remove(planned)
+                raise ValueError(
+                    f"{describe_interface(record)} overlaps "
+                    + ", ".join(
+                        describe_interface(other) for other in conflicts
+                    ),
+                )
+            index.add(record)
+            records.append(record)
+        return vrf_uuid, records
+
+    def plan_update(self, item):
+        """Return the VRF UUID and the changes of the existing interfaces.
+
+        Each change holds the interface UUID, its JSON patch operations and
+        its updated record. The interface is looked up by name on the
+        selected switches, or on every switch having it when none is given.
+        A new primary address or VLAN is checked against the other
+        interfaces of the VRF. Raises ValueError when the interface does
+        not exist or conflicts.
+        """
+        vrf_uuid, names, switch_uuids, values = self.resolve(item)
+        index = self.indexes[vrf_uuid]
+        named = self.named[vrf_uuid]
+        name = values.get("name")
+        if switch_uuids:
+            currents = []
+            for switch_uuid in switch_uuids:
+                if (switch_uuid, name) not in named:
+                    raise ValueError(
+                        f"IP Interface {name} not found on "
+                        f"{names.get(switch_uuid) or switch_uuid}",
+                    )
+                currents.append(named[(switch_uuid, name)])
+        else:
+            currents = [
+                current for (_switch_uuid, current_name), current
+                in named.items() if current_name == name
+            ]
+            if not currents:
+                raise ValueError(f"IP Interface {name} not found")
+
+        primary = values.get("ipv4_primary_address")
+        addresses = []
+        if primary:
+            addresses = expand_range(str(primary["address"]))
+            prefix_length = int(primary["prefix_length"])
+        # A range keeps the current address when it is part of it
+        free = (address for address in addresses if not index.is_used(address))
+
+        changes = []
+        reindexed = []
+        try:
+            for current in currents:
+                wanted = dict(values)
+                if primary:
+                    address = (
+                        current.get("ipv4_primary_address") or {}
+                    ).get("address")
+                    if address not in addresses:
+                        address = (
+                            next(free, None)
+                            if len(addresses) > 1
+                            else addresses[0]
+                        )
+                    if address is None:
+                        raise ValueError(
+                            f"Not enough IP addresses in {primary['address']}",
+                        )
+                    wanted["ipv4_primary_address"] = {
+                        "address": address,
+                        "prefix_length": prefix_length,
+                    }
+                changed = interface_changes(current, wanted)
+                if not changed:
+                    continue
+                record = {
+                    **current,
+                    **changed,
+                    "switch_name": names.get(current["switch_uuid"]),
+                }
+                other = self.existing[vrf_uuid].get(interface_key(record))
+                if other is not None and other is not current:
+                    raise ValueError(
+                        f"{describe_interface(record)} conflicts with "
+                        f"{describe_interface(other)}",
+                    )
+                if {"ipv4_primary_address", "vlan"} & set(changed):
+                    if current.get("ipv4_primary_address"):
+                        index.remove(current)
+                    conflicts = index.conflicts(record)
+                    if conflicts:
+                        if current.get("ipv4_primary_address"):
+                            index.add(current)
+                        raise ValueError(
+                            f"{describe_interface(record)} overlaps "
+                            + ", ".join(
+                                describe_interface(other)
+                                for other in conflicts
+                            ),
+                        )
+                    index.add(record)
+                    reindexed.append((current, record))
+                operations = [
+                    {"op": "replace", "path": f"/{field}", "value": value}
+                    for field, value in changed.items()
+                ]
+                changes.append((current["uuid"], operations, record))
+        except ValueError:
+            for current, record in reindexed:
+                index.remove(record)
+                if current.get("ipv4_primary_address"):
+                    index.add(current)
+            raise
+
+        for _uuid, _operations, record in changes:
+            current = named[(record["switch_uuid"], name)]
+            del self.existing[vrf_uuid][interface_key(current)]
+            self.existing[vrf_uuid][interface_key(record)] = record
+            named[(record["switch_uuid"], name)] = record
+        return vrf_uuid, changes
+
+
+def interface_payload(record):
+    values = {
+        key: value
+        for key, value in record.items()
+        if key not in ["switch_name", "interface"]
+    }
+    return json.loads(models.IPInterface(**values).json(exclude_none=True))
+
+
+def record_outcomes(units, outcomes, action):
+    """Set the result of every interface of each batch from its outcome."""
+    for (_vrf_uuid, chunk), outcome in zip(units, outcomes):
+        for entry in chunk:
+            result = entry[-1]
+            if not outcome["status"]:
+                result.update(
+                    message=outcome["message"],
+                    status=False,
+                    changed=False,
+                )
+            elif "status" not in result:
+                result.update(
+                    message=f"Successfully {action} IP Interface "
+                    f"{result['name']} on {result['switches']} switches",
+                    status=True,
+                    changed=True,
+                )
+
+
+def create_interfaces(client, items, batch_size, max_parallel):
+    """Create a list of IP interfaces spread over several VRFs.
+
+    Every requested interface is checked against the existing interfaces of
+    its VRF and the other requested interfaces before anything is sent.
+    The missing interfaces are posted in arrays of batch_size per VRF, the
+    batches running concurrently. Routed ports need their internal LAG to be
+    resolved and their planned records are created one at a time with
+    pyafc.
+    """
+    planner = InterfacePlanner(client)
+    results = []
+    batches = {}
+    routed = []
+    for item in items:
+        result = {
+            "name": item.get("name"),
+            "fabric": item.get("fabric"),
+            "vrf": item.get("vrf"),
+        }
+        results.append(result)
+        try:
+            vrf_uuid, records = planner.plan(item)
+        except (KeyError, TypeError, ValueError) as exc:
+            result.update(message=str(exc), status=False, changed=False)
+            continue
+        if not records:
+            result.update(
+                message=f"IP Interface {item.get('name')} already exists. "
+                "No action taken",
+                status=True,
+                changed=False,
+            )
+        elif item.get("if_type") == "routed":
+            routed.append((item, records, result))
+        else:
+            result["switches"] = len(records)
+            batches.setdefault(vrf_uuid, []).extend(
+                (record, result) for record in records
+            )
+
+    units = [
+        (vrf_uuid, chunk)
+        for vrf_uuid, records in batches.items()
+        for chunk in chunked(records, batch_size)
+    ]
+
+    def post_batch(unit):
+        vrf_uuid, chunk = unit
+        request = client.post(
+            f"vrfs/{vrf_uuid}/ip_interfaces",
+            data=json.dumps(
+                [interface_payload(record) for record, _result in chunk],
+            ),
+        )
+        if request.status_code in utils.response_ok:
+            return f"Created {len(chunk)} IP Interfaces", True, True
+        return request.json()["result"], False, False
+
+    def create_routed(entry):
+        item, records, _result = entry
+        fabric_uuid = planner.fabrics[item["fabric"]]
+        vrf_instance = vrf.Vrf(
+            client,
+            name=item["vrf"],
+            fabric_uuid=fabric_uuid,
+        )
+        addresses = {
+            switch["uuid"]: switch.get("ip_address")
+            for switch in planner.fabric_switches(fabric_uuid)
+        }
+        # One call per planned record, with its switch and address
+        for count, record in enumerate(records):
+            values = {
+                key: value
+                for key, value in record.items()
+                if key not in ["switch_uuid", "switch_name"]
+            }
+            values["ipv4_primary_address"] = dict(
+                record["ipv4_primary_address"],
+            )
+            message, status, changed = vrf_instance.create_ip_interface(
+                switches=[addresses[record["switch_uuid"]]],
+                **values,
+            )
+            if not status:
+                return message, False, count > 0 or changed
+        return (
+            f"Successfully created IP Interface {item.get('name')} on "
+            f"{len(records)} switches",
+            True,
+            True,
+        )
+
+    record_outcomes(
+        units,
+        run_concurrently(post_batch, units, max_workers=max_parallel),
+        "created",
+    )
+    for (_item, _records, result), outcome in zip(
+        routed,
+        run_concurrently(create_routed, routed, max_workers=max_parallel),
+    ):
+        result.update(
+            message=outcome["message"],
+            status=outcome["status"],
+            changed=outcome["changed"],
+        )
+    for result in results:
+        result.pop("switches", None)
+    return results
+
+
+def update_interfaces(client, items, batch_size, max_parallel):
+    """Update existing IP interfaces in place.
+
+    Only the attributes differing from the controller are sent, as JSON
+    patch operations on the IP interfaces collection of each VRF, in
+    batches of batch_size interfaces running concurrently.
+    """
+    planner = InterfacePlanner(client)
+    results = []
+    batches = {}
+    for item in items:
+        result = {
+            "name": item.get("name"),
+            "fabric": item.get("fabric"),
+            "vrf": item.get("vrf"),
+        }
+        results.append(result)
+        try:
+            vrf_uuid, changes = planner.plan_update(item)
+        except (KeyError, TypeError, ValueError) as exc:
+            result.update(message=str(exc), status=False, changed=False)
+            continue
+        if not changes:
+            result.update(
+                message=f"IP Interface {item.get('name')} is up to date. "
+                "No action taken",
+                status=True,
+                changed=False,
+            )
+        else:
+            result["switches"] = len(changes)
+            batches.setdefault(vrf_uuid, []).extend(
+                (uuid, operations, result)
+                for uuid, operations, _record in changes
+            )
+
+    units = [
+        (vrf_uuid, chunk)
+        for vrf_uuid, changes in batches.items()
+        for chunk in chunked(changes, batch_size)
+    ]
+
+    def patch_batch(unit):
+        vrf_uuid, chunk = unit
+        request = client.patch(
+            f"vrfs/{vrf_uuid}/ip_interfaces",
+            data=json.dumps(
+                [
+                    {"uuids": [uuid], "patch": operations}
+                    for uuid, operations, _result in chunk
+                ],
+            ),
+        )
+        if request.status_code in utils.response_ok:
+            return f"Updated {len(chunk)} IP Interfaces", True, True
+        return request.json()["result"], False, False
+
+    record_outcomes(
+        units,
+        run_concurrently(patch_batch, units, max_workers=max_parallel),
+        "updated",
+    )
+    for result in results:
+        result.pop("switches", None)
+    return results
 
 
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
-        "data": {"type": "dict", "required": True},
+        "data": {"type": "dict", "required": False},
+        "interfaces": {"type": "list", "elements": "dict", "required": False},
+        "batch_size": {"type": "int", "required": False, "default": 100},
+        "max_parallel": {"type": "int", "required": False, "default": 4},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "interfaces")],
+        required_one_of=[("data", "interfaces")],
         supports_check_mode=True,
     )
 
@@ -452,8 +1182,12 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    interfaces = ansible_module.params["interfaces"]
+    batch_size = ansible_module.params["batch_size"]
+    max_parallel = ansible_module.params["max_parallel"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -467,35 +1201,65 @@ def main():
     afc_instance = instantiate_afc_object(data=auth_data)
 
     if afc_instance.afc_connected:
-        fabric_instance = fabric.Fabric(
-            afc_instance.client,
-            name=data["fabric"],
-        )
-        if fabric_instance.uuid:
-            vrf_instance = vrf.Vrf(
+        if interfaces is not None:
+            if operation in ["create", "update"]:
+                apply_interfaces = (
+                    create_interfaces
+                    if operation == "create"
+                    else update_interfaces
+                )
+                results = apply_interfaces(
+                    afc_instance.client,
+                    interfaces,
+                    batch_size,
+                    max_parallel,
+                )
+                message, status, changed = summarize_results(
+                    results,
+                    "IP Interfaces",
+                )
+            else:
+                message = "Operation not supported - No action taken"
+        elif operation == "update":
+            outcome = update_interfaces(
+                afc_instance.client,
+                [data],
+                batch_size,
+                max_parallel,
+            )[0]
+            message = outcome["message"]
+            status = outcome["status"]
+            changed = outcome["changed"]
+        else:
+            fabric_instance = fabric.Fabric(
                 afc_instance.client,
-                name=data["vrf"],
-                fabric_uuid=fabric_instance.uuid,
+                name=data["fabric"],
             )
-            if vrf_instance.uuid:
-                if operation == "create":
-                    message, status, changed = (
-                        vrf_instance.create_ip_interface(**data)
-                    )
-                elif operation == "delete":
-                    message, status, changed = (
-                        vrf_instance.delete_ip_interface(**data)
-                    )
+            if fabric_instance.uuid:
+                vrf_instance = vrf.Vrf(
+                    afc_instance.client,
+                    name=data["vrf"],
+                    fabric_uuid=fabric_instance.uuid,
+                )
+                if vrf_instance.uuid:
+                    if operation == "create":
+                        message, status, changed = (
+                            vrf_instance.create_ip_interface(**data)
+                        )
+                    elif operation == "delete":
+                        message, status, changed = (
+                            vrf_instance.delete_ip_interface(**data)
+                        )
+                    else:
+                        message = "Operation not supported - No action taken"
                 else:
-                    message = "Operation not supported - No action taken"
+                    message = "VRF not found - No action taken"
+                    status = False
+                    changed = False
             else:
-                message = "VRF not found - No action taken"
+                message = "Fabric not found - No action taken"
                 status = False
                 changed = False
-        else:
-            message = "Fabric not found - No action taken"
-            status = False
-            changed = False
 
         # Disconnect session if username and password are passed
         if username and password:
@@ -508,11 +1272,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results is not None:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
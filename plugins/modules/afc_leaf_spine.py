@@ -12,6 +12,10 @@ version_added: "0.0.1"
 short_description: Create Leaf-Spine configuration.
 description: >
     This module is used to configure Leaf-Spine relationship.
+    The links between the fabric switches seen by LLDP are compared with
+    the Leaf-Spine or Subleaf relationships already configured, and the
+    AFC workflow is skipped when every link is already configured. When
+    LLDP reports no link, such as on a fresh fabric, the workflow runs.
 options:
     afc_ip:
         description: >
@@ -131,16 +135,134 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each new leaf-spine or subleaf-leaf link
+    type: list
+    elements: dict
+    returned: when LLDP reported new links
+    sample:
+        -   name: "Leaf1/Spine1"
+            message: "Successfully configured link"
+            status: True
+            changed: True
 """
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
+    adjacency_index,
     afc_argument_spec,
     build_auth_data,
     instantiate_afc_object,
+    summarize_results,
+    switch_ports,
 )
 from pyafc.fabric import fabric
 
+# Roles at both ends of a link and relationship collection for each type
+TOPOLOGIES = {
+    "l3": (["leaf", "border_leaf"], ["spine"], "leaf_spine"),
+    "subleaf": (["sub_leaf"], ["leaf"], "subleaf_leaf"),
+}
+
+
+def link_name(pair):
+    return "/".join(switch.get("name") or switch["uuid"] for switch in pair)
+
+
+def topology_links(fabric_switches, links, lower_roles, upper_roles):
+    """Return the LLDP links between switches of the lower and upper roles.
+
+    Each link is returned as a (lower, upper) pair of switches.
+    """
+    switches = {switch["uuid"]: switch for switch in fabric_switches}
+    pairs = []
+    for pair in links:
+        first, second = (switches.get(uuid) for uuid in pair)
+        if first is None or second is None:
+            continue
+        if first.get("role") in upper_roles:
+            first, second = second, first
+        if (
+            first.get("role") in lower_roles
+            and second.get("role") in upper_roles
+        ):
+            pairs.append((first, second))
+    return sorted(pairs, key=link_name)
+
+
+def configured_links(client, fabric_uuid, collection):
+    """Return the switch pairs of the relationships configured in AFC."""
+    request = client.get(f"fabrics/{fabric_uuid}/{collection}")
+    configured = set()
+    for relationship in request.json()["result"] or []:
+        uuids = frozenset(
+            value for key, value in relationship.items()
+            if key.endswith("switch_uuid") and value
+        )
+        if len(uuids) == 2:
+            configured.add(uuids)
+    return configured
+
+
+def build_leaf_spine(client, fabric_instance, data):
+    """Run the leaf-spine or subleaf workflow unless every link exists.
+
+    The workflow is skipped when LLDP reports links between the switches
+    of the topology and every one of them already has a relationship, so
+    expanding a large fabric does not reprocess it. Without LLDP links,
+    such as on a fresh fabric, the workflow always runs. Returns the
+    message, status, changed and the per link results.
+    """
+    lower_roles, upper_roles, collection = TOPOLOGIES[data["type"]]
+    fabric_switches = client.get(
+        f"switches?fabrics={fabric_instance.uuid}",
+    ).json()["result"] or []
+    links = topology_links(
+        fabric_switches,
+        adjacency_index(switch_ports(client, fabric_switches)),
+        lower_roles,
+        upper_roles,
+    )
+    configured = configured_links(client, fabric_instance.uuid, collection)
+    new_links = [
+        pair for pair in links
+        if frozenset(switch["uuid"] for switch in pair) not in configured
+    ]
+    if links and not new_links:
+        message = (
+            f"No new link found, {len(configured)} links already "
+            "configured - No action taken"
+        )
+        return message, True, False, []
+
+    if data["type"] == "l3":
+        message, status, changed = fabric_instance.create_l3ls(**data)
+    else:
+        message, status, changed = fabric_instance.create_subleaf(**data)
+    if not links:
+        # Without LLDP links the outcome of the workflow is reported as is
+        return message, status, changed, []
+    if status:
+        configured = configured_links(
+            client,
+            fabric_instance.uuid,
+            collection,
+        )
+        message = "Link not configured by AFC"
+    results = []
+    for pair in new_links:
+        done = frozenset(switch["uuid"] for switch in pair) in configured
+        results.append(
+            {
+                "name": link_name(pair),
+                "message": "Successfully configured link" if done else message,
+                "status": done,
+                "changed": done,
+            },
+        )
+    message, status, changed = summarize_results(results, "links")
+    return message, status, changed, results
+
 
 def main():
     module_args = {
@@ -160,6 +282,7 @@ def main():
     data = ansible_module.params["data"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -180,11 +303,11 @@ def main():
         )
 
         if fabric_instance.uuid:
-            if data["type"] == "l3":
-                message, status, changed = fabric_instance.create_l3ls(**data)
-            elif data["type"] == "subleaf":
-                message, status, changed = fabric_instance.create_subleaf(
-                    **data,
+            if data["type"] in TOPOLOGIES:
+                message, status, changed, results = build_leaf_spine(
+                    afc_instance.client,
+                    fabric_instance,
+                    data,
                 )
             else:
                 message = "Operation not supported - No action taken"
@@ -204,11 +327,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
@@ -103,7 +103,89 @@ options:
                         description: IP address for BGP neighbor peering
                         type: str
                         required: true
-        required: true
+        required: false
+    topology:
+        description: >
+            Interconnects of several fabrics described as a topology. Each
+            fabric gets one Multi-Fabrics configuration holding all of its
+            remote fabrics, pairs being interconnected in both directions.
+            Pairs already interconnected are skipped, the other remotes are
+            added to the existing configuration of the fabric or a new one
+            is created, and fabrics are configured concurrently. Mutually
+            exclusive with data.
+        type: dict
+        required: false
+        suboptions:
+            name:
+                description: >
+                    Name prefix of the Multi-Fabrics configurations created,
+                    followed by the local fabric name.
+                type: str
+                required: true
+            type:
+                description: >
+                    mesh interconnects every fabric, hub_spoke interconnects
+                    the hub with every other fabric and pairs interconnects
+                    the listed pairs.
+                type: str
+                choices:
+                    - mesh
+                    - hub_spoke
+                    - pairs
+                required: true
+            fabrics:
+                description: Fabrics of the topology.
+                type: list
+                elements: dict
+                required: true
+                suboptions:
+                    fabric:
+                        description: Name of the Fabric
+                        type: str
+                        required: true
+                    border_leader:
+                        description: >
+                            Name or IPv4 Address of the Border Leader.
+                            In case of VSX just provide the Name or
+                            IPv4 Address of one of the members.
+                        type: str
+                        required: true
+                    peering_ip:
+                        description: IP address for BGP neighbor peering
+                        type: str
+                        required: true
+            hub:
+                description: Name of the hub Fabric with hub_spoke.
+                type: str
+                required: false
+            pairs:
+                description: Fabric pairs to interconnect with pairs.
+                type: list
+                elements: dict
+                required: false
+                suboptions:
+                    local:
+                        description: Name of the first Fabric
+                        type: str
+                        required: true
+                    remote:
+                        description: Name of the second Fabric
+                        type: str
+                        required: true
+            bgp_auth_password:
+                description: Set password for bgp neighbor
+                type: str
+                required: false
+            uplink_to_uplink:
+                description: Enable or Disable uplink to uplink.
+                type: bool
+                required: false
+    max_parallel:
+        description: >
+            Maximum number of fabrics configured at the same time when
+            topology is used.
+        type: int
+        default: 4
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -137,6 +219,49 @@ EXAMPLES = r"""
                   border_leader: "10.20.20.20"
                   peering_ip: "loopback0"
 
+-   name: Interconnect four data centers in full mesh
+    arubanetworks.afc.afc_multifabrics:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        operation: "create"
+        topology:
+            name: "MF"
+            type: "mesh"
+            fabrics:
+                - fabric: "Aruba-Fabric-DC1"
+                  border_leader: "10.10.10.20"
+                  peering_ip: "loopback0"
+                - fabric: "Aruba-Fabric-DC2"
+                  border_leader: "10.20.20.20"
+                  peering_ip: "loopback0"
+                - fabric: "Aruba-Fabric-DC3"
+                  border_leader: "10.30.30.20"
+                  peering_ip: "loopback0"
+                - fabric: "Aruba-Fabric-DC4"
+                  border_leader: "10.40.40.20"
+                  peering_ip: "loopback0"
+
+-   name: Interconnect data centers through a hub
+    arubanetworks.afc.afc_multifabrics:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        operation: "create"
+        topology:
+            name: "MF"
+            type: "hub_spoke"
+            hub: "Aruba-Fabric-DC1"
+            fabrics:
+                - fabric: "Aruba-Fabric-DC1"
+                  border_leader: "10.10.10.20"
+                  peering_ip: "loopback0"
+                - fabric: "Aruba-Fabric-DC2"
+                  border_leader: "10.20.20.20"
+                  peering_ip: "loopback0"
+                - fabric: "Aruba-Fabric-DC3"
+                  border_leader: "10.30.30.20"
+                  peering_ip: "loopback0"
+        max_parallel: 2
+
 """
 
 RETURN = r"""
@@ -155,26 +280,289 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: >
+        Outcome of each fabric pair and direction when topology is used
+    type: list
+    elements: dict
+    returned: when topology is used
+    sample:
+        -   name: "Aruba-Fabric-DC1/Aruba-Fabric-DC2"
+            fabric: "Aruba-Fabric-DC1"
+            remote_fabric: "Aruba-Fabric-DC2"
+            message: "Successfully created MultFabrics configuration"
+            status: True
+            changed: True
+            elapsed: 3.2
 """
 
+import json
+from itertools import combinations
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
     instantiate_afc_object,
+    run_concurrently,
+    summarize_results,
 )
-from pyafc.fabric import fabric
+from pyafc.common import exceptions, utils
+from pyafc.fabric import fabric, models, vsx
+from pyafc.vrf import vrf
+
+
+def topology_links(topology):
+    """Expand a topology into (local, remote) fabric names.
+
+    Each fabric pair is returned in both directions, as every fabric of a
+    pair holds its own Multi-Fabrics configuration.
+    """
+    names = [item["fabric"] for item in topology["fabrics"]]
+    if topology["type"] == "mesh":
+        pairs = list(combinations(names, 2))
+    elif topology["type"] == "hub_spoke":
+        hub = topology.get("hub")
+        if hub not in names:
+            raise ValueError(f"Hub {hub} is not one of the topology fabrics")
+        pairs = [(hub, name) for name in names if name != hub]
+    else:
+        pairs = [
+            (pair["local"], pair["remote"])
+            for pair in topology.get("pairs") or []
+        ]
+        for local, remote in pairs:
+            if local == remote:
+                raise ValueError(f"Fabric {local} cannot be paired to itself")
+            for name in (local, remote):
+                if name not in names:
+                    raise ValueError(
+                        f"Fabric {name} is not one of the topology fabrics",
+                    )
+    links = []
+    for local, remote in pairs:
+        for link in ((local, remote), (remote, local)):
+            if link not in links:
+                links.append(link)
+    return links
+
+
+def multi_fabrics_configs(client):
+    """Return the Multi-Fabrics configuration of each fabric UUID."""
+    request = client.get("fabrics/multi_hop_vxlan")
+    configs = {}
+    for config in request.json()["result"] or []:
+        configs.setdefault(config.get("fabric_uuid"), config)
+    return configs
+
+
+def configured_interconnects(configs):
+    """Return the (local, remote) fabric UUIDs already interconnected."""
+    return {
+        (fabric_uuid, remote.get("fabric_uuid"))
+        for fabric_uuid, config in configs.items()
+        for remote in config.get("remote_fabrics") or []
+    }
+
+
+def remote_fabric_values(client, remote, fabric_uuid):
+    """Return the RemoteFabric values of a remote fabric.
+
+    The remote border is resolved to its VSX pair when it has one, and the
+    ASN and peering address are read from its default VRF, the values
+    pyafc resolves while creating a configuration.
+    """
+    border_uuid = utils.consolidate_switches_list(
+        client,
+        remote["border_leader"],
+    )
+    if not border_uuid:
+        raise exceptions.NoDeviceFound
+    vsx_information = vsx.VSX.check_vsx_membership(
+        client,
+        fabric_uuid,
+        border_uuid[0],
+    )
+    peer_uuid = (
+        vsx_information["vsx_members"][0]
+        if vsx_information["vsx_uuid"]
+        else border_uuid[0]
+    )
+
+    vrf_uuid = vrf.Vrf.get_vrf_uuid(client, name="default", fabric=fabric_uuid)
+    if not vrf_uuid:
+        raise exceptions.NoBGPonRemoteBorderException
+    bgp = client.get(f"vrfs/{vrf_uuid}/bgp/{border_uuid[0]}").json()["result"]
+    if not bgp:
+        raise exceptions.NoBGPonRemoteBorderException
+    address = None
+    for intf in client.get(f"vrfs/{vrf_uuid}/ip_interfaces").json()["result"]:
+        if (
+            intf["name"] == remote["peering_ip"]
+            and intf["switch_uuid"] == peer_uuid
+        ):
+            address = intf["ipv4_primary_address"]["address"]
+            break
+    if address is None:
+        raise ValueError(
+            f"Peering interface {remote['peering_ip']} not found on remote "
+            f"Border {remote['border_leader']}",
+        )
+
+    return models.RemoteFabric(
+        fabric_uuid=fabric_uuid,
+        border_leader_uuid=vsx_information["vsx_uuid"] or border_uuid[0],
+        asn=str(bgp["as_number"]),
+        ipv4_address_A=address,
+    ).dict()
+
+
+def extend_multi_fabrics(client, fabric_uuid, config, remotes, fabric_uuids):
+    """Add remote fabrics to an existing Multi-Fabrics configuration.
+
+    The remote fabrics are appended to the remote_fabrics of the existing
+    configuration, in the uuids/patch form pyafc sends to the AFC
+    collections.
+    """
+    operations = []
+    try:
+        for remote in remotes:
+            operations.append(
+                {
+                    "op": "add",
+                    "path": "/remote_fabrics/-",
+                    "value": remote_fabric_values(
+                        client,
+                        remote,
+                        fabric_uuids[remote["fabric"]],
+                    ),
+                },
+            )
+    except exceptions.NoDeviceFound:
+        return "Border not found", False, False
+    except exceptions.NoBGPonRemoteBorderException:
+        return "BGP is not configured on remote Border", False, False
+    except ValueError as exc:
+        return str(exc), False, False
+
+    request = client.patch(
+        f"fabrics/{fabric_uuid}/multi_hop_vxlan",
+        data=json.dumps([{"uuids": [config["uuid"]], "patch": operations}]),
+    )
+    if request.status_code in utils.response_ok:
+        return (
+            f"Successfully extended MultiFabrics configuration "
+            f"{config.get('name')}",
+            True,
+            True,
+        )
+    return request.json()["result"], False, False
+
+
+def interconnect_fabrics(client, topology, max_parallel):
+    """Create or extend the Multi-Fabrics configurations of a topology.
+
+    The fabrics and the existing configurations are read once. Each fabric
+    gets a single configuration holding all of its remote fabrics: the
+    missing remotes extend the existing configuration of the fabric, or
+    create it. Fabrics are configured concurrently. Returns the per link
+    results in the order of the topology.
+    """
+    links = topology_links(topology)
+    entries = {item["fabric"]: item for item in topology["fabrics"]}
+    fabric_uuids = {
+        item["name"]: item["uuid"]
+        for item in client.get("fabrics").json()["result"]
+    }
+    configs = multi_fabrics_configs(client)
+    configured = configured_interconnects(configs)
+
+    outcomes = {}
+    pending = {}
+    for local, remote in links:
+        missing = [
+            name for name in (local, remote) if name not in fabric_uuids
+        ]
+        if missing:
+            outcomes[(local, remote)] = {
+                "message": f"Fabric {missing[0]} not found",
+                "status": False,
+                "changed": False,
+            }
+        elif (fabric_uuids[local], fabric_uuids[remote]) in configured:
+            outcomes[(local, remote)] = {
+                "message": "Interconnect already configured. "
+                "No action taken",
+                "status": True,
+                "changed": False,
+            }
+        else:
+            pending.setdefault(local, []).append(remote)
+
+    options = {
+        key: topology[key]
+        for key in ["bgp_auth_password", "uplink_to_uplink"]
+        if topology.get(key) is not None
+    }
+
+    def configure(local):
+        remotes = [
+            {
+                "fabric": remote,
+                "border_leader": entries[remote]["border_leader"],
+                "peering_ip": entries[remote]["peering_ip"],
+            }
+            for remote in pending[local]
+        ]
+        config = configs.get(fabric_uuids[local])
+        if config:
+            return extend_multi_fabrics(
+                client,
+                fabric_uuids[local],
+                config,
+                remotes,
+                fabric_uuids,
+            )
+        fabric_instance = fabric.Fabric(client, name=local)
+        message, status, changed = fabric_instance.create_multi_fabrics(
+            name=f"{topology['name']}-{local}",
+            border_leader=entries[local]["border_leader"],
+            remote_fabrics=remotes,
+            **options,
+        )
+        return str(message), status, changed
+
+    for local, outcome in zip(
+        pending,
+        run_concurrently(configure, pending, max_workers=max_parallel),
+    ):
+        for remote in pending[local]:
+            outcomes[(local, remote)] = outcome
+
+    return [
+        {
+            "name": f"{local}/{remote}",
+            "fabric": local,
+            "remote_fabric": remote,
+            **outcomes[(local, remote)],
+        }
+        for local, remote in links
+    ]
 
 
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
-        "data": {"type": "dict", "required": True},
+        "data": {"type": "dict", "required": False},
+        "topology": {"type": "dict", "required": False},
+        "max_parallel": {"type": "int", "required": False, "default": 4},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "topology")],
+        required_one_of=[("data", "topology")],
         supports_check_mode=True,
     )
 
@@ -182,8 +570,11 @@ def main():
     username = ansible_module.params["afc_username"]
     password = ansible_module.params["afc_password"]
     data = ansible_module.params["data"]
+    topology = ansible_module.params["topology"]
+    max_parallel = ansible_module.params["max_parallel"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -197,18 +588,32 @@ def main():
     afc_instance = instantiate_afc_object(data=auth_data)
 
     if afc_instance.afc_connected:
-        fabric_instance = fabric.Fabric(
-            afc_instance.client,
-            name=data["local_fabric"],
-        )
-        if fabric_instance.uuid:
-            message, status, changed = fabric_instance.create_multi_fabrics(
-                **data
-            )
+        if topology:
+            try:
+                results = interconnect_fabrics(
+                    afc_instance.client,
+                    topology,
+                    max_parallel,
+                )
+                message, status, changed = summarize_results(
+                    results,
+                    "interconnects",
+                )
+            except ValueError as exc:
+                message = str(exc)
         else:
-            message = f"Fabric {data['local_fabric']} not found"
-            status = False
-            changed = False
+            fabric_instance = fabric.Fabric(
+                afc_instance.client,
+                name=data["local_fabric"],
+            )
+            if fabric_instance.uuid:
+                message, status, changed = (
+                    fabric_instance.create_multi_fabrics(**data)
+                )
+            else:
+                message = f"Fabric {data['local_fabric']} not found"
+                status = False
+                changed = False
         # Disconnect session if username and password are passed
         if username and password:
             afc_instance.disconnect()
@@ -220,11 +625,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
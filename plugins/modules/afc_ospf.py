@@ -12,6 +12,8 @@ version_added: "0.0.1"
 short_description: Create or delete an OSPF configuration.
 description:
   - This module creates or deletes an OSPF configuration.
+  - With intent, it converges the whole OSPF configuration of a VRF, routers,
+    areas and interfaces, to the given description.
 options:
   afc_ip:
     description:
@@ -43,14 +45,16 @@ options:
   operation:
     description:
       - Operation to be performed on the OSPF object, create or delete.
+      - Not used with intent.
     type: str
     choices: [create]
-    required: true
+    required: false
   data:
     description:
       - Object specific data for OSPF router, area, or interface.
+      - Mutually exclusive with intent.
     type: dict
-    required: true
+    required: false
     suboptions:
       type:
         description:
@@ -287,6 +291,56 @@ options:
         type: list
         elements: str
         required: true
+  intent:
+    description:
+      - Complete OSPF configuration of a VRF. Mutually exclusive with data.
+      - The OSPF routers with their areas and interfaces, the IP interfaces
+        and the switches of the fabric are read once and compared with the
+        intent.
+      - Routers, areas and interfaces of the VRF missing from the intent are
+        deleted, interfaces first, then areas, then routers. Missing objects
+        are then created and the ones differing from the intent updated,
+        routers first, then areas, then interfaces.
+      - Attributes not given take the default values of the data options.
+    type: dict
+    required: false
+    suboptions:
+      fabric:
+        description:
+          - Fabric Name.
+        type: str
+        required: true
+      vrf:
+        description:
+          - VRF Name.
+        type: str
+        required: true
+      routers:
+        description:
+          - OSPF Routers, each using the router attributes of data.
+          - A router is created on each of its switches and is identified on
+            a switch by its process id.
+          - Areas is the list of areas of the router, each using the area
+            attributes of data, area_id being an integer or a dotted ID.
+          - Interfaces is the list of interfaces of an area, each using the
+            interface attributes of data, name being the SVI, loopback or
+            routed port name. An interface is configured on the switches
+            given in its switches, by default on every switch of the router.
+        type: list
+        elements: dict
+        required: false
+  batch_size:
+    description:
+      - Maximum number of updates sent in one request when intent is used.
+      - Objects receiving the same changes count as one update.
+    type: int
+    default: 100
+  max_parallel:
+    description:
+      - Maximum number of requests sent to AFC at the same time when intent
+        is used.
+    type: int
+    default: 4
 author:
   - Aruba Networks (@ArubaNetworks)
 """
@@ -392,6 +446,31 @@ EXAMPLES = r"""
             interface: "1/1/14"
             network_type: "ospf_iftype_pointopoint"
             process: 1
+
+-   name: Apply the complete OSPF configuration of a VRF using token
+    arubanetworks.afc.afc_ospf:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        intent:
+            fabric: "Aruba-Fabric"
+            vrf: "default"
+            routers:
+                -   name: "Test-OSPF-Router"
+                    id: 1
+                    switches:
+                        - "leaf"
+                    redistribute:
+                        redistribute_bgp: false
+                    areas:
+                        -   name: "Test-OSPF-Area"
+                            area_id: 0
+                            interfaces:
+                                -   name: "VLAN250"
+                                    network_type: "ospf_iftype_broadcast"
+                                -   name: "1/1/14"
+                                    network_type: "ospf_iftype_pointopoint"
+                                    switches:
+                                        - "10.10.10.11"
 """
 
 
@@ -411,27 +490,611 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each OSPF object created, updated or deleted
+    type: list
+    elements: dict
+    returned: when intent is used and objects were changed
+    sample:
+        -   name: "Test-OSPF-Router-Leaf1"
+            action: "create"
+            message: "Successfully created"
+            status: True
+            changed: True
 """
 
+import ipaddress
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
+    chunked,
     instantiate_afc_object,
+    resolve_switches,
+    run_concurrently,
+    summarize_results,
 )
+from pyafc.common import utils
 from pyafc.fabric import fabric
-from pyafc.vrf import vrf
+from pyafc.vrf import models, vrf
+
+
+def area_address(value):
+    """Return an OSPF area ID in dotted notation."""
+    if isinstance(value, int) or str(value).isdigit():
+        return str(ipaddress.IPv4Address(int(value)))
+    return str(ipaddress.IPv4Address(str(value)))
+
+
+def changed_values(current, wanted):
+    """Return the wanted values differing from the current object.
+
+    Values the controller does not return are not compared, and
+    dictionaries are compared on the wanted keys only.
+    """
+    changes = {}
+    for key, value in wanted.items():
+        if key not in current:
+            continue
+        existing = current[key]
+        if isinstance(value, dict) and isinstance(existing, dict):
+            if all(existing.get(item) == value[item] for item in value):
+                continue
+            value = {**existing, **value}
+        elif value == existing:
+            continue
+        changes[key] = value
+    return changes
+
+
+class OspfInventory:
+    """OSPF routers, areas and interfaces of a VRF.
+
+    Routers are keyed by switch UUID and process ID, areas by router key
+    and dotted area ID and interfaces by router key and IP interface UUID,
+    so the intent is compared with dictionary lookups.
+    """
+
+    def __init__(self, client, vrf_uuid):
+        self.client = client
+        self.vrf_uuid = vrf_uuid
+        self.routers = {}
+        self.areas = {}
+        self.interfaces = {}
+
+    def router_path(self, router):
+        return f"vrfs/{self.vrf_uuid}/ospf_routers/{router['instance_uuid']}"
+
+    def area_path(self, router, area):
+        return f"{self.router_path(router)}/areas/{area['area_uuid']}"
+
+    def load(self, with_interfaces=True):
+        """Read the OSPF routers with their areas in one request.
+
+        Area interfaces are read with the areas when the controller returns
+        them, otherwise with one request per area.
+        """
+        request = self.client.get(
+            f"vrfs/{self.vrf_uuid}/ospf_routers?areas=true",
+        )
+        self.routers = {}
+        self.areas = {}
+        if with_interfaces:
+            self.interfaces = {}
+        for router in request.json()["result"] or []:
+            router_key = (router["switch_uuid"], router["id"])
+            self.routers[router_key] = router
+            for area in router.get("areas") or []:
+                area_key = (*router_key, area_address(area["area_id"]))
+                self.areas[area_key] = (router, area)
+                if not with_interfaces:
+                    continue
+                interfaces = area.get("interfaces")
+                if interfaces is None:
+                    interfaces = self.client.get(
+                        f"{self.area_path(router, area)}/interfaces",
+                    ).json()["result"] or []
+                for interface in interfaces:
+                    self.interfaces[(*router_key, interface["if_uuid"])] = (
+                        area_key,
+                        interface,
+                    )
+
+
+class IpInterfaceLookup:
+    """Find the UUID of the IP interface an OSPF interface is bound to.
+
+    SVIs and loopbacks are found by name, routed ports by the internal LAG
+    of their port. The IP interfaces and internal LAGs are read once.
+    """
+
+    def __init__(self, client, vrf_uuid):
+        self.client = client
+        request = client.get(f"vrfs/{vrf_uuid}/ip_interfaces")
+        self.ip_interfaces = request.json()["result"] or []
+        self.lags = None
+
+    def uuid(self, switch_uuid, name):
+        for item in self.ip_interfaces:
+            if item["switch_uuid"] == switch_uuid and name in [
+                item.get("name"),
+                item.get("loopback_name"),
+            ]:
+                return item["uuid"]
+        if self.lags is None:
+            self.lags = self.client.get("lags?type=internal").json()["result"]
+        lag_uuids = [
+            lag["uuid"] for lag in self.lags or []
+            if lag["name"] == f"LAG#{name}"
+            and lag["port_properties"][0]["switch_uuid"] == switch_uuid
+        ]
+        for item in self.ip_interfaces:
+            if item.get("lag_uuid") and item["lag_uuid"] in lag_uuids:
+                return item["uuid"]
+        raise ValueError(f"IP Interface {name} not found")
+
+
+def ospf_intent(intent, fabric_switches, lookup):
+    """Return the routers, areas and interfaces described by an intent.
+
+    Every object is keyed like in OspfInventory and holds its label, the
+    values compared with the controller and, for routers, the router of
+    the intent creating it. Raises ValueError on an invalid intent.
+    """
+    names = {switch["uuid"]: switch.get("name") for switch in fabric_switches}
+    routers = {}
+    areas = {}
+    interfaces = {}
+    for router in intent.get("routers") or []:
+        attributes = {
+            key: value for key, value in router.items()
+            if key not in ["name", "switches", "areas"] and value is not None
+        }
+        switch_uuids = resolve_switches(
+            fabric_switches,
+            router.get("switches"),
+        )
+        if not switch_uuids:
+            raise ValueError(f"OSPF Router {router['name']} has no switch")
+        values = models.OspfRouter(
+            name_prefix=router["name"],
+            switch_uuids=switch_uuids,
+            **attributes,
+        ).dict(exclude_none=True)
+        process = values["id"]
+        for switch_uuid in switch_uuids:
+            router_key = (switch_uuid, process)
+            if router_key in routers:
+                raise ValueError(
+                    f"OSPF process {process} defined twice on "
+                    f"{names[switch_uuid]}",
+                )
+            routers[router_key] = {
+                "label": f"{router['name']}-{names[switch_uuid]}",
+                "router": values,
+                "values": {
+                    **{
+                        key: value for key, value in values.items()
+                        if key not in ["name_prefix", "switch_uuids"]
+                    },
+                    "name": f"{router['name']}-{names[switch_uuid]}",
+                },
+            }
+
+        for area in router.get("areas") or []:
+            area_id = area_address(area.get("area_id", 0))
+            area_values = models.OspfArea(
+                **{
+                    key: value for key, value in area.items()
+                    if key not in ["area_id", "interfaces"]
+                    and value is not None
+                },
+                area_id=int(ipaddress.IPv4Address(area_id)),
+            ).dict(exclude_none=True)
+            for switch_uuid in switch_uuids:
+                area_key = (switch_uuid, process, area_id)
+                if area_key in areas:
+                    raise ValueError(
+                        f"OSPF area {area_id} defined twice on "
+                        f"{names[switch_uuid]}",
+                    )
+                areas[area_key] = {
+                    "label": f"{area_values['name']} ({area_id}) on "
+                    f"{names[switch_uuid]}",
+                    "values": area_values,
+                }
+
+            for interface in area.get("interfaces") or []:
+                selected = (
+                    resolve_switches(
+                        fabric_switches,
+                        interface.get("switches"),
+                    )
+                    or switch_uuids
+                )
+                attributes = {
+                    key: value for key, value in interface.items()
+                    if key not in ["name", "switches"] and value is not None
+                }
+                for switch_uuid in selected:
+                    if switch_uuid not in switch_uuids:
+                        raise ValueError(
+                            f"OSPF Router {router['name']} is not "
+                            f"configured on {names[switch_uuid]}",
+                        )
+                    if_uuid = lookup.uuid(switch_uuid, interface["name"])
+                    interface_key = (switch_uuid, process, if_uuid)
+                    if interface_key in interfaces:
+                        raise ValueError(
+                            f"OSPF interface {interface['name']} defined "
+                            f"twice on {names[switch_uuid]}",
+                        )
+                    interfaces[interface_key] = {
+                        "label": f"{interface['name']} in area {area_id} on "
+                        f"{names[switch_uuid]}",
+                        "area": (switch_uuid, process, area_id),
+                        "values": models.OspfInterface(
+                            if_uuid=if_uuid,
+                            **attributes,
+                        ).dict(),
+                    }
+    return routers, areas, interfaces
+
+
+def send_request(client, method, path, message, payload=None):
+    """Send one OSPF request and return a pyafc style outcome."""
+    if payload is None:
+        request = getattr(client, method)(path)
+    else:
+        request = getattr(client, method)(path, data=json.dumps(payload))
+    if request.status_code in utils.response_ok:
+        return message, True, True
+    return request.json()["result"], False, False
+
+
+def patch_units(client, path, updates, batch_size, results):
+    """Return the units patching the updated objects of a collection.
+
+    Objects receiving the same operations share one entry of the request,
+    and at most batch_size entries are sent per request.
+    """
+    entries = {}
+    for uuid, changes, label in updates:
+        operations = [
+            {"op": "replace", "path": f"/{key}", "value": value}
+            for key, value in changes.items()
+        ]
+        entry = entries.setdefault(
+            json.dumps(operations, sort_keys=True),
+            {"uuids": [], "patch": operations, "results": []},
+        )
+        entry["uuids"].append(uuid)
+        entry["results"].append(new_result(results, label, "update"))
+    units = []
+    for chunk in chunked(entries.values(), batch_size):
+        payload = [
+            {"uuids": entry["uuids"], "patch": entry["patch"]}
+            for entry in chunk
+        ]
+        units.append(
+            (
+                lambda payload=payload: send_request(
+                    client,
+                    "patch",
+                    path,
+                    "Successfully updated",
+                    payload,
+                ),
+                [result for entry in chunk for result in entry["results"]],
+            ),
+        )
+    return units
+
+
+def new_result(results, label, action):
+    result = {"name": label, "action": action}
+    results.append(result)
+    return result
+
+
+def run_units(units, max_parallel):
+    """Send the requests of one step and set the results of their objects."""
+    outcomes = run_concurrently(
+        lambda unit: unit[0](),
+        units,
+        max_workers=max_parallel,
+    )
+    for (_send, unit_results), outcome in zip(units, outcomes):
+        for result in unit_results:
+            result.update(
+                message=outcome["message"],
+                status=outcome["status"],
+                changed=outcome["changed"],
+            )
+
+
+def fail_missing(results, label, action, parent):
+    new_result(results, label, action).update(
+        message=f"{parent} not found",
+        status=False,
+        changed=False,
+    )
+
+
+def apply_ospf_intent(client, intent, batch_size, max_parallel):
+    """Converge the OSPF configuration of a VRF to its intent.
+
+    The OSPF objects, IP interfaces and switches are read once and
+    compared with the intent. Objects missing from the intent are deleted
+    first, interfaces before areas before routers, then routers, areas and
+    interfaces are created or updated in that order. Routers are created
+    with one request for all their switches, updates are sent as batched
+    JSON patch requests and the requests of each step run concurrently.
+    """
+    fabrics = {
+        item["name"]: item["uuid"]
+        for item in client.get("fabrics").json()["result"]
+    }
+    fabric_uuid = fabrics.get(intent.get("fabric"))
+    if fabric_uuid is None:
+        return "Fabric not found - No action taken", False, False, []
+    vrf_uuid = {
+        item["name"]: item["uuid"]
+        for item in client.get(f"vrfs?fabrics={fabric_uuid}").json()["result"]
+    }.get(intent.get("vrf"))
+    if vrf_uuid is None:
+        return "VRF not found - No action taken", False, False, []
+    fabric_switches = client.get(
+        f"switches?fabrics={fabric_uuid}",
+    ).json()["result"] or []
+
+    inventory = OspfInventory(client, vrf_uuid)
+    inventory.load()
+    try:
+        routers, areas, interfaces = ospf_intent(
+            intent,
+            fabric_switches,
+            IpInterfaceLookup(client, vrf_uuid),
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        return f"Invalid OSPF intent: {exc}", False, False, []
+
+    results = []
+    names = {switch["uuid"]: switch.get("name") for switch in fabric_switches}
+
+    # Deletions, children first
+    units = []
+    for interface_key, (area_key, current) in inventory.interfaces.items():
+        wanted = interfaces.get(interface_key)
+        if wanted is None or wanted["area"] != area_key:
+            router, area = inventory.areas[area_key]
+            units.append(
+                (
+                    lambda router=router, area=area, current=current: (
+                        send_request(
+                            client,
+                            "delete",
+                            f"{inventory.area_path(router, area)}/interfaces/"
+                            f"{current['uuid']}",
+                            "Successfully deleted",
+                        )
+                    ),
+                    [
+                        new_result(
+                            results,
+                            f"interface {current['if_uuid']} in area "
+                            f"{area_key[2]} on {names.get(area_key[0])}",
+                            "delete",
+                        ),
+                    ],
+                ),
+            )
+    run_units(units, max_parallel)
+    units = []
+    for area_key, (router, area) in inventory.areas.items():
+        if area_key not in areas:
+            units.append(
+                (
+                    lambda router=router, area=area: send_request(
+                        client,
+                        "delete",
+                        inventory.area_path(router, area),
+                        "Successfully deleted",
+                    ),
+                    [
+                        new_result(
+                            results,
+                            f"{area.get('name')} ({area_key[2]}) on "
+                            f"{names.get(area_key[0])}",
+                            "delete",
+                        ),
+                    ],
+                ),
+            )
+    run_units(units, max_parallel)
+    units = []
+    for router_key, router in inventory.routers.items():
+        if router_key not in routers:
+            units.append(
+                (
+                    lambda router=router: send_request(
+                        client,
+                        "delete",
+                        inventory.router_path(router),
+                        "Successfully deleted",
+                    ),
+                    [new_result(results, router.get("name"), "delete")],
+                ),
+            )
+    run_units(units, max_parallel)
+
+    # Routers, one creation request per router of the intent
+    units = []
+    missing = {}
+    updates = []
+    for router_key, wanted in routers.items():
+        current = inventory.routers.get(router_key)
+        if current is None:
+            entry = missing.setdefault(
+                id(wanted["router"]),
+                {"router": wanted["router"], "switches": [], "results": []},
+            )
+            entry["switches"].append(router_key[0])
+            entry["results"].append(
+                new_result(results, wanted["label"], "create"),
+            )
+            continue
+        changes = changed_values(current, wanted["values"])
+        if changes:
+            updates.append(
+                (current["instance_uuid"], changes, wanted["label"]),
+            )
+    for entry in missing.values():
+        units.append(
+            (
+                lambda entry=entry: send_request(
+                    client,
+                    "post",
+                    f"vrfs/{vrf_uuid}/ospf_routers",
+                    "Successfully created",
+                    {**entry["router"], "switch_uuids": entry["switches"]},
+                ),
+                entry["results"],
+            ),
+        )
+    units.extend(
+        patch_units(
+            client,
+            f"vrfs/{vrf_uuid}/ospf_routers",
+            updates,
+            batch_size,
+            results,
+        ),
+    )
+    run_units(units, max_parallel)
+    if missing:
+        inventory.load(with_interfaces=False)
+
+    # Areas, created on each router and updated per router
+    units = []
+    created = False
+    updates = {}
+    for area_key, wanted in areas.items():
+        router = inventory.routers.get(area_key[:2])
+        if router is None:
+            fail_missing(results, wanted["label"], "create", "OSPF Router")
+            continue
+        if area_key not in inventory.areas:
+            created = True
+            units.append(
+                (
+                    lambda router=router, wanted=wanted: send_request(
+                        client,
+                        "post",
+                        f"{inventory.router_path(router)}/areas",
+                        "Successfully created",
+                        wanted["values"],
+                    ),
+                    [new_result(results, wanted["label"], "create")],
+                ),
+            )
+            continue
+        _router, current = inventory.areas[area_key]
+        changes = changed_values(
+            current,
+            {
+                key: value for key, value in wanted["values"].items()
+                if key != "area_id"
+            },
+        )
+        if changes:
+            updates.setdefault(inventory.router_path(router), []).append(
+                (current["area_uuid"], changes, wanted["label"]),
+            )
+    for path, path_updates in updates.items():
+        units.extend(
+            patch_units(
+                client,
+                f"{path}/areas",
+                path_updates,
+                batch_size,
+                results,
+            ),
+        )
+    run_units(units, max_parallel)
+    if created:
+        inventory.load(with_interfaces=False)
+
+    # Interfaces, created and updated per area
+    units = []
+    updates = {}
+    for interface_key, wanted in interfaces.items():
+        if wanted["area"] not in inventory.areas:
+            fail_missing(results, wanted["label"], "create", "OSPF Area")
+            continue
+        router, area = inventory.areas[wanted["area"]]
+        path = f"{inventory.area_path(router, area)}/interfaces"
+        area_key, current = inventory.interfaces.get(
+            interface_key,
+            (None, None),
+        )
+        if area_key != wanted["area"]:
+            units.append(
+                (
+                    lambda path=path, wanted=wanted: send_request(
+                        client,
+                        "post",
+                        path,
+                        "Successfully created",
+                        wanted["values"],
+                    ),
+                    [new_result(results, wanted["label"], "create")],
+                ),
+            )
+            continue
+        changes = changed_values(
+            current,
+            {
+                key: value for key, value in wanted["values"].items()
+                if key != "if_uuid"
+            },
+        )
+        if changes:
+            updates.setdefault(path, []).append(
+                (current["uuid"], changes, wanted["label"]),
+            )
+    for path, path_updates in updates.items():
+        units.extend(
+            patch_units(client, path, path_updates, batch_size, results),
+        )
+    run_units(units, max_parallel)
+
+    if not results:
+        return (
+            "OSPF configuration already matches the intent - No action taken",
+            True,
+            False,
+            results,
+        )
+    return (*summarize_results(results, "OSPF objects"), results)
 
 
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
-        "data": {"type": "dict", "required": True},
+        "data": {"type": "dict", "required": False},
+        "intent": {"type": "dict", "required": False},
+        "batch_size": {"type": "int", "required": False, "default": 100},
+        "max_parallel": {"type": "int", "required": False, "default": 4},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "intent")],
+        required_one_of=[("data", "intent")],
         supports_check_mode=True,
     )
 
@@ -440,8 +1103,12 @@ def main():
     password = ansible_module.params["afc_password"]
     data = ansible_module.params["data"]
     operation = ansible_module.params["operation"]
+    intent = ansible_module.params["intent"]
+    batch_size = ansible_module.params["batch_size"]
+    max_parallel = ansible_module.params["max_parallel"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -455,46 +1122,53 @@ def main():
     afc_instance = instantiate_afc_object(data=auth_data)
 
     if afc_instance.afc_connected:
-
-        fabric_instance = fabric.Fabric(
-            afc_instance.client, name=data["fabric"]
-        )
-        if fabric_instance.uuid:
-            vrf_instance = vrf.Vrf(
+        if intent is not None:
+            message, status, changed, results = apply_ospf_intent(
                 afc_instance.client,
-                name=data["vrf"],
-                fabric_uuid=fabric_instance.uuid,
+                intent,
+                batch_size,
+                max_parallel,
             )
-            if vrf_instance.uuid:
-                if operation == "create":
-                    if data["type"] == "router":
-                        message, status, changed = (
-                            vrf_instance.create_ospf_router(
-                                **data,
+        else:
+            fabric_instance = fabric.Fabric(
+                afc_instance.client, name=data["fabric"]
+            )
+            if fabric_instance.uuid:
+                vrf_instance = vrf.Vrf(
+                    afc_instance.client,
+                    name=data["vrf"],
+                    fabric_uuid=fabric_instance.uuid,
+                )
+                if vrf_instance.uuid:
+                    if operation == "create":
+                        if data["type"] == "router":
+                            message, status, changed = (
+                                vrf_instance.create_ospf_router(
+                                    **data,
+                                )
                             )
-                        )
-                    elif data["type"] == "area":
-                        message, status, changed = (
-                            vrf_instance.create_ospf_area(
-                                **data,
+                        elif data["type"] == "area":
+                            message, status, changed = (
+                                vrf_instance.create_ospf_area(
+                                    **data,
+                                )
                             )
-                        )
-                    elif data["type"] == "interface":
-                        message, status, changed = (
-                            vrf_instance.create_ospf_interface(
-                                **data,
+                        elif data["type"] == "interface":
+                            message, status, changed = (
+                                vrf_instance.create_ospf_interface(
+                                    **data,
+                                )
                             )
-                        )
+                    else:
+                        message = "Operation not supported - No action taken"
                 else:
-                    message = "Operation not supported - No action taken"
+                    message = "VRF not found - No action taken"
+                    status = False
+                    changed = False
             else:
-                message = "VRF not found - No action taken"
+                message = "Fabric not found - No action taken"
                 status = False
                 changed = False
-        else:
-            message = "Fabric not found - No action taken"
-            status = False
-            changed = False
 
         # Disconnect session if username and password are passed
         if username and password:
@@ -507,11 +1181,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
@@ -86,7 +86,28 @@ options:
                  - internal
                  - external
                 required: true
-        required: true
+        required: false
+    overlays:
+        description: >
+            Overlays of many VRFs and fabrics to create, each one with the
+            keys of data. The fabrics, VRFs, IPv4 pools and switches are read
+            once, the VRFs are processed concurrently and the Overlays whose
+            configuration already matches are skipped. An existing Overlay
+            with different settings is left unchanged and reported as not
+            changed, its result message listing the differing settings.
+            Only supported with the create operation. Mutually exclusive
+            with data.
+        type: list
+        elements: dict
+        required: false
+    max_parallel:
+        description: >
+            Maximum number of VRFs processed at the same time when overlays
+            is used.
+        type: int
+        default: 4
+extends_documentation_fragment:
+    - arubanetworks.afc.reapply_queue
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -105,6 +126,26 @@ EXAMPLES = r"""
             spine_leaf_asn: "65001"
             bgp_type: 'internal'
 
+-   name: Create the overlays of several VRFs
+    arubanetworks.afc.afc_overlay:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        operation: "create"
+        overlays:
+            -   name: "Overlay-VRF1"
+                fabric: "Aruba-Fabric"
+                vrf: "Aruba-VRF1"
+                ipv4_address: 'IP POOL'
+                spine_leaf_asn: "65001"
+                bgp_type: 'internal'
+            -   name: "Overlay-VRF2"
+                fabric: "Aruba-Fabric2"
+                vrf: "Aruba-VRF2"
+                ipv4_address: 'IP POOL 2'
+                spine_leaf_asn: "65002"
+                bgp_type: 'internal'
+        max_parallel: 8
+
 -   name: Reapply an overlay configuration using username and password
     arubanetworks.afc.afc_overlay:
         afc_ip: "10.10.10.10"
@@ -157,27 +198,138 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each Overlay when overlays is used
+    type: list
+    elements: dict
+    returned: when overlays is used
+    sample:
+        -   name: "Aruba-Fabric/Aruba-VRF1/Overlay-VRF1"
+            message: "Successfully created Overlay"
+            status: True
+            changed: True
+            elapsed: 1.4
 """
 
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
+    config_differences,
+    fabric_vrf_index,
     instantiate_afc_object,
+    queue_reapply,
+    resolve_switches,
+    resource_pool_index,
+    run_grouped,
+    summarize_results,
 )
+from pyafc.common import utils
 from pyafc.fabric import fabric
-from pyafc.vrf import vrf
+from pyafc.vrf import models, vrf
+
+
+def provision_overlays(client, items, max_parallel):
+    """Create the Overlays of many VRFs.
+
+    The fabrics, VRFs, IPv4 pools and switches are read once. VRFs are
+    processed concurrently, the Overlays of one VRF in turn, and an Overlay
+    whose configuration already matches is skipped. Returns the per
+    Overlay results.
+    """
+    fabrics, vrfs = fabric_vrf_index(client)
+    pools = resource_pool_index(client, "IPv4")
+    switches = {}
+    for switch in client.get("switches").json()["result"] or []:
+        switches.setdefault(switch.get("fabric_uuid"), []).append(switch)
+
+    def vrf_uuid(item):
+        return vrfs.get((fabrics.get(item["fabric"]), item["vrf"]))
+
+    def create(item):
+        fabric_uuid = fabrics.get(item["fabric"])
+        if not fabric_uuid:
+            return "Fabric does not exist - No action taken", False, False
+        uuid = vrf_uuid(item)
+        if not uuid:
+            return "VRF does not exist - No action taken", False, False
+        values = {
+            key: value
+            for key, value in item.items()
+            if key not in ["fabric", "vrf", "name"]
+        }
+        if values.get("ipv4_address") not in pools:
+            message = (
+                f"IP Pool {values.get('ipv4_address')} does not exist. "
+                "No action taken"
+            )
+            return message, False, False
+        values["ipv4_address"] = pools[values["ipv4_address"]]
+        if values.get("bgp_type") == "internal":
+            fabric_switches = switches.get(fabric_uuid, [])
+            if values.get("rr_server"):
+                values["rr_server"] = resolve_switches(
+                    fabric_switches,
+                    values["rr_server"],
+                )
+            else:
+                values["rr_server"] = [
+                    switch["uuid"] for switch in fabric_switches
+                    if switch.get("role") == "spine"
+                ]
+        payload = models.Overlay(name=item["name"], **values).dict(
+            exclude_none=True,
+        )
+
+        existing = client.get(f"vrfs/{uuid}/overlay").json()["result"] or []
+        for overlay in existing:
+            if overlay["name"] == item["name"]:
+                differences = config_differences(overlay, payload)
+                if differences:
+                    message = (
+                        f"Overlay {item['name']} already exists with "
+                        "different settings, not updated: "
+                        + ", ".join(differences)
+                    )
+                    return message, True, False
+                message = "Overlay already configured. No action taken"
+                return message, True, False
+
+        request = client.post(
+            f"vrfs/{uuid}/overlay",
+            data=json.dumps(payload),
+        )
+        if request.status_code in utils.response_ok:
+            return "Successfully created Overlay", True, True
+        message = request.json()["result"]
+        return message, "already exists" in str(message), False
+
+    outcomes = run_grouped(create, items, vrf_uuid, max_workers=max_parallel)
+    return [
+        {
+            "name": "/".join([item["fabric"], item["vrf"], item["name"]]),
+            **outcome,
+        }
+        for item, outcome in zip(items, outcomes)
+    ]
 
 
 def main():
     module_args = {
         **afc_argument_spec(),
-        "data": {"type": "dict", "required": True},
+        "data": {"type": "dict", "required": False},
+        "overlays": {"type": "list", "elements": "dict", "required": False},
+        "max_parallel": {"type": "int", "required": False, "default": 4},
+        "reapply_queue": {"type": "path", "required": False},
         "operation": {"type": "str", "required": True},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "overlays")],
+        required_one_of=[("data", "overlays")],
         supports_check_mode=True,
     )
 
@@ -185,13 +337,30 @@ def main():
     username = ansible_module.params["afc_username"]
     password = ansible_module.params["afc_password"]
     data = ansible_module.params["data"]
+    reapply_queue = ansible_module.params["reapply_queue"]
     operation = ansible_module.params["operation"]
+    overlays = ansible_module.params["overlays"]
+    max_parallel = ansible_module.params["max_parallel"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
 
+    if operation == "reapply" and reapply_queue and data:
+        message, status, changed = queue_reapply(
+            reapply_queue,
+            ansible_module.params["afc_ip"],
+            {
+                "type": "overlay",
+                "fabric": data["fabric"],
+                "vrf": data["vrf"],
+                "name": data["name"],
+            },
+        )
+        ansible_module.exit_json(changed=changed, msg=message)
+
     status = False
     changed = False
     message = ""
@@ -200,7 +369,21 @@ def main():
 
     afc_instance = instantiate_afc_object(data=auth_data)
 
-    if afc_instance.afc_connected:
+    if afc_instance.afc_connected and overlays:
+        if operation == "create":
+            results = provision_overlays(
+                afc_instance.client,
+                overlays,
+                max_parallel,
+            )
+            message, status, changed = summarize_results(results, "Overlays")
+        else:
+            message = "Operation not supported - No action taken"
+        # Disconnect session if username and password are passed
+        if username and password:
+            afc_instance.disconnect()
+
+    elif afc_instance.afc_connected:
         fabric_instance = fabric.Fabric(
             afc_instance.client,
             name=data["fabric"],
@@ -237,11 +420,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,282 @@
+#!/usr/bin/python
+
+# (C) Copyright 2020-2025 Hewlett Packard Enterprise Development LP.
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+DOCUMENTATION = r"""
+---
+module: afc_reapply
+version_added: "0.0.1"
+short_description: Send the reapplies queued by other AFC modules.
+description: >
+    This module sends to AFC the reapplies recorded in a reapply queue file
+    by the afc_vrf, afc_underlay, afc_overlay, afc_evpn and afc_vsx modules
+    when their reapply_queue option is set. Each queued object is reapplied
+    once, VSX first, then underlay, overlay, EVPN and VRFs, and the objects
+    of the same type are reapplied concurrently. Successful reapplies are
+    removed from the queue, failed ones are kept for the next run.
+options:
+    afc_ip:
+        description: >
+            IP address of the HPE ANW Fabric Composer.
+        type: str
+        required: true
+    afc_username:
+        description:
+        - User account having write permission on the HPE ANW Fabric Composer
+        type: str
+        required: false
+    afc_password:
+        description:
+        - Password of the user account
+        type: str
+        required: false
+    auth_token:
+        description: >
+            Auth token from the create session playbook.
+        type: str
+        required: false
+    disable_tls_verification:
+        description: >
+            Disable TLS certificate verification when connecting to AFC.
+            Only enable this for AFC instances using self-signed
+            certificates.
+        type: bool
+        required: false
+        default: false
+    reapply_queue:
+        description: >
+            Path of the reapply queue file on the host running the module,
+            as given to the modules queuing the reapplies. Only the entries
+            of afc_ip are sent.
+        type: path
+        required: true
+    max_parallel:
+        description: >
+            Maximum number of objects of the same type reapplied at the same
+            time.
+        type: int
+        default: 4
+author: Aruba Networks (@ArubaNetworks)
+"""
+
+EXAMPLES = r"""
+-   name: Queue the reapply of an Overlay
+    arubanetworks.afc.afc_overlay:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: reapply
+        reapply_queue: "/tmp/afc_reapply.json"
+        data:
+            name: "Aruba-Overlay"
+            fabric: "Aruba-Fabric"
+            vrf: "default"
+    notify: Flush AFC reapplies
+
+# handlers:
+-   name: Flush AFC reapplies
+    arubanetworks.afc.afc_reapply:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        reapply_queue: "/tmp/afc_reapply.json"
+
+-   name: Send the queued reapplies using token
+    arubanetworks.afc.afc_reapply:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        reapply_queue: "/tmp/afc_reapply.json"
+        max_parallel: 2
+"""
+
+
+RETURN = r"""
+message:
+    description: The output generated by the module
+    type: str
+    returned: always
+    sample: "Successfully completed configuration"
+status:
+    description: True or False depending on the action taken
+    type: bool
+    returned: always
+    sample: True
+changed:
+    description: True or False if something has been changed or not
+    type: bool
+    returned: always
+    sample: True
+results:
+    description: Outcome of each queued reapply
+    type: list
+    elements: dict
+    returned: when reapplies were queued
+    sample:
+        -   name: "vrf/Aruba-Fabric/Aruba-VRF"
+            type: "vrf"
+            message: "Successfully reapplied VRF Aruba-VRF"
+            status: True
+            changed: True
+            elapsed: 1.2
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
+    afc_argument_spec,
+    build_auth_data,
+    describe_reapply,
+    instantiate_afc_object,
+    locked_reapply_queue,
+    run_concurrently,
+    summarize_results,
+)
+from pyafc.fabric import fabric
+from pyafc.vrf import vrf
+
+# Reapply order, lower layers first
+REAPPLY_ORDER = ["vsx", "underlay", "overlay", "evpn", "vrf"]
+
+
+def reapply(client, fabric_uuids, target):
+    """Send one queued reapply with the pyafc method of its type."""
+    fabric_uuid = fabric_uuids.get(target["fabric"])
+    if fabric_uuid is None:
+        return "Fabric does not exist - No action taken", False, False
+    if target["type"] in ["evpn", "vsx"]:
+        fabric_instance = fabric.Fabric(client, name=target["fabric"])
+        if target["type"] == "evpn":
+            return fabric_instance.reapply_evpn()
+        return fabric_instance.reapply_vsx()
+    vrf_instance = vrf.Vrf(
+        client,
+        name=target.get("vrf", "default"),
+        fabric_uuid=fabric_uuid,
+    )
+    if target["type"] == "underlay":
+        return vrf_instance.reapply_underlay(target["name"])
+    if not vrf_instance.uuid:
+        return "VRF does not exist - No action taken", False, False
+    if target["type"] == "overlay":
+        return vrf_instance.reapply_overlay(target["name"])
+    return vrf_instance.reapply_vrf()
+
+
+def flush_reapply_queue(client, path, afc_ip, max_parallel):
+    """Reapply the queued objects of afc_ip and return the results."""
+    with locked_reapply_queue(path) as queue:
+        pending = list(queue.get(afc_ip, []))
+    if not pending:
+        return []
+
+    fabric_uuids = {
+        item["name"]: item["uuid"]
+        for item in client.get("fabrics").json()["result"]
+    }
+    results = []
+    done = []
+    for target_type in REAPPLY_ORDER:
+        targets = [
+            target for target in pending if target["type"] == target_type
+        ]
+        outcomes = run_concurrently(
+            lambda target: reapply(client, fabric_uuids, target),
+            targets,
+            max_workers=max_parallel,
+        )
+        for target, outcome in zip(targets, outcomes):
+            results.append(
+                {
+                    "name": describe_reapply(target),
+                    "type": target_type,
+                    **outcome,
+                },
+            )
+            if outcome["status"]:
+                done.append(target)
+
+    with locked_reapply_queue(path) as queue:
+        remaining = [
+            target for target in queue.get(afc_ip, []) if target not in done
+        ]
+        if remaining:
+            queue[afc_ip] = remaining
+        else:
+            queue.pop(afc_ip, None)
+    return results
+
+
+def main():
+    module_args = {
+        **afc_argument_spec(),
+        "reapply_queue": {"type": "path", "required": True},
+        "max_parallel": {"type": "int", "required": False, "default": 4},
+    }
+
+    ansible_module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    # Get playbook's arguments
+    username = ansible_module.params["afc_username"]
+    password = ansible_module.params["afc_password"]
+    reapply_queue = ansible_module.params["reapply_queue"]
+    max_parallel = ansible_module.params["max_parallel"]
+
+    result = {"changed": False}
+    results = None
+
+    if ansible_module.check_mode:
+        ansible_module.exit_json(**result)
+
+    status = False
+    changed = False
+    message = ""
+
+    auth_data = build_auth_data(ansible_module)
+
+    afc_instance = instantiate_afc_object(data=auth_data)
+
+    if afc_instance.afc_connected:
+        results = flush_reapply_queue(
+            afc_instance.client,
+            reapply_queue,
+            ansible_module.params["afc_ip"],
+            max_parallel,
+        )
+        if results:
+            message, status, changed = summarize_results(
+                results,
+                "reapplies",
+            )
+        else:
+            message = "No reapply queued - No action taken"
+            status = True
+
+        # Disconnect session if username and password are passed
+        if username and password:
+            afc_instance.disconnect()
+
+    else:
+        message = "Not connected to AFC"
+
+    result["message"] = message
+    result["status"] = status
+    result["changed"] = changed
+
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
+    # Exit
+    if status:
+        ansible_module.exit_json(**exit_args)
+    else:
+        ansible_module.fail_json(**exit_args)
+
+
+if __name__ == "__main__":
+    main()
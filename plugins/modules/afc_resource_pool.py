@@ -11,7 +11,9 @@ module: afc_resource_pool
 version_added: "0.0.1"
 short_description: Create or delete the resource pool
 description: >
-    This module create or delete the resource pool.
+    This module create or delete the resource pool. Several pools can be
+    managed in one task with the pools option, in which case the ranges are
+    checked for overlaps before anything is created.
 options:
     afc_ip:
         description: >
@@ -70,7 +72,47 @@ options:
                 description: Pool Range.
                 type: str
                 required: false
-        required: true
+        required: false
+    pools:
+        description: >
+            List of resource pools to create or delete in a single task.
+            Mutually exclusive with data. On create, the pool ranges are
+            checked for overlaps against each other and against the existing
+            pools of the same type, and conflicting pools are reported and
+            not created.
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description: Resource Pool Name
+                type: str
+                required: true
+            type:
+                description: Resource Pool type
+                type: str
+                choices:
+                    - IPv4
+                    - MAC
+                required: false
+            pool_ranges:
+                description: >
+                    Pool Range. IPv4 ranges are given as networks or as
+                    first-last addresses, MAC ranges as first-last addresses.
+                    Several ranges can be separated by commas.
+                type: str
+                required: false
+            description:
+                description: Resource Pool Description
+                type: str
+                required: false
+        required: false
+    batch_size:
+        description: >
+            Maximum number of pools submitted to AFC concurrently when the
+            pools option is used.
+        type: int
+        default: 10
+        required: false
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -106,6 +148,24 @@ EXAMPLES = r"""
         data:
             name: "IP POOL"
 
+-   name: Create several resource pools using username and password
+    arubanetworks.afc.afc_resource_pool:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "create"
+        batch_size: 20
+        pools:
+            -   name: "IP POOL 1"
+                type: "IPv4"
+                pool_ranges: "10.10.20.0/24"
+            -   name: "IP POOL 2"
+                type: "IPv4"
+                pool_ranges: "10.10.21.1-10.10.21.100,10.10.22.0/24"
+            -   name: "MAC POOL"
+                type: "MAC"
+                pool_ranges: "00:00:00:00:00:01-00:00:00:00:00:FF"
+
 -   name: Create resource pool using token
     arubanetworks.afc.afc_resource_pool:
         afc_ip: "10.10.10.10"
@@ -142,26 +202,234 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Per pool outcome when the pools option is used
+    type: list
+    elements: dict
+    returned: when pools is provided
+    sample:
+        -   name: "IP POOL 1"
+            message: "Successfully created the resource pool IP POOL 1"
+            status: True
+            changed: True
 """
 
+import ipaddress
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
+    find_overlaps,
     instantiate_afc_object,
+    run_concurrently,
+    summarize_results,
 )
-from pyafc.services import resource_pools
+from pyafc.common import utils
+from pyafc.services import models, resource_pools
+
+
+def parse_mac(value):
+    """Convert a MAC address into an integer."""
+    digits = value.strip().replace(":", "").replace("-", "").replace(".", "")
+    return int(digits, 16)
+
+
+def parse_ranges(pool_type, pool_ranges):
+    """Convert a pool_ranges string into a list of (first, last) integers."""
+    intervals = []
+    for item in str(pool_ranges or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if pool_type == "MAC":
+            first, _sep, last = item.partition("-")
+            intervals.append((parse_mac(first), parse_mac(last or first)))
+        elif "/" in item:
+            network = ipaddress.ip_network(item, strict=False)
+            intervals.append(
+                (int(network.network_address), int(network.broadcast_address)),
+            )
+        else:
+            first, _sep, last = item.partition("-")
+            intervals.append(
+                (
+                    int(ipaddress.ip_address(first.strip())),
+                    int(ipaddress.ip_address((last or first).strip())),
+                ),
+            )
+    return intervals
+
+
+def check_overlaps(pools, existing_pools):
+    """Return the conflicts found for the requested pools.
+
+    The requested and existing ranges are indexed per pool type and swept
+    once, so thousands of ranges are checked in O(n log n). Overlaps between
+    two existing pools are left to AFC and not reported.
+    """
+    conflicts = {}
+    intervals = {}
+    for pool in existing_pools:
+        try:
+            ranges = parse_ranges(pool.get("type"), pool.get("pool_ranges"))
+        except ValueError:
+            continue
+        for first, last in ranges:
+            intervals.setdefault(pool.get("type"), []).append(
+                (first, last, ("existing", pool["name"])),
+            )
+    for pool in pools:
+        try:
+            ranges = parse_ranges(pool["type"], pool["pool_ranges"])
+        except ValueError as exc:
+            conflicts.setdefault(pool["name"], []).append(
+                f"invalid pool range {pool['pool_ranges']} ({exc})",
+            )
+            continue
+        for first, last in ranges:
+            if first > last:
+                conflicts.setdefault(pool["name"], []).append(
+                    f"invalid pool range {first}-{last}",
+                )
+                continue
+            intervals.setdefault(pool["type"], []).append(
+                (first, last, ("requested", pool["name"])),
+            )
+    for entries in intervals.values():
+        for left, right in find_overlaps(entries):
+            if left == right or left[0] == right[0] == "existing":
+                continue
+            for own, other in ((left, right), (right, left)):
+                if own[0] == "requested":
+                    conflicts.setdefault(own[1], []).append(
+                        f"overlaps {other[0]} pool {other[1]}",
+                    )
+    return conflicts
+
+
+def manage_pools(afc_instance, operation, pools, batch_size):
+    """Create or delete several resource pools using a single pool lookup."""
+    pool_request = afc_instance.client.get("resource_pool")
+    existing = {pool["name"]: pool for pool in pool_request.json()["result"]}
+    results = []
+    submitted = []
+    seen = set()
+
+    for pool in pools:
+        if pool["name"] in seen:
+            results.append(
+                {
+                    "name": pool["name"],
+                    "message": "Duplicate pool name in the request",
+                    "status": False,
+                    "changed": False,
+                },
+            )
+        elif operation == "create" and pool["name"] in existing:
+            results.append(
+                {
+                    "name": pool["name"],
+                    "message": (
+                        f"The resource pool {pool['name']} already exists. "
+                        "No action taken"
+                    ),
+                    "status": True,
+                    "changed": False,
+                },
+            )
+        elif operation == "delete" and pool["name"] not in existing:
+            results.append(
+                {
+                    "name": pool["name"],
+                    "message": (
+                        f"The resource pool {pool['name']} does not exist. "
+                        "No action taken."
+                    ),
+                    "status": True,
+                    "changed": False,
+                },
+            )
+        else:
+            submitted.append(pool)
+        seen.add(pool["name"])
+
+    if operation == "create":
+        conflicts = check_overlaps(submitted, list(existing.values()))
+        for pool in submitted:
+            if pool["name"] in conflicts:
+                results.append(
+                    {
+                        "name": pool["name"],
+                        "message": "; ".join(conflicts[pool["name"]]),
+                        "status": False,
+                        "changed": False,
+                    },
+                )
+        submitted = [
+            pool for pool in submitted if pool["name"] not in conflicts
+        ]
+
+    def apply(pool):
+        if operation == "create":
+            values = {
+                key: value for key, value in pool.items() if value is not None
+            }
+            payload = models.ResourcesPool(**values)
+            request = afc_instance.client.post(
+                "resource_pool",
+                data=json.dumps(payload.dict()),
+            )
+            action = "created"
+        else:
+            request = afc_instance.client.delete(
+                f"resource_pool/{existing[pool['name']]['uuid']}",
+            )
+            action = "deleted"
+        if request.status_code in utils.response_ok:
+            return (
+                f"Successfully {action} the resource pool {pool['name']}",
+                True,
+                True,
+            )
+        return request.json()["result"], False, False
+
+    for pool, outcome in zip(
+        submitted,
+        run_concurrently(apply, submitted, max_workers=batch_size),
+    ):
+        results.append({"name": pool["name"], **outcome})
+
+    order = {}
+    for index, pool in enumerate(pools):
+        order.setdefault(pool["name"], index)
+    return sorted(results, key=lambda item: order[item["name"]])
 
 
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
-        "data": {"type": "dict", "required": True},
+        "data": {"type": "dict", "required": False},
+        "pools": {
+            "type": "list",
+            "elements": "dict",
+            "required": False,
+            "options": {
+                "name": {"type": "str", "required": True},
+                "type": {"type": "str", "choices": ["IPv4", "MAC"]},
+                "pool_ranges": {"type": "str"},
+                "description": {"type": "str"},
+            },
+        },
+        "batch_size": {"type": "int", "required": False, "default": 10},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "pools")],
+        required_one_of=[("data", "pools")],
         supports_check_mode=True,
     )
 
@@ -170,8 +438,11 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    pools = ansible_module.params["pools"]
+    batch_size = ansible_module.params["batch_size"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -184,7 +455,18 @@ def main():
 
     afc_instance = instantiate_afc_object(data=auth_data)
 
-    if afc_instance.afc_connected:
+    if afc_instance.afc_connected and pools is not None:
+        if operation in ["create", "delete"]:
+            results = manage_pools(afc_instance, operation, pools, batch_size)
+            message, status, changed = summarize_results(results, "pools")
+        else:
+            message = "Operation not supported - No action taken"
+
+        # Disconnect session if username and password are passed
+        if username and password:
+            afc_instance.disconnect()
+
+    elif afc_instance.afc_connected:
         resource_pool_instance = resource_pools.Pool(
             afc_instance.client,
             **data,
@@ -209,11 +491,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results is not None:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
@@ -14,6 +14,9 @@ short_description: >
     Can be either Route Maps, AS Path List, Prefix List or Community LIst
 description: >
     This module creates or deletes a Route Policy configuration.
+    Prefix list entries can be read from a local file with the src option.
+    Route maps and the lists they reference can be applied together with
+    the bundle option.
 options:
     afc_ip:
         description: >
@@ -46,18 +49,28 @@ options:
     operation:
         description: >
             Operation to be performed on the Route Policy configuration,
-            create or delete.
+            create, update or delete. update changes an existing Route
+            Policy in place and only sends the entries to add, remove or
+            change. Route map, AS path list and community list entries are
+            matched by sequence number. Prefix list entries, from data
+            entries or src, are matched by prefix, ge, le and action, so a
+            renumbered entry is only moved to its new sequence number.
+            Duplicate prefix list entries fail the task and entries shadowed
+            by an earlier entry are reported as warnings, before anything is
+            sent. With bundle, update also creates the missing policies.
         type: str
         choices:
             - create
+            - update
             - delete
         required: true
     data:
         description: >
             Object specific data for route_map, prefix_list, community_list,
-            aspath_list. Structure is provided in the example.
+            aspath_list. Structure is provided in the example. Mutually
+            exclusive with bundle.
         type: dict
-        required: true
+        required: false
         suboptions:
             name:
                 description: Route Policy Name
@@ -368,6 +381,73 @@ options:
                 type: list
                 elements: str
                 required: false
+    src:
+        description: >
+            Prefix List specific. Path of a local file holding the prefix
+            list entries, used instead of data entries on create. The file
+            is read on the host running the module, so large lists never
+            have to be loaded as playbook variables. All its entries are
+            normalized and validated before anything is sent: duplicate
+            entries fail the task and shadowed entries are reported as
+            warnings. Files ending in .csv must have a header row with the
+            prefix column and optionally seq, action, ge, le and
+            description. Other files hold one entry per line in the form
+            C([seq <n>] [permit|deny] <prefix> [ge <n>] [le <n>]), and blank
+            lines and lines starting with C(#) are ignored. When seq is
+            omitted it is the previous sequence number plus 10, and action
+            defaults to permit.
+        type: path
+        required: false
+    chunk_size:
+        description: >
+            Maximum number of prefix list entries sent in the create request
+            when src is used, the following entries being added one at a
+            time, or of entry changes sent in one request on update.
+        type: int
+        default: 1000
+    bundle:
+        description: >
+            Route policy bundle applied in one task. Mutually exclusive with
+            data. Each element uses the data structure without the type key.
+            On create, the references of the route map entries to AS path,
+            community and prefix lists are checked against the bundle and
+            the lists already on AFC before anything is sent. The lists are
+            then created concurrently, followed by the route maps. On
+            delete, the route maps are deleted first, then the lists. On
+            update, existing policies are updated in place and missing ones
+            are created, in the create order.
+            Objects that already exist are left untouched, and route maps
+            referencing an unknown or failed list are not submitted.
+        type: dict
+        suboptions:
+            aspath_lists:
+                description: List of AS Path Lists
+                type: list
+                elements: dict
+                required: false
+            community_lists:
+                description: List of Community Lists
+                type: list
+                elements: dict
+                required: false
+            prefix_lists:
+                description: List of Prefix Lists
+                type: list
+                elements: dict
+                required: false
+            route_maps:
+                description: List of Route Maps
+                type: list
+                elements: dict
+                required: false
+        required: false
+    max_parallel:
+        description: >
+            Maximum number of route policies submitted to AFC at the same
+            time when bundle is used.
+        type: int
+        default: 8
+        required: false
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -546,6 +626,82 @@ EXAMPLES = r"""
                 prefix_length: 24
         operation: "create"
 
+-   name: Create Prefix List from an IRR generated file using username and password
+    arubanetworks.afc.afc_route_policy:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        src: "files/edge-prefixes.txt"
+        chunk_size: 1000
+        data:
+            name: "Edge-Prefix-List"
+            type: "prefix_list"
+            fabrics:
+            -   "Fabric1"
+        operation: "create"
+
+-   name: Update Prefix List entries using username and password
+    arubanetworks.afc.afc_route_policy:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        data:
+            name: "Test-Prefix-List"
+            type: "prefix_list"
+            entries:
+            -   seq: 10
+                action: "permit"
+                prefix: "10.10.20.0/24"
+            -   seq: 20
+                action: "permit"
+                prefix: "10.10.0.0/16"
+                le: 24
+        operation: "update"
+
+-   name: Update Route Map entries in place
+    arubanetworks.afc.afc_route_policy:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        data:
+            name: "Test-Route-Map"
+            type: "route_map"
+            entries:
+            -   seq: 10
+                action: "permit"
+                match_tag: 200
+            -   seq: 20
+                action: "deny"
+        operation: "update"
+
+-   name: Create a Route Map and the lists it references
+    arubanetworks.afc.afc_route_policy:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        bundle:
+            aspath_lists:
+                -   name: "Customers-AS"
+                    entries:
+                    -   seq: 10
+                        action: "permit"
+                        regex: "^65001$"
+            prefix_lists:
+                -   name: "Customers-Prefixes"
+                    entries:
+                    -   seq: 10
+                        action: "permit"
+                        prefix: "any"
+            route_maps:
+                -   name: "Customers-In"
+                    entries:
+                    -   seq: 10
+                        action: "permit"
+                        match_as_path: "Customers-AS"
+                        match_ipv4_prefix_list: "Customers-Prefixes"
+                        set_local_preference: 200
+        operation: "create"
+
 -   name: Delete Prefix List using username and password
     arubanetworks.afc.afc_route_policy:
         afc_ip: "10.10.10.10"
@@ -699,31 +855,800 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each route policy of the bundle
+    type: list
+    elements: dict
+    returned: when bundle is used
+    sample:
+        -   name: "Customers-In"
+            type: "route_map"
+            message: "Successfully created route map Customers-In"
+            status: True
+            changed: True
+            elapsed: 0.42
 """
 
+import bisect
+import csv
+import ipaddress
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
+    chunked,
     instantiate_afc_object,
+    run_concurrently,
+    summarize_results,
 )
+from pyafc.common import utils
 from pyafc.route_policies import (
     as_path_lists,
     community_lists,
+    models,
     prefix_lists,
     route_maps,
 )
 
 
+# Route policy type: (class, collection, create method, delete method)
+ROUTE_POLICY_TYPES = {
+    "aspath_list": (
+        as_path_lists.ASPathList,
+        "aspath_lists",
+        "create_aspath_list",
+        "delete_aspath_list",
+    ),
+    "community_list": (
+        community_lists.CommunityList,
+        "community_lists",
+        "create_community_list",
+        "delete_community_list",
+    ),
+    "prefix_list": (
+        prefix_lists.PrefixList,
+        "prefix_lists",
+        "create_prefix_list",
+        "delete_prefix_list",
+    ),
+    "route_map": (
+        route_maps.RouteMap,
+        "route_maps",
+        "create_routemap",
+        "delete_routemap",
+    ),
+}
+
+# Entry models of the route policies updated by sequence number
+ENTRY_MODELS = {
+    "aspath_list": models.ASPathListEntry,
+    "community_list": models.CommunityListEntry,
+    "route_map": models.RouteMapEntry,
+}
+
+# Bundle keys applied together, in creation order
+BUNDLE_TIERS = [
+    [
+        ("aspath_lists", "aspath_list"),
+        ("community_lists", "community_list"),
+        ("prefix_lists", "prefix_list"),
+    ],
+    [("route_maps", "route_map")],
+]
+
+# Route map entry attributes naming another route policy
+ROUTE_MAP_REFERENCES = {
+    "match_as_path": "aspath_lists",
+    "match_community_list": "community_lists",
+    "match_extcommunity_list": "community_lists",
+    "match_ipv4_prefix_list": "prefix_lists",
+    "match_ipv4_next_hop_prefix_list": "prefix_lists",
+    "match_ipv4_route_source_prefix_list": "prefix_lists",
+}
+
+
+def normalize_prefix_entry(entry, previous_seq):
+    """Validate a raw prefix list entry and return its AFC payload."""
+    seq = int(entry["seq"]) if entry.get("seq") else previous_seq + 10
+    action = (entry.get("action") or "permit").lower()
+    if action not in ["permit", "deny"]:
+        raise ValueError(f"invalid action {action}")
+    normalized = {"seq": seq, "action": action}
+    prefix = entry.get("prefix") or ""
+    if isinstance(prefix, dict):
+        prefix = f"{prefix.get('address')}/{prefix.get('prefix_length')}"
+    prefix = str(prefix).strip()
+    if prefix.lower() == "any":
+        normalized["prefix"] = "any"
+        length = 0
+    else:
+        network = ipaddress.IPv4Network(prefix, strict=False)
+        length = network.prefixlen
+        normalized["prefix"] = {
+            "address": str(network.network_address),
+            "prefix_length": length,
+        }
+    for bound in ["ge", "le"]:
+        if entry.get(bound) not in [None, "", 0, "0"]:
+            value = int(entry[bound])
+            if not length < value <= 32:
+                raise ValueError(
+                    f"{bound} {value} must be greater than the prefix "
+                    f"length {length} and at most 32",
+                )
+            normalized[bound] = value
+    if normalized.get("ge", 0) > normalized.get("le", 32):
+        raise ValueError("ge must not be greater than le")
+    if entry.get("description"):
+        normalized["description"] = entry["description"]
+    return normalized
+
+
+def parse_prefix_line(line):
+    """Parse a [seq <n>] [permit|deny] <prefix> [ge <n>] [le <n>] line."""
+    tokens = line.split()
+    entry = {}
+    if tokens[:1] == ["seq"]:
+        entry["seq"] = tokens[1]
+        tokens = tokens[2:]
+    if tokens and tokens[0].lower() in ["permit", "deny"]:
+        entry["action"] = tokens.pop(0)
+    if not tokens:
+        raise ValueError("missing prefix")
+    entry["prefix"] = tokens.pop(0)
+    while tokens:
+        keyword = tokens.pop(0).lower()
+        if keyword not in ["ge", "le"] or not tokens:
+            raise ValueError(f"unexpected token {keyword}")
+        entry[keyword] = tokens.pop(0)
+    return entry
+
+
+def read_prefix_entries(src):
+    """Yield normalized prefix list entries from a CSV or plain text file.
+
+    The file is streamed, so only the current line and the set of sequence
+    numbers already seen are kept in memory. Errors are reported with the
+    line number.
+    """
+    seen = set()
+    previous_seq = 0
+    with open(src, newline="") as stream:
+        if src.lower().endswith(".csv"):
+            reader = csv.DictReader(stream)
+            rows = (
+                (
+                    reader.line_num,
+                    {
+                        str(key).strip().lower(): (value or "").strip()
+                        for key, value in row.items()
+                    },
+                )
+                for row in reader
+            )
+        else:
+            rows = (
+                (number, line.strip())
+                for number, line in enumerate(stream, 1)
+                if line.strip() and not line.lstrip().startswith("#")
+            )
+        for number, row in rows:
+            try:
+                if isinstance(row, str):
+                    row = parse_prefix_line(row)
+                entry = normalize_prefix_entry(row, previous_seq)
+            except (ValueError, KeyError) as exc:
+                raise ValueError(f"{src} line {number}: {exc}") from exc
+            if entry["seq"] in seen:
+                raise ValueError(
+                    f"{src} line {number}: duplicate seq {entry['seq']}",
+                )
+            seen.add(entry["seq"])
+            previous_seq = entry["seq"]
+            yield entry
+
+
+def prefix_entry_key(entry):
+    """Return the (prefix, ge, le, action) identity of a normalized entry."""
+    prefix = entry["prefix"]
+    if isinstance(prefix, dict):
+        prefix = f"{prefix['address']}/{prefix['prefix_length']}"
+    return prefix, entry.get("ge"), entry.get("le"), entry["action"]
+
+
+class PrefixTrie:
+    """Binary radix tree of prefix list entries keyed by prefix bits.
+
+    Entries are inserted in sequence order. Looking up the entries that may
+    shadow a new one only walks the nodes on the path of its prefix, at
+    most 33 nodes, instead of comparing it with every earlier entry.
+    """
+
+    def __init__(self):
+        self.root = {"children": {}, "entries": []}
+
+    @staticmethod
+    def bounds(entry):
+        """Return the network and the matched prefix length range."""
+        prefix = entry["prefix"]
+        if prefix == "any":
+            network = ipaddress.IPv4Network("0.0.0.0/0")
+            return network, entry.get("ge") or 0, entry.get("le") or 32
+        network = ipaddress.IPv4Network(
+            f"{prefix['address']}/{prefix['prefix_length']}",
+        )
+        low = entry.get("ge") or network.prefixlen
+        high = entry.get("le") or (32 if entry.get("ge") else low)
+        return network, low, high
+
+    def shadowing(self, entry):
+        """Return the earlier entry matching every route of entry, if any."""
+        network, low, high = self.bounds(entry)
+        bits = int(network.network_address)
+        node = self.root
+        for depth in range(network.prefixlen + 1):
+            for other, other_low, other_high in node["entries"]:
+                if other_low <= low and other_high >= high:
+                    return other
+            if depth == network.prefixlen:
+                break
+            node = node["children"].get((bits >> (31 - depth)) & 1)
+            if node is None:
+                break
+        return None
+
+    def insert(self, entry):
+        network, low, high = self.bounds(entry)
+        bits = int(network.network_address)
+        node = self.root
+        for depth in range(network.prefixlen):
+            bit = (bits >> (31 - depth)) & 1
+            node = node["children"].setdefault(
+                bit,
+                {"children": {}, "entries": []},
+            )
+        node["entries"].append((entry, low, high))
+
+
+def check_prefix_entries(entries):
+    """Return the duplicate and shadowed entries of a prefix list.
+
+    Duplicates share the same prefix, ge and le. An entry is shadowed when
+    an entry with a lower sequence number already matches all its routes.
+    """
+    duplicates = []
+    shadowed = []
+    seen = {}
+    trie = PrefixTrie()
+    for entry in sorted(entries, key=lambda item: item["seq"]):
+        key = prefix_entry_key(entry)[:3]
+        if key in seen:
+            duplicates.append(
+                f"seq {entry['seq']} duplicates seq {seen[key]['seq']}",
+            )
+            continue
+        seen[key] = entry
+        other = trie.shadowing(entry)
+        if other is not None:
+            shadowed.append(
+                f"seq {entry['seq']} is shadowed by seq {other['seq']}",
+            )
+        trie.insert(entry)
+    return duplicates, shadowed
+
+
+def diff_prefix_entries(current, desired):
+    """Compute the JSON patch operations turning current into desired.
+
+    Entries are matched on prefix, ge, le and action, so an entry only
+    renumbered becomes a seq replacement instead of a removal and an
+    addition. Removals come first, highest index first, and the indices
+    of the replacements are shifted to account for them.
+    """
+    available = {}
+    for index, entry in enumerate(current):
+        available.setdefault(prefix_entry_key(entry), []).append(index)
+    matched = {}
+    additions = []
+    for entry in desired:
+        indices = available.get(prefix_entry_key(entry))
+        if indices:
+            same_seq = [
+                index for index in indices
+                if current[index]["seq"] == entry["seq"]
+            ]
+            index = same_seq[0] if same_seq else indices[0]
+            indices.remove(index)
+            matched[index] = entry
+        else:
+            additions.append(entry)
+    removals = sorted(
+        index for index in range(len(current)) if index not in matched
+    )
+
+    operations = [
+        {"op": "remove", "path": f"/entries/{index}"}
+        for index in reversed(removals)
+    ]
+    moved = 0
+    for index, entry in sorted(matched.items()):
+        shifted = index - bisect.bisect_left(removals, index)
+        for field in ["seq", "description"]:
+            if entry.get(field) and entry[field] != current[index].get(field):
+                operations.append(
+                    {
+                        "op": "replace",
+                        "path": f"/entries/{shifted}/{field}",
+                        "value": entry[field],
+                    },
+                )
+                moved += field == "seq"
+    operations.extend(
+        {"op": "add", "path": "/entries/-", "value": entry}
+        for entry in additions
+    )
+    return operations, len(additions), len(removals), moved
+
+
+def send_patch(client, collection, uuid, operations, chunk_size):
+    """PATCH an AFC object in chunks of JSON patch operations.
+
+    Returns the number of operations applied and the error reported by AFC,
+    None if every chunk was accepted.
+    """
+    sent = 0
+    for chunk in chunked(operations, chunk_size):
+        request = client.patch(
+            collection,
+            data=json.dumps([{"uuids": [uuid], "patch": chunk}]),
+        )
+        if request.status_code not in utils.response_ok:
+            return sent, request.json()["result"]
+        sent += len(chunk)
+    return sent, None
+
+
+def entry_changed(model, current, desired):
+    """Return True if a field known to the entry model differs."""
+    for field in model.__fields__:
+        current_value = current.get(field)
+        desired_value = desired.get(field)
+        if current_value in [None, ""] and desired_value in [None, ""]:
+            continue
+        if current_value != desired_value:
+            return True
+    return False
+
+
+def diff_entries_by_seq(model, current, desired):
+    """Compute the JSON patch operations turning current into desired.
+
+    Entries are matched on their sequence number. Only the entries whose
+    fields differ are replaced, removals come first, highest index first,
+    and the indices of the replacements are shifted to account for them.
+    """
+    desired_by_seq = {entry["seq"]: entry for entry in desired}
+    current_seqs = set()
+    removals = []
+    replacements = []
+    for index, entry in enumerate(current):
+        seq = int(entry["seq"])
+        current_seqs.add(seq)
+        if seq not in desired_by_seq:
+            removals.append(index)
+        elif entry_changed(model, entry, desired_by_seq[seq]):
+            replacements.append((index, desired_by_seq[seq]))
+
+    operations = [
+        {"op": "remove", "path": f"/entries/{index}"}
+        for index in reversed(removals)
+    ]
+    operations.extend(
+        {
+            "op": "replace",
+            "path": f"/entries/{index - bisect.bisect_left(removals, index)}",
+            "value": entry,
+        }
+        for index, entry in replacements
+    )
+    additions = [
+        entry for entry in desired if entry["seq"] not in current_seqs
+    ]
+    operations.extend(
+        {"op": "add", "path": "/entries/-", "value": entry}
+        for entry in additions
+    )
+    return operations, len(additions), len(removals), len(replacements)
+
+
+def update_route_policy(client, policy_type, data, chunk_size):
+    """Update an AS path list, community list or route map in place.
+
+    Only the entries whose sequence number was added, removed or changed
+    are sent, so the policy is never deleted and recreated on AFC.
+    """
+    label = policy_type.replace("_", " ").replace("aspath", "AS path")
+    collection = ROUTE_POLICY_TYPES[policy_type][1]
+    model = ENTRY_MODELS[policy_type]
+    try:
+        desired = [
+            json.loads(model(**entry).json(exclude_none=True))
+            for entry in data.get("entries") or []
+        ]
+    except (TypeError, ValueError) as exc:
+        return f"Invalid {label} entries: {exc}", False, False
+    seqs = [entry["seq"] for entry in desired]
+    if len(seqs) != len(set(seqs)):
+        return f"Duplicate sequence numbers in {label} entries", False, False
+
+    request = client.get(collection)
+    existing = next(
+        (
+            item for item in request.json()["result"]
+            if item["name"] == data["name"]
+        ),
+        None,
+    )
+    if existing is None:
+        return (
+            f"The {label} {data['name']} does not exist. No action taken.",
+            False,
+            False,
+        )
+
+    operations, added, removed, replaced = diff_entries_by_seq(
+        model,
+        existing.get("entries") or [],
+        desired,
+    )
+    description = data.get("description")
+    if description is not None and description != existing.get("description"):
+        operations.append(
+            {
+                "op": "replace",
+                "path": "/description",
+                "value": description,
+            },
+        )
+    if not operations:
+        return (
+            f"The {label} {data['name']} is already up to date. "
+            "No action taken.",
+            True,
+            False,
+        )
+
+    sent, error = send_patch(
+        client,
+        collection,
+        existing["uuid"],
+        operations,
+        chunk_size,
+    )
+    if error is not None:
+        return (
+            f"The {label} {data['name']} update stopped after {sent} of "
+            f"{len(operations)} changes: {error}",
+            False,
+            sent > 0,
+        )
+    return (
+        f"Successfully updated {label} {data['name']}: {added} added, "
+        f"{removed} removed, {replaced} changed",
+        True,
+        True,
+    )
+
+
+def update_prefix_list(client, data, src, chunk_size):
+    """Update the entries of an existing prefix list in place."""
+    try:
+        if src:
+            desired = list(read_prefix_entries(src))
+        else:
+            desired = []
+            for entry in data.get("entries") or []:
+                previous = desired[-1]["seq"] if desired else 0
+                desired.append(normalize_prefix_entry(entry, previous))
+    except (IOError, OSError, ValueError, KeyError) as exc:
+        return f"Invalid prefix list entries: {exc}", False, False, []
+
+    duplicates, shadowed = check_prefix_entries(desired)
+    if duplicates:
+        return (
+            "Duplicate prefix list entries: " + ", ".join(duplicates),
+            False,
+            False,
+            shadowed,
+        )
+
+    prefix_list_instance = prefix_lists.PrefixList(client, **data)
+    if not prefix_list_instance.existing_pl:
+        return (
+            f"The Prefix List {data['name']} does not exist. "
+            "No action taken.",
+            False,
+            False,
+            shadowed,
+        )
+    current = getattr(prefix_list_instance, "entries", None)
+    if current is None:
+        current = client.get(
+            f"prefix_lists/{prefix_list_instance.uuid}/prefix_list_entries",
+        ).json()["result"]
+    # Keep the controller order, the patch paths index into that array
+    try:
+        current = [normalize_prefix_entry(entry, 0) for entry in current]
+    except (ValueError, KeyError) as exc:
+        return (
+            f"Unexpected entry in prefix list {data['name']} on AFC: {exc}",
+            False,
+            False,
+            shadowed,
+        )
+
+    operations, added, removed, moved = diff_prefix_entries(current, desired)
+    if not operations:
+        return (
+            f"Prefix list {data['name']} is already up to date. "
+            "No action taken.",
+            True,
+            False,
+            shadowed,
+        )
+
+    sent, error = send_patch(
+        client,
+        "prefix_lists",
+        prefix_list_instance.uuid,
+        operations,
+        chunk_size,
+    )
+    if error is not None:
+        return (
+            f"Prefix list {data['name']} update stopped after {sent} of "
+            f"{len(operations)} changes: {error}",
+            False,
+            sent > 0,
+            shadowed,
+        )
+
+    return (
+        f"Successfully updated prefix list {data['name']}: {added} added, "
+        f"{removed} removed, {moved} renumbered",
+        True,
+        True,
+        shadowed,
+    )
+
+
+def upload_prefix_list(client, data, src, chunk_size):
+    """Create a prefix list from a file, sending the entries in chunks.
+
+    The whole file is validated before anything is sent, duplicate entries
+    failing the upload and shadowed entries being returned as warnings.
+    The list is created with the first chunk of entries and the following
+    entries are posted one at a time to its prefix_list_entries endpoint.
+    """
+    try:
+        entries = list(read_prefix_entries(src))
+    except (IOError, OSError, ValueError) as exc:
+        return f"Invalid prefix list source: {exc}", False, False, []
+    if not entries:
+        return f"No prefix list entry found in {src}", False, False, []
+
+    duplicates, shadowed = check_prefix_entries(entries)
+    if duplicates:
+        return (
+            "Duplicate prefix list entries: " + ", ".join(duplicates),
+            False,
+            False,
+            shadowed,
+        )
+
+    prefix_list_instance = prefix_lists.PrefixList(client, **data)
+    if prefix_list_instance.existing_pl:
+        return (
+            f"The Prefix List {data['name']} already exists. "
+            "No action taken.",
+            True,
+            False,
+            shadowed,
+        )
+
+    values = {
+        key: value
+        for key, value in data.items()
+        if key in ["fabrics", "switches"] and value
+    }
+    if values:
+        values = utils.populate_list_fabrics_switches(client, values)
+    count = len(entries)
+    chunk = entries[:max(chunk_size, 1)]
+    payload = {
+        "name": data["name"],
+        "description": data.get("description") or "",
+        "fabric_uuids": values.get("fabric_uuids", []),
+        "switch_uuids": values.get("switch_uuids", []),
+        "address_family": "ipv4",
+        "origin": "local-prefix-list",
+        "entries": chunk,
+    }
+    request = client.post("prefix_lists", data=json.dumps(payload))
+    if request.status_code not in utils.response_ok:
+        return request.json()["result"], False, False, shadowed
+
+    if count > len(chunk):
+        prefix_list_instance = prefix_lists.PrefixList(client, **data)
+        if not prefix_list_instance.existing_pl:
+            return (
+                f"Prefix list {data['name']} not found after creation",
+                False,
+                True,
+                shadowed,
+            )
+    for sent, entry in enumerate(entries[len(chunk):], len(chunk)):
+        # One entry object per request, as pyafc add_prefix_list_entry
+        request = client.post(
+            f"prefix_lists/{prefix_list_instance.uuid}/prefix_list_entries",
+            data=json.dumps(
+                {key: value for key, value in entry.items()
+                 if value is not None},
+            ),
+        )
+        if request.status_code not in utils.response_ok:
+            return (
+                f"Prefix list {data['name']} upload stopped after {sent} of "
+                f"{count} entries: {request.json()['result']}",
+                False,
+                True,
+                shadowed,
+            )
+
+    return (
+        f"Successfully created prefix list {data['name']} "
+        f"with {count} entries",
+        True,
+        True,
+        shadowed,
+    )
+
+
+def route_map_references(values):
+    """Yield the (collection, name) pairs referenced by a route map."""
+    for entry in values.get("entries") or []:
+        for attribute, collection in ROUTE_MAP_REFERENCES.items():
+            if entry.get(attribute):
+                yield collection, entry[attribute]
+
+
+def apply_route_policy(client, operation, policy_type, values, chunk_size):
+    """Create, update or delete one route policy.
+
+    On update, a policy that does not exist yet is created.
+    """
+    policy_class, _collection, create, delete = ROUTE_POLICY_TYPES[
+        policy_type
+    ]
+    instance = policy_class(client, **values)
+    if operation == "update" and instance.uuid:
+        if policy_type == "prefix_list":
+            message, status, changed, warnings = update_prefix_list(
+                client,
+                values,
+                None,
+                chunk_size,
+            )
+            return "; ".join([message, *warnings]), status, changed
+        return update_route_policy(client, policy_type, values, chunk_size)
+    if operation in ["create", "update"]:
+        return getattr(instance, create)(**values)
+    return getattr(instance, delete)()
+
+
+def apply_route_policy_bundle(
+    client,
+    operation,
+    bundle,
+    max_parallel,
+    chunk_size,
+):
+    """Apply a route policy bundle tier by tier and return the results.
+
+    The lists referenced by the route maps are resolved against the bundle
+    and a single GET of each list collection, so a missing list is reported
+    before anything is sent instead of failing on AFC.
+    """
+    results = []
+    failed = set()
+    requested = {
+        (ROUTE_POLICY_TYPES[policy_type][1], values["name"])
+        for key, policy_type in BUNDLE_TIERS[0]
+        for values in bundle.get(key) or []
+    }
+    existing = {}
+    if operation in ["create", "update"] and bundle.get("route_maps"):
+        for _key, policy_type in BUNDLE_TIERS[0]:
+            collection = ROUTE_POLICY_TYPES[policy_type][1]
+            request = client.get(collection)
+            existing[collection] = {
+                item["name"] for item in request.json()["result"]
+            }
+
+    tiers = BUNDLE_TIERS if operation != "delete" else BUNDLE_TIERS[::-1]
+    for tier in tiers:
+        submitted = []
+        for key, policy_type in tier:
+            for values in bundle.get(key) or []:
+                item = {"name": values["name"], "type": policy_type}
+                unresolved = []
+                if operation != "delete" and policy_type == "route_map":
+                    unresolved = [
+                        f"{collection}/{name}"
+                        for collection, name in route_map_references(values)
+                        if (collection, name) in failed
+                        or (
+                            name not in existing[collection]
+                            and (collection, name) not in requested
+                        )
+                    ]
+                if unresolved:
+                    item.update(
+                        message="Unresolved references: "
+                        + ", ".join(sorted(set(unresolved))),
+                        status=False,
+                        changed=False,
+                    )
+                    results.append(item)
+                    continue
+                submitted.append((policy_type, values, item))
+
+        outcomes = run_concurrently(
+            lambda entry: apply_route_policy(
+                client,
+                operation,
+                entry[0],
+                entry[1],
+                chunk_size,
+            ),
+            submitted,
+            max_workers=max_parallel,
+        )
+        for (policy_type, values, item), outcome in zip(submitted, outcomes):
+            item.update(outcome)
+            if not item["status"]:
+                failed.add((ROUTE_POLICY_TYPES[policy_type][1], item["name"]))
+            results.append(item)
+
+    return results
+
+
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
-        "data": {"type": "dict", "required": True},
+        "data": {"type": "dict", "required": False},
+        "src": {"type": "path", "required": False},
+        "chunk_size": {"type": "int", "required": False, "default": 1000},
+        "bundle": {
+            "type": "dict",
+            "required": False,
+            "options": {
+                "aspath_lists": {"type": "list", "elements": "dict"},
+                "community_lists": {"type": "list", "elements": "dict"},
+                "prefix_lists": {"type": "list", "elements": "dict"},
+                "route_maps": {"type": "list", "elements": "dict"},
+            },
+        },
+        "max_parallel": {"type": "int", "required": False, "default": 8},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "bundle")],
+        required_one_of=[("data", "bundle")],
         supports_check_mode=True,
     )
 
@@ -732,8 +1657,13 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    src = ansible_module.params["src"]
+    chunk_size = ansible_module.params["chunk_size"]
+    bundle = ansible_module.params["bundle"]
+    max_parallel = ansible_module.params["max_parallel"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -747,7 +1677,27 @@ def main():
     afc_instance = instantiate_afc_object(data=auth_data)
 
     if afc_instance.afc_connected:
-        if operation == "create":
+        if bundle is not None:
+            if not any(
+                bundle.get(key) for tier in BUNDLE_TIERS for key, _ in tier
+            ):
+                message = "Empty route policy bundle - No action taken"
+                status = True
+            elif operation in ["create", "update", "delete"]:
+                results = apply_route_policy_bundle(
+                    afc_instance.client,
+                    operation,
+                    bundle,
+                    max_parallel,
+                    chunk_size,
+                )
+                message, status, changed = summarize_results(
+                    results,
+                    "route policies",
+                )
+            else:
+                message = "Operation not supported - No action taken"
+        elif operation == "create":
             if data["type"] == "route_map":
                 route_map_instance = route_maps.RouteMap(
                     afc_instance.client,
@@ -766,6 +1716,17 @@ def main():
                         **data,
                     )
                 )
+            elif data["type"] == "prefix_list" and src:
+                message, status, changed, warnings = upload_prefix_list(
+                    afc_instance.client,
+                    data,
+                    src,
+                    chunk_size,
+                )
+                for warning in warnings:
+                    ansible_module.warn(
+                        f"Prefix list {data['name']}: {warning}",
+                    )
             elif data["type"] == "prefix_list":
                 prefix_list_instance = prefix_lists.PrefixList(
                     afc_instance.client,
@@ -788,6 +1749,27 @@ def main():
                 )
             else:
                 message = "Route Policy type not supported - No action taken"
+        elif operation == "update":
+            if data["type"] == "prefix_list":
+                message, status, changed, warnings = update_prefix_list(
+                    afc_instance.client,
+                    data,
+                    src,
+                    chunk_size,
+                )
+                for warning in warnings:
+                    ansible_module.warn(
+                        f"Prefix list {data['name']}: {warning}",
+                    )
+            elif data["type"] in ENTRY_MODELS:
+                message, status, changed = update_route_policy(
+                    afc_instance.client,
+                    data["type"],
+                    data,
+                    chunk_size,
+                )
+            else:
+                message = "Route Policy type not supported - No action taken"
         elif operation == "delete":
             if data["type"] == "route_map":
                 route_map_instance = route_maps.RouteMap(
@@ -835,11 +1817,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results is not None:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
@@ -12,6 +12,8 @@ version_added: "0.0.1"
 short_description: Create or delete an STP configuration in the fabric.
 description: >
     This module creates or deletes an STP configuration in the fabric.
+    Several STP configurations, for instance one per fabric, can be
+    submitted concurrently in one task with the stp_configs option.
 options:
     afc_ip:
         description: >
@@ -111,7 +113,23 @@ options:
                                 type: str
                                 required: true
                 required: true
-        required: true
+        required: false
+    stp_configs:
+        description: >
+            List of STP configurations to create or delete in a single task,
+            typically one per fabric. Each entry has the structure of data.
+            Mutually exclusive with data. The configurations are submitted
+            concurrently over the same AFC session.
+        type: list
+        elements: dict
+        required: false
+    max_parallel:
+        description: >
+            Maximum number of STP configurations submitted to AFC at the same
+            time when stp_configs is used.
+        type: int
+        default: 4
+        required: false
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -140,6 +158,30 @@ EXAMPLES = r"""
             name: "Test-STP"
 
 
+-   name: Create one STP configuration per fabric using username and password
+    arubanetworks.afc.afc_stp:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "create"
+        max_parallel: 4
+        stp_configs:
+            -   name: "DC1-STP"
+                fabrics:
+                    - "DC1"
+                config_type: "mstp"
+                configuration:
+                    mstp_config:
+                        config_revision: 0
+                        config_name: 'DC1-STP-Config0'
+            -   name: "DC2-STP"
+                fabrics:
+                    - "DC2"
+                config_type: "rpvst"
+                configuration:
+                    rpvst_config:
+                        vlan_ids: "1-100"
+
 -   name: Create STP configuration using token
     arubanetworks.afc.afc_stp:
         afc_ip: "10.10.10.10"
@@ -179,6 +221,21 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: >
+        Per STP configuration outcome when stp_configs is used, including
+        the time spent on each configuration in seconds.
+    type: list
+    elements: dict
+    returned: when stp_configs is provided
+    sample:
+        -   name: "DC1-STP"
+            fabrics:
+                - "DC1"
+            message: "Successfully created STP configuration DC1-STP"
+            status: True
+            changed: True
+            elapsed: 0.42
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -186,31 +243,68 @@ from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
     instantiate_afc_object,
+    run_concurrently,
+    summarize_results,
 )
 from pyafc.services import stp
 
 
+def apply_stp(client, operation, stp_data):
+    """Create or delete one STP configuration."""
+    stp_data = dict(stp_data)
+    stp_name = stp_data.pop("name")
+    if operation == "create":
+        stp_instance = stp.STP(client, name=stp_name, **stp_data)
+        return stp_instance.create_stp(**stp_data)
+    if operation == "delete":
+        stp_instance = stp.STP(client, name=stp_name)
+        return stp_instance.delete_stp()
+    return "Operation not supported - No action taken", False, False
+
+
+def apply_stp_configs(client, operation, stp_configs, max_parallel):
+    """Submit several STP configurations concurrently over one client."""
+    outcomes = run_concurrently(
+        lambda stp_data: apply_stp(client, operation, stp_data),
+        stp_configs,
+        max_workers=max_parallel,
+    )
+    return [
+        {
+            "name": stp_data.get("name"),
+            "fabrics": stp_data.get("fabrics", []),
+            **outcome,
+        }
+        for stp_data, outcome in zip(stp_configs, outcomes)
+    ]
+
+
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
-        "data": {"type": "dict", "required": True},
+        "data": {"type": "dict", "required": False},
+        "stp_configs": {"type": "list", "elements": "dict", "required": False},
+        "max_parallel": {"type": "int", "required": False, "default": 4},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "stp_configs")],
+        required_one_of=[("data", "stp_configs")],
         supports_check_mode=True,
     )
 
     # Get playbook's arguments
     username = ansible_module.params["afc_username"]
     password = ansible_module.params["afc_password"]
-    stp_name = ansible_module.params["stp_name"]
     operation = ansible_module.params["operation"]
-    if "stp_data" in list(ansible_module.params.keys()):
-        stp_data = ansible_module.params["stp_data"]
+    data = ansible_module.params["data"]
+    stp_configs = ansible_module.params["stp_configs"]
+    max_parallel = ansible_module.params["max_parallel"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -225,18 +319,25 @@ def main():
 
     if afc_instance.afc_connected:
 
-        if operation == "create":
-            stp_instance = stp.STP(
+        if operation not in ["create", "delete"]:
+            message = "Operation not supported - No action taken"
+        elif stp_configs is not None:
+            results = apply_stp_configs(
                 afc_instance.client,
-                name=stp_name,
-                **stp_data,
+                operation,
+                stp_configs,
+                max_parallel,
+            )
+            message, status, changed = summarize_results(
+                results,
+                "STP configurations",
             )
-            message, status, changed = stp_instance.create_stp(**stp_data)
-        elif operation == "delete":
-            stp_instance = stp.STP(afc_instance.client, name=stp_name)
-            message, status, changed = stp_instance.delete_stp()
         else:
-            message = "Operation not supported - No action taken"
+            message, status, changed = apply_stp(
+                afc_instance.client,
+                operation,
+                data,
+            )
 
         # Disconnect session if username and password are passed
         if username and password:
@@ -249,11 +350,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results is not None:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
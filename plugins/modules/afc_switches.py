@@ -12,7 +12,9 @@ version_added: "0.0.1"
 short_description: Manage Switches on and through AFC.
 description: >
     This module allows to manage switches on and through
-    HPE ANW Fabric Composer.
+    HPE ANW Fabric Composer. When batch_size is set, the switches are
+    processed in rolling batches, one request per switch, and each batch
+    must come back healthy before the next one starts.
 options:
     afc_ip:
         description: >
@@ -82,6 +84,40 @@ options:
                 elements: str
                 required: false
         required: true
+    batch_size:
+        description: >
+            Number of switches processed in each batch. When set, the
+            operation is applied switch by switch, batch after batch, and
+            the outcome of every switch is returned in results. When not
+            set, all the switches are handled by a single AFC request.
+        type: int
+        required: false
+    max_parallel:
+        description: >
+            Maximum number of switches of a batch processed at the same
+            time. Only used with batch_size.
+        type: int
+        default: 8
+    max_fail_percentage:
+        description: >
+            Percentage of failed switches in a batch above which the
+            following batches are skipped. A switch fails when its request
+            fails or when it is not healthy after health_timeout. Only used
+            with batch_size.
+        type: int
+        default: 0
+    health_timeout:
+        description: >
+            Seconds to wait after each batch for its switches to be healthy.
+            0 disables the health check. Only used with batch_size.
+        type: int
+        default: 600
+    post_reboot_delay:
+        description: >
+            Seconds to wait after rebooting a batch before checking the
+            health of its switches. Only used with batch_size.
+        type: int
+        default: 60
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -159,6 +195,21 @@ EXAMPLES = r"""
             fabric:
                 - "DC-Fabric"
 
+-   name: Reboot a fabric 20 switches at a time using username and password
+    arubanetworks.afc.afc_switches:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "reboot"
+        batch_size: 20
+        max_parallel: 10
+        max_fail_percentage: 10
+        health_timeout: 900
+        data:
+            fabric:
+                - "DC-Fabric"
+            boot_partition: 'non-active'
+
 -   name: Update switch data on AFC using token
     arubanetworks.afc.afc_switches:
         afc_ip: "10.10.10.10"
@@ -222,15 +273,234 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each switch when batch_size is set
+    type: list
+    elements: dict
+    returned: when batch_size is set
+    sample:
+        -   name: "Leaf-1"
+            ip_address: "10.10.10.15"
+            message: "Successfully rebooted device"
+            status: True
+            changed: True
+            elapsed: 0.4
+            batch: 1
 """
 
+import json
+import time
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
     instantiate_afc_object,
+    resolve_switches,
+    run_rolling,
+    summarize_results,
 )
-from pyafc.switches import switches
+from pyafc.common import utils
+from pyafc.switches import models, switches
+
+# Health states in which a switch is considered back in service
+HEALTHY_STATES = ["healthy", "healthy_but"]
+
+# Seconds between two reads of the switches health
+HEALTH_POLL_INTERVAL = 10
+
+ROLLING_MESSAGES = {
+    "update": "Device successfully updated",
+    "reconcile": "Successfully launched device reconciliation",
+    "reboot": "Successfully rebooted device",
+    "save": "Successfully saved configuration",
+}
+
+
+def as_list(value):
+    """Return value as a list, a single string becoming a one item list."""
+    if isinstance(value, str):
+        return [value]
+    return list(value or [])
+
+
+def switch_scope(client, fabric_names, entries):
+    """Return the AFC switches of the fabrics and matching the entries.
+
+    Switches are read once and returned in the order of the fabrics and
+    then of the entries, each switch at most once.
+    """
+    if not fabric_names and not entries:
+        msg = "Fabric and Switches variables are not provided"
+        raise ValueError(msg)
+    afc_switches = client.get("switches?software=true").json()["result"]
+    by_uuid = {switch["uuid"]: switch for switch in afc_switches}
+    uuids = []
+    if fabric_names:
+        fabric_uuids = {
+            item["name"]: item["uuid"]
+            for item in client.get("fabrics").json()["result"]
+        }
+        for fabric_name in fabric_names:
+            if fabric_name not in fabric_uuids:
+                msg = f"Fabric {fabric_name} not found"
+                raise ValueError(msg)
+            uuids.extend(
+                switch["uuid"] for switch in afc_switches
+                if switch.get("fabric_uuid") == fabric_uuids[fabric_name]
+                and switch["uuid"] not in uuids
+            )
+    uuids.extend(
+        uuid for uuid in resolve_switches(afc_switches, entries)
+        if uuid not in uuids
+    )
+    return [by_uuid[uuid] for uuid in uuids]
+
+
+def boot_partition(switch, target):
+    """Return the partition a switch reboots on for the target partition."""
+    if target == "active":
+        return switch["booted_partition"]
+    if target == "non-active":
+        if switch["booted_partition"] == "secondary":
+            return "primary"
+        return "secondary"
+    return target
+
+
+def switch_action(client, operation, data):
+    """Return a worker applying operation to a single switch."""
+    if operation == "update":
+        fields = models.Switch(**data).dict(exclude_none=True)
+        if fields.get("fabric"):
+            fabric_uuid = next(
+                (
+                    item["uuid"]
+                    for item in client.get("fabrics").json()["result"]
+                    if item["name"] == fields["fabric"]
+                ),
+                None,
+            )
+            if not fabric_uuid:
+                msg = f"Fabric {fields['fabric']} not found"
+                raise ValueError(msg)
+            fields["fabric_uuid"] = fabric_uuid
+            fields.pop("fabric")
+        patch = [
+            {"path": f"/{item}", "value": value, "op": "replace"}
+            for item, value in fields.items()
+        ]
+    target = (as_list(data.get("boot_partition")) or ["active"])[0]
+
+    def worker(switch):
+        if operation == "update":
+            request = client.patch(
+                "switches",
+                data=json.dumps([{"uuids": [switch["uuid"]], "patch": patch}]),
+            )
+        elif operation == "reboot":
+            payload = models.RebootSwitches(
+                switches=[
+                    {
+                        "uuid": switch["uuid"],
+                        "boot_partition": boot_partition(switch, target),
+                    },
+                ],
+            )
+            request = client.put(
+                "switches/reboot",
+                data=json.dumps(payload.dict()),
+            )
+        elif operation == "reconcile":
+            payload = models.ReconcileSwitches(switches=[switch["uuid"]])
+            request = client.put(
+                "switches/reconcile",
+                data=json.dumps(payload.dict()),
+            )
+        else:
+            payload = models.SaveConfigSwitches(switches=[switch["uuid"]])
+            request = client.put(
+                "switches/save_config",
+                data=json.dumps(payload.dict()),
+            )
+        if request.status_code in utils.response_ok:
+            return ROLLING_MESSAGES[operation], True, True
+        return request.json()["result"], False, False
+
+    return worker
+
+
+def health_gate(client, timeout, delay=0):
+    """Return a gate waiting for the switches of a batch to be healthy.
+
+    The switches whose action succeeded are polled together, after delay
+    seconds, until all of them are healthy or timeout seconds elapsed. The
+    switches still unhealthy are reported as failed.
+    """
+
+    def gate(batch, outcomes):
+        pending = {
+            switch["uuid"]
+            for switch, outcome in zip(batch, outcomes)
+            if outcome["status"]
+        }
+        if not pending:
+            return
+        time.sleep(delay)
+        deadline = time.monotonic() + timeout
+        while True:
+            pending -= {
+                switch["uuid"]
+                for switch in client.get("switches").json()["result"]
+                if (switch.get("health") or {}).get("status")
+                in HEALTHY_STATES
+            }
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(HEALTH_POLL_INTERVAL)
+        for switch, outcome in zip(batch, outcomes):
+            if switch["uuid"] in pending:
+                outcome["status"] = False
+                outcome["message"] += (
+                    f" but switch not healthy after {timeout} seconds"
+                )
+
+    return gate
+
+
+def rolling_operation(client, operation, data, params):
+    """Apply operation to the switches in batches and return the results."""
+    if operation == "update":
+        targets = switch_scope(client, [], as_list(data.get("switches")))
+    else:
+        targets = switch_scope(
+            client,
+            as_list(data.get("fabric")),
+            as_list(data.get("switches")),
+        )
+    gate = None
+    if params["health_timeout"]:
+        gate = health_gate(
+            client,
+            params["health_timeout"],
+            params["post_reboot_delay"] if operation == "reboot" else 0,
+        )
+    outcomes = run_rolling(
+        switch_action(client, operation, data),
+        targets,
+        params["batch_size"],
+        max_workers=params["max_parallel"],
+        max_fail_percentage=params["max_fail_percentage"],
+        gate=gate,
+    )
+    return [
+        {
+            "name": switch.get("name") or switch.get("ip_address"),
+            "ip_address": switch.get("ip_address"),
+            **outcome,
+        }
+        for switch, outcome in zip(targets, outcomes)
+    ]
 
 
 def main():
@@ -238,6 +508,23 @@ def main():
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
         "data": {"type": "dict", "required": True},
+        "batch_size": {"type": "int", "required": False},
+        "max_parallel": {"type": "int", "required": False, "default": 8},
+        "max_fail_percentage": {
+            "type": "int",
+            "required": False,
+            "default": 0,
+        },
+        "health_timeout": {
+            "type": "int",
+            "required": False,
+            "default": 600,
+        },
+        "post_reboot_delay": {
+            "type": "int",
+            "required": False,
+            "default": 60,
+        },
     }
 
     ansible_module = AnsibleModule(
@@ -250,8 +537,11 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    batch_size = ansible_module.params["batch_size"]
+    rolling = bool(batch_size) and operation in ROLLING_MESSAGES
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -264,7 +554,30 @@ def main():
 
     afc_instance = instantiate_afc_object(data=auth_data)
 
-    if afc_instance.afc_connected:
+    if afc_instance.afc_connected and rolling:
+        try:
+            results = rolling_operation(
+                afc_instance.client,
+                operation,
+                data,
+                ansible_module.params,
+            )
+        except ValueError as exc:
+            message = f"{exc} - No action taken"
+        else:
+            if results:
+                message, status, changed = summarize_results(
+                    results,
+                    "switches",
+                )
+            else:
+                message = "No switch found - No action taken"
+
+        # Disconnect session if username and password are passed
+        if username and password:
+            afc_instance.disconnect()
+
+    elif afc_instance.afc_connected:
 
         if operation == "update":
             switches_instance = switches.Switch(
@@ -301,11 +614,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
@@ -80,7 +80,27 @@ options:
                     - OSPF
                     - EBGP
                 required: true
-        required: true
+        required: false
+    underlays:
+        description: >
+            Underlays of many fabrics to create, each one with the keys of
+            data. The fabrics, VRFs and IPv4 pools are read once, the fabrics
+            are processed concurrently and the Underlays whose configuration
+            already matches are skipped. An existing Underlay with different
+            settings is left unchanged and reported as not changed, its
+            result message listing the differing settings. Only supported
+            with the create operation. Mutually exclusive with data.
+        type: list
+        elements: dict
+        required: false
+    max_parallel:
+        description: >
+            Maximum number of fabrics processed at the same time when
+            underlays is used.
+        type: int
+        default: 4
+extends_documentation_fragment:
+    - arubanetworks.afc.reapply_queue
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -98,6 +118,23 @@ EXAMPLES = r"""
             transit_vlan: 120
             underlay_type: 'OSPF'
 
+-   name: Create the underlays of several fabrics
+    arubanetworks.afc.afc_underlay:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        operation: "create"
+        underlays:
+            -   name: "Underlay-DC1"
+                fabric: "Aruba-Fabric-DC1"
+                ipv4_address: 'IP POOL DC1'
+                transit_vlan: 120
+                underlay_type: 'OSPF'
+            -   name: "Underlay-DC2"
+                fabric: "Aruba-Fabric-DC2"
+                ipv4_address: 'IP POOL DC2'
+                transit_vlan: 120
+                underlay_type: 'OSPF'
+
 -   name: Reapply an underlay configuration using username and password
     arubanetworks.afc.afc_underlay:
         afc_ip: "10.10.10.10"
@@ -147,27 +184,122 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each Underlay when underlays is used
+    type: list
+    elements: dict
+    returned: when underlays is used
+    sample:
+        -   name: "Aruba-Fabric-DC1/Underlay-DC1"
+            message: "Successfully configured underlay as per the inputs"
+            status: True
+            changed: True
+            elapsed: 1.1
 """
 
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
+    config_differences,
+    fabric_vrf_index,
     instantiate_afc_object,
+    queue_reapply,
+    resource_pool_index,
+    run_grouped,
+    summarize_results,
 )
+from pyafc.common import utils
 from pyafc.fabric import fabric
-from pyafc.vrf import vrf
+from pyafc.vrf import models, vrf
+
+
+def provision_underlays(client, items, max_parallel):
+    """Create the Underlays of many fabrics.
+
+    The fabrics, VRFs and IPv4 pools are read once. The default VRFs of
+    the fabrics are processed concurrently, the Underlays of one fabric in
+    turn, and an Underlay whose configuration already matches is skipped.
+    Returns the per Underlay results.
+    """
+    fabrics, vrfs = fabric_vrf_index(client)
+    pools = resource_pool_index(client, "IPv4")
+
+    def vrf_uuid(item):
+        return vrfs.get((fabrics.get(item["fabric"]), "default"))
+
+    def create(item):
+        if item["fabric"] not in fabrics:
+            return "Fabric does not exist - No action taken", False, False
+        uuid = vrf_uuid(item)
+        if not uuid:
+            return "VRF does not exist - No action taken", False, False
+        values = {
+            key: value
+            for key, value in item.items()
+            if key not in ["fabric", "name"]
+        }
+        if values.get("ipv4_address") not in pools:
+            message = (
+                f"IP Pool {values.get('ipv4_address')} does not exist. "
+                "No action taken"
+            )
+            return message, False, False
+        values["ipv4_address"] = pools[values["ipv4_address"]]
+        payload = models.Underlay(name=item["name"], **values).dict(
+            exclude_none=True,
+        )
+
+        existing = client.get(f"vrfs/{uuid}/underlay").json()["result"] or []
+        for underlay in existing:
+            if underlay["name"] == item["name"]:
+                differences = config_differences(underlay, payload)
+                if differences:
+                    message = (
+                        f"Underlay {item['name']} already exists with "
+                        "different settings, not updated: "
+                        + ", ".join(differences)
+                    )
+                    return message, True, False
+                message = (
+                    "The underlay configuration already exists. "
+                    "No action taken"
+                )
+                return message, True, False
+
+        request = client.post(
+            f"vrfs/{uuid}/underlay",
+            data=json.dumps(payload),
+        )
+        if request.status_code in utils.response_ok:
+            message = "Successfully configured underlay as per the inputs"
+            return message, True, True
+        message = request.json()["result"]
+        return message, "already exists" in str(message), False
+
+    outcomes = run_grouped(create, items, vrf_uuid, max_workers=max_parallel)
+    return [
+        {"name": f"{item['fabric']}/{item['name']}", **outcome}
+        for item, outcome in zip(items, outcomes)
+    ]
 
 
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
-        "data": {"type": "dict", "required": True},
+        "data": {"type": "dict", "required": False},
+        "underlays": {"type": "list", "elements": "dict", "required": False},
+        "max_parallel": {"type": "int", "required": False, "default": 4},
+        "reapply_queue": {"type": "path", "required": False},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "underlays")],
+        required_one_of=[("data", "underlays")],
         supports_check_mode=True,
     )
 
@@ -176,12 +308,28 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    reapply_queue = ansible_module.params["reapply_queue"]
+    underlays = ansible_module.params["underlays"]
+    max_parallel = ansible_module.params["max_parallel"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
 
+    if operation == "reapply" and reapply_queue and data:
+        message, status, changed = queue_reapply(
+            reapply_queue,
+            ansible_module.params["afc_ip"],
+            {
+                "type": "underlay",
+                "fabric": data["fabric"],
+                "name": data["name"],
+            },
+        )
+        ansible_module.exit_json(changed=changed, msg=message)
+
     status = False
     changed = False
     message = ""
@@ -190,7 +338,25 @@ def main():
 
     afc_instance = instantiate_afc_object(data=auth_data)
 
-    if afc_instance.afc_connected:
+    if afc_instance.afc_connected and underlays:
+        if operation == "create":
+            results = provision_underlays(
+                afc_instance.client,
+                underlays,
+                max_parallel,
+            )
+            message, status, changed = summarize_results(
+                results,
+                "Underlays",
+            )
+        else:
+            message = "Operation not supported - No action taken"
+
+        # Disconnect session if username and password are passed
+        if username and password:
+            afc_instance.disconnect()
+
+    elif afc_instance.afc_connected:
 
         fabric_instance = fabric.Fabric(
             afc_instance.client,
@@ -222,11 +388,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
@@ -46,12 +46,15 @@ options:
         default: false
     operation:
         description: >
-            Operation to be performed with the VLAN, create, update or delete
+            Operation to be performed with the VLAN, create, update or delete.
+            sync is VLAN Group specific, it creates the VLAN Group or updates
+            its VLANs and description when they differ from data.
         type: str
         choices:
             - create
             - update
             - delete
+            - sync
         required: true
     data:
         description: >
@@ -120,8 +123,9 @@ options:
             vlans:
                 description: >
                     VLAN Group specific.
-                    VLANs list.
-                type: str
+                    VLANs list, e.g. "23,56-58". A list of VLAN IDs or ranges
+                    is accepted as well with sync.
+                type: raw
                 required: false
             fabrics:
                 description: >
@@ -133,8 +137,11 @@ options:
             stretched_vlans:
                 description: >
                     Stretched VLAN Specific.
-                    Stretched VLAN ID.
-                type: str
+                    Stretched VLAN IDs, e.g. "301" or "300-799,900". A list
+                    of VLAN IDs or ranges is accepted as well. On create, the
+                    VLANs already stretched across the fabrics with the same
+                    global route targets are skipped.
+                type: raw
                 required: false
             global_route_targets:
                 description: Stretched VLAN Specific. Global Route Targets.
@@ -154,6 +161,11 @@ options:
                         type: str
                         required: false
         required: true
+    batch_size:
+        description: >
+            Maximum number of VLANs stretched in one request on create.
+        type: int
+        default: 500
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -251,6 +263,19 @@ EXAMPLES = r"""
         data:
             name: Test-VLANGroup
 
+-   name: Synchronize the VLANs of a VLAN Group using token
+    arubanetworks.afc.afc_vlan:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        operation: sync
+        data:
+            type: vlan_group
+            name: Test-VLANGroup
+            description: New VLAN Group
+            vlans:
+                - "100-2999"
+                - "3100-4000"
+
 -   name: Create a Stretched VLAN in HPE ANW Fabric Composer using username
           and password
     arubanetworks.afc.afc_vlan:
@@ -268,6 +293,25 @@ EXAMPLES = r"""
                 - rt_type: NN:VLAN
                   administrative_number: 1
 
+-   name: Stretch 500 VLANs across three fabrics
+    arubanetworks.afc.afc_vlan:
+        afc_ip: "10.10.10.10"
+        auth_token: "xxlkjlsdfluwoeirkjlkjsldjjjlkj23423ljlkj"
+        operation: create
+        data:
+            type: stretched_vlan
+            fabrics:
+                - DC1
+                - DC2
+                - DC3
+            stretched_vlans:
+                - "1000-1399"
+                - "2000-2099"
+            global_route_targets:
+                - rt_type: NN:VLAN
+                  administrative_number: 1
+        batch_size: 250
+
 -   name: Create a VLAN Group in HPE ANW Fabric Composer using token
     arubanetworks.afc.afc_vlan:
         afc_ip: "10.10.10.10"
@@ -300,23 +344,203 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each batch of stretched VLANs on create
+    type: list
+    elements: dict
+    returned: when VLANs were stretched
+    sample:
+        -   name: "1000-1249"
+            message: "Successfully created VLAN stretching"
+            status: True
+            changed: True
 """
 
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
+    chunked,
+    compress_vlans,
+    expand_vlans,
+    format_intervals,
     instantiate_afc_object,
+    subtract_intervals,
+    summarize_results,
+    vlan_intervals,
 )
-from pyafc.fabric import fabric
+from pyafc.common import utils
+from pyafc.fabric import fabric, models
+from pyafc.ports import models as port_models
 from pyafc.ports import vlan_group
 
 
+def sync_vlan_group(client, data):
+    """Create a VLAN Group or bring its VLANs and description in line.
+
+    The VLANs are compared as intervals, and the VLAN Group is only
+    updated when VLANs are added or removed or the description changed.
+    The VLANs are always sent as the shortest list of ranges.
+    """
+    wanted = vlan_intervals(data.get("vlans") or "")
+    current = None
+    for group in client.get("vlan_groups").json()["result"] or []:
+        if group["name"] == data["name"]:
+            current = group
+            break
+
+    if current is None:
+        payload = port_models.VlanGroup(
+            name=data["name"],
+            description=data.get("description") or "",
+            vlans=format_intervals(wanted),
+        )
+        request = client.post("vlan_groups", data=json.dumps(payload.dict()))
+        if request.status_code in utils.response_ok:
+            return "Successfully created VLAN Group", True, True
+        return request.json()["result"], False, False
+
+    existing = vlan_intervals(current.get("vlans") or "")
+    added = subtract_intervals(wanted, existing)
+    removed = subtract_intervals(existing, wanted)
+    operations = []
+    changes = [
+        f"{label} VLANs {format_intervals(intervals)}"
+        for label, intervals in [("added", added), ("removed", removed)]
+        if intervals
+    ]
+    if changes:
+        operations.append(
+            {
+                "op": "replace",
+                "path": "/vlans",
+                "value": format_intervals(wanted),
+            },
+        )
+    if (
+        data.get("description") is not None
+        and data["description"] != current.get("description")
+    ):
+        operations.append(
+            {
+                "op": "replace",
+                "path": "/description",
+                "value": data["description"],
+            },
+        )
+        changes.append("updated description")
+    if not operations:
+        return "VLAN Group already in sync. No action taken", True, False
+
+    # Same uuids/patch form pyafc sends to the switches and ports collections
+    request = client.patch(
+        "vlan_groups",
+        data=json.dumps([{"uuids": [current["uuid"]], "patch": operations}]),
+    )
+    if request.status_code in utils.response_ok:
+        message = "Successfully synchronized VLAN Group: " + ", ".join(changes)
+        return message, True, True
+    return request.json()["result"], False, False
+
+
+def route_targets(values):
+    """Return global route targets in a comparable form."""
+    return sorted(
+        (value.get("rt_type"), str(value.get("administrative_number")))
+        for value in values or []
+    )
+
+
+def stretch_vlans(client, data, batch_size):
+    """Stretch VLANs across fabrics, skipping the VLANs already stretched.
+
+    The fabrics and the existing stretched VLANs are read once. The VLANs
+    of the existing entries spanning all the fabrics are matched against
+    the requested ones as sets, then the remaining VLANs are sent as
+    ranges in batches of at most batch_size VLANs. Returns the message,
+    status, changed and the per batch results.
+    """
+    fabric_uuids = {
+        item["name"]: item["uuid"]
+        for item in client.get("fabrics").json()["result"] or []
+    }
+    names = data["fabrics"]
+    if isinstance(names, str):
+        names = [names]
+    for name in names:
+        if name not in fabric_uuids:
+            return f"Fabric {name} not found", False, False, []
+    uuids = {fabric_uuids[name] for name in names}
+
+    vlans = set(expand_vlans(data["stretched_vlans"]))
+    targets = route_targets(data.get("global_route_targets"))
+    stretched = set()
+    conflicting = set()
+    for entry in client.get("evpn/multi_site").json()["result"] or []:
+        if not uuids <= set(entry.get("fabric_uuids") or []):
+            continue
+        covered = vlans & set(expand_vlans(entry.get("stretched_vlans", "")))
+        if route_targets(entry.get("global_route_targets")) == targets:
+            stretched |= covered
+        else:
+            conflicting |= covered
+
+    results = []
+    if conflicting:
+        results.append(
+            {
+                "name": compress_vlans(conflicting),
+                "message": "VLANs already stretched with other global "
+                "route targets",
+                "status": False,
+                "changed": False,
+            },
+        )
+    pending = sorted(vlans - stretched - conflicting)
+    if not pending and not conflicting:
+        message = (
+            f"VLANs {compress_vlans(vlans)} already stretched - "
+            "No action taken"
+        )
+        return message, True, False, []
+
+    for batch in chunked(pending, batch_size):
+        payload = models.VLANStretching(
+            fabric_uuids=[fabric_uuids[name] for name in names],
+            stretched_vlans=compress_vlans(batch),
+            global_route_targets=data.get("global_route_targets") or [],
+        )
+        request = client.post(
+            "evpn/multi_site",
+            data=json.dumps(payload.dict()),
+        )
+        created = request.status_code in utils.response_ok
+        if created:
+            message = "Successfully created VLAN stretching"
+        elif "already" in str(request.json()["result"]):
+            message = "VLAN already stretched"
+        else:
+            message = request.json()["result"]
+        results.append(
+            {
+                "name": payload.stretched_vlans,
+                "message": message,
+                "status": created or message == "VLAN already stretched",
+                "changed": created,
+            },
+        )
+    message, status, changed = summarize_results(results, "VLAN batches")
+    return message, status, changed, results
+
+
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": True},
         "data": {"type": "dict", "required": True},
+        "batch_size": {"type": "int", "required": False, "default": 500},
     }
 
     ansible_module = AnsibleModule(
@@ -329,12 +553,14 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    batch_size = ansible_module.params["batch_size"]
 
     auth_data = build_auth_data(ansible_module)
 
     afc_instance = instantiate_afc_object(data=auth_data)
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -360,13 +586,14 @@ def main():
                 )
                 message, status, changed = fabric_instance.create_vlan(**data)
             elif data["type"] == "stretched_vlan":
-                fabric_instance = fabric.Fabric(
-                    afc_instance.client,
-                    name=data["fabrics"][0],
-                )
-                message, status, changed = (
-                    fabric_instance.create_vlan_stretching(**data)
-                )
+                try:
+                    message, status, changed, results = stretch_vlans(
+                        afc_instance.client,
+                        data,
+                        batch_size,
+                    )
+                except ValueError as exc:
+                    message = str(exc)
             else:
                 message = "Type not supported - No action taken"
         elif operation == "update":
@@ -386,6 +613,17 @@ def main():
                 )
             else:
                 message = "Type not supported - No action taken"
+        elif operation == "sync":
+            if data["type"] == "vlan_group":
+                try:
+                    message, status, changed = sync_vlan_group(
+                        afc_instance.client,
+                        data,
+                    )
+                except ValueError as exc:
+                    message = str(exc)
+            else:
+                message = "Type not supported - No action taken"
         elif operation == "delete":
             if data["type"] == "vlan_group":
                 vlan_instance = vlan_group.VlanGroup(
@@ -414,11 +652,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
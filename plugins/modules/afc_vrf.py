@@ -12,6 +12,8 @@ version_added: "0.0.1"
 short_description: Create or delete a VRF in the specified fabric.
 description: >
     This module creates or deletes a VRF in the specified fabric.
+    Many VRFs, across several fabrics, can be created or deleted in one
+    task with the vrfs option.
 options:
     afc_ip:
         description: >
@@ -52,7 +54,8 @@ options:
         required: true
     data:
         description: >
-            VRF specific data. Structure provided in the example.
+            VRF specific data. Structure provided in the example. Mutually
+            exclusive with vrfs.
         type: dict
         suboptions:
             name:
@@ -177,7 +180,26 @@ options:
                                     - both
                                 required: false
                         required: false
-        required: true
+        required: false
+    vrfs:
+        description: >
+            List of VRFs, each using the data structure, created or deleted
+            in one task. Mutually exclusive with data. The VRFs are grouped
+            by fabric and the existing VRFs of each fabric are read with a
+            single request. On create, only the missing VRFs are sent, and
+            on delete, only the existing ones. Only create and delete are
+            supported with vrfs.
+        type: list
+        elements: dict
+        required: false
+    max_parallel:
+        description: >
+            Maximum number of VRFs submitted to AFC at the same time when
+            vrfs is used.
+        type: int
+        default: 8
+extends_documentation_fragment:
+    - arubanetworks.afc.reapply_queue
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -222,6 +244,24 @@ EXAMPLES = r"""
             name: "Aruba-VRF"
             fabric: "Aruba-Fabric"
 
+-   name: Create tenant VRFs in several fabrics using username and password
+    arubanetworks.afc.afc_vrf:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "create"
+        max_parallel: 8
+        vrfs:
+            -   name: "Tenant-A"
+                fabric: "Aruba-Fabric"
+                vni: 10001
+            -   name: "Tenant-B"
+                fabric: "Aruba-Fabric"
+                vni: 10002
+            -   name: "Tenant-A"
+                fabric: "Aruba-Fabric-DC2"
+                vni: 10001
+
 -   name: Create VRF using token
     arubanetworks.afc.afc_vrf:
         afc_ip: "10.10.10.10"
@@ -277,27 +317,155 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each VRF when vrfs is used
+    type: list
+    elements: dict
+    returned: when vrfs is used
+    sample:
+        -   name: "Tenant-A"
+            fabric: "Aruba-Fabric"
+            message: "The VRF Tenant-A is successfully created"
+            status: True
+            changed: True
+            elapsed: 0.38
 """
 
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
     instantiate_afc_object,
+    queue_reapply,
+    run_concurrently,
+    summarize_results,
 )
+from pyafc.common import utils
 from pyafc.fabric import fabric
-from pyafc.vrf import vrf
+from pyafc.vrf import models, vrf
+
+
+def create_vrf(client, values, fabric_uuid):
+    """Create one VRF known to be missing, without looking it up again."""
+    values = {
+        key: value
+        for key, value in values.items()
+        if key not in ["fabric", "switches"]
+    }
+    payload = models.VRF(fabric_uuid=fabric_uuid, **values)
+    request = client.post(
+        "vrfs",
+        data=json.dumps(payload.dict(exclude_none=True)),
+    )
+    if request.status_code in utils.response_ok:
+        return f"The VRF {payload.name} is successfully created", True, True
+    return request.json()["result"], False, False
+
+
+def provision_vrfs(client, operation, vrfs, max_parallel):
+    """Create or delete a list of VRFs spread over several fabrics.
+
+    The fabrics are read once and the VRFs of each fabric once, so the
+    number of lookups depends on the number of fabrics instead of the
+    number of VRFs. Only the VRFs needing a change are submitted.
+    """
+    results = []
+    fabric_uuids = {
+        item["name"]: item["uuid"]
+        for item in client.get("fabrics").json()["result"]
+    }
+    inventory = {}
+    seen = set()
+    submitted = []
+    for values in vrfs:
+        name = values.get("name")
+        fabric_name = values.get("fabric")
+        item = {"name": name, "fabric": fabric_name}
+        fabric_uuid = fabric_uuids.get(fabric_name)
+        if fabric_uuid is None:
+            item.update(
+                message="Fabric does not exist - No action taken",
+                status=False,
+                changed=False,
+            )
+        elif (fabric_name, name) in seen:
+            item.update(
+                message=f"The VRF {name} is requested more than once",
+                status=False,
+                changed=False,
+            )
+        else:
+            seen.add((fabric_name, name))
+            if fabric_uuid not in inventory:
+                request = client.get(f"vrfs?fabrics={fabric_uuid}")
+                inventory[fabric_uuid] = {
+                    vrf_item["name"]: vrf_item["uuid"]
+                    for vrf_item in request.json()["result"]
+                }
+            existing = inventory[fabric_uuid].get(name)
+            if operation == "create" and existing:
+                item.update(
+                    message=f"The VRF {name} already exists. "
+                    "No action taken",
+                    status=True,
+                    changed=False,
+                )
+            elif operation == "delete" and not existing:
+                item.update(
+                    message=f"The VRF {name} does not exist. "
+                    "No action taken",
+                    status=True,
+                    changed=False,
+                )
+            else:
+                submitted.append((values, fabric_uuid, existing, item))
+                results.append(item)
+                continue
+        results.append(item)
+
+    def worker(entry):
+        values, fabric_uuid, existing, _item = entry
+        if operation == "create":
+            if values.get("switches"):
+                values = {
+                    **values,
+                    "switch_uuids": utils.consolidate_switches_list(
+                        client,
+                        values["switches"],
+                    ),
+                }
+            return create_vrf(client, values, fabric_uuid)
+        request = client.delete(f"vrfs/{existing}")
+        if request.status_code in utils.response_ok:
+            return (
+                f"The VRF {values['name']} is successfully deleted",
+                True,
+                True,
+            )
+        return request.json()["result"], False, False
+
+    outcomes = run_concurrently(worker, submitted, max_workers=max_parallel)
+    for entry, outcome in zip(submitted, outcomes):
+        entry[3].update(outcome)
+    return results
 
 
 def main():
     module_args = {
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
-        "data": {"type": "dict", "required": True},
+        "data": {"type": "dict", "required": False},
+        "reapply_queue": {"type": "path", "required": False},
+        "vrfs": {"type": "list", "elements": "dict", "required": False},
+        "max_parallel": {"type": "int", "required": False, "default": 8},
     }
 
     ansible_module = AnsibleModule(
         argument_spec=module_args,
+        mutually_exclusive=[("data", "vrfs")],
+        required_one_of=[("data", "vrfs")],
         supports_check_mode=True,
     )
 
@@ -306,12 +474,24 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    reapply_queue = ansible_module.params["reapply_queue"]
+    vrfs = ansible_module.params["vrfs"]
+    max_parallel = ansible_module.params["max_parallel"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
 
+    if operation == "reapply" and reapply_queue and data is not None:
+        message, status, changed = queue_reapply(
+            reapply_queue,
+            ansible_module.params["afc_ip"],
+            {"type": "vrf", "fabric": data["fabric"], "vrf": data["name"]},
+        )
+        ansible_module.exit_json(changed=changed, msg=message)
+
     status = False
     changed = False
     message = ""
@@ -321,26 +501,38 @@ def main():
     afc_instance = instantiate_afc_object(data=auth_data)
 
     if afc_instance.afc_connected:
-        fabric_instance = fabric.Fabric(
-            afc_instance.client,
-            name=data["fabric"],
-        )
-        if fabric_instance.uuid:
-            vrf_instance = vrf.Vrf(
-                afc_instance.client,
-                name=data["name"],
-                fabric_uuid=fabric_instance.uuid,
-            )
-            if operation == "create":
-                message, status, changed = vrf_instance.create_vrf(**data)
-            elif operation == "reapply":
-                message, status, changed = vrf_instance.reapply_vrf()
-            elif operation == "delete":
-                message, status, changed = vrf_instance.delete_vrf()
+        if vrfs is not None:
+            if operation in ["create", "delete"]:
+                results = provision_vrfs(
+                    afc_instance.client,
+                    operation,
+                    vrfs,
+                    max_parallel,
+                )
+                message, status, changed = summarize_results(results, "VRFs")
             else:
                 message = "Operation not supported - No action taken"
         else:
-            message = "Fabric does not exist - No action taken"
+            fabric_instance = fabric.Fabric(
+                afc_instance.client,
+                name=data["fabric"],
+            )
+            if fabric_instance.uuid:
+                vrf_instance = vrf.Vrf(
+                    afc_instance.client,
+                    name=data["name"],
+                    fabric_uuid=fabric_instance.uuid,
+                )
+                if operation == "create":
+                    message, status, changed = vrf_instance.create_vrf(**data)
+                elif operation == "reapply":
+                    message, status, changed = vrf_instance.reapply_vrf()
+                elif operation == "delete":
+                    message, status, changed = vrf_instance.delete_vrf()
+                else:
+                    message = "Operation not supported - No action taken"
+            else:
+                message = "Fabric does not exist - No action taken"
         # Disconnect session if username and password are passed
         if username and password:
             afc_instance.disconnect()
@@ -352,11 +544,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results is not None:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
@@ -44,7 +44,7 @@ options:
     operation:
         description: >
             Operation to be performed with the VRF BGP, enable, update or
-            disable
+            disable. Only update is supported with switches.
         type: str
         choices:
             - enable
@@ -166,6 +166,27 @@ options:
                 elements: str
                 required: false
         required: true
+    switches:
+        description: >
+            Per switch BGP settings applied with the update operation. Each
+            entry holds a switch, given as an IP address, an IP range, a
+            name, a role or all, and the BGP options to configure on the
+            matching switches, completing the options given in data. The
+            BGP configuration of every switch of the VRF is read in one
+            request and compared with the settings, neighbors and networks
+            being compared by name. Only the switches whose configuration
+            differs are sent, concurrently. A switch without BGP
+            configuration and without router_id gets the address of its
+            loopback0 in the default VRF as router ID.
+        type: list
+        elements: dict
+        required: false
+    max_parallel:
+        description: >
+            Maximum number of switches updated at the same time when
+            switches is used.
+        type: int
+        default: 8
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -218,6 +239,30 @@ EXAMPLES = r"""
             redistribute_loopback: true
             trap_enable: false
 
+-   name: Update the BGP configuration of the VRF switches that differ
+    arubanetworks.afc.afc_vrf_bgp:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "update"
+        data:
+            fabric: "Aruba-Fabric"
+            vrf: "Aruba-VRF"
+            as_number: 65000
+            keepalive_timer: 30
+            holddown_timer: 90
+        switches:
+            -   switch: "leaf"
+            -   switch: "10.10.10.11"
+                router_id: "10.10.10.11"
+                neighbors:
+                    -   name: "Core-1"
+                        neighbor_ip_address: "10.20.0.1"
+                        neighbor_as_number: "65100"
+                        neighbor_type: "ebgp"
+                        address_families:
+                            - "ipv4"
+
 -   name: Update BGP configuration on a VRF using token
     arubanetworks.afc.afc_vrf_bgp:
         afc_ip: "10.10.10.10"
@@ -280,16 +325,212 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each switch when switches is used
+    type: list
+    elements: dict
+    returned: when switches is used
+    sample:
+        -   name: "Leaf1"
+            message: "Successfully applied BGP properties"
+            status: True
+            changed: True
+            elapsed: 0.4
 """
 
+import json
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
     afc_argument_spec,
     build_auth_data,
     instantiate_afc_object,
+    resolve_switches,
+    run_concurrently,
+    summarize_results,
 )
+from pyafc.common import utils
 from pyafc.fabric import fabric
-from pyafc.vrf import vrf
+from pyafc.vrf import models, vrf
+
+# Keys identifying the entries of the BGP lists of a switch
+BGP_LIST_KEYS = {
+    "neighbors": ["name", "neighbor_ip_address"],
+    "networks": ["name"],
+}
+
+
+def canonical(items):
+    return sorted(json.dumps(item, sort_keys=True) for item in items)
+
+
+def merge_entries(current_items, wanted_items, keys):
+    """Return the wanted list entries completed with their current values.
+
+    An entry matches the current entry sharing one of its keys, so values
+    set by AFC such as UUIDs are kept.
+    """
+    merged = []
+    for wanted in wanted_items:
+        match = next(
+            (
+                item for item in current_items
+                if any(
+                    wanted.get(key) is not None
+                    and item.get(key) == wanted.get(key)
+                    for key in keys
+                )
+            ),
+            {},
+        )
+        merged.append({**match, **wanted})
+    return merged
+
+
+def bgp_switch_changes(current, wanted):
+    """Return the BGP values of a switch differing from its configuration.
+
+    Neighbors and networks are compared as sets of entries, each wanted
+    entry being completed with the matching current entry.
+    """
+    changes = {}
+    for key, value in wanted.items():
+        existing = current.get(key)
+        if key in BGP_LIST_KEYS:
+            value = merge_entries(existing or [], value, BGP_LIST_KEYS[key])
+            if canonical(value) == canonical(existing or []):
+                continue
+        elif key == "as_number":
+            value = str(value)
+            if value == str(existing):
+                continue
+        elif value == existing:
+            continue
+        changes[key] = value
+    return changes
+
+
+def sync_bgp_switches(client, data, switch_settings, max_parallel):
+    """Apply per switch BGP settings, sending only the changed switches.
+
+    The BGP configuration of every switch of the VRF is read with one
+    request and compared with the settings of data completed by the
+    entries of switch_settings. Only the switches whose configuration
+    differs are sent, concurrently. A switch without BGP configuration
+    defaults its router ID to its loopback0 address in the default VRF,
+    and fails when it has none.
+    """
+    fabrics = {
+        item["name"]: item["uuid"]
+        for item in client.get("fabrics").json()["result"]
+    }
+    fabric_uuid = fabrics.get(data["fabric"])
+    if fabric_uuid is None:
+        return "Fabric not found - No action taken", False, False, []
+    vrf_uuids = {
+        item["name"]: item["uuid"]
+        for item in client.get(f"vrfs?fabrics={fabric_uuid}").json()["result"]
+    }
+    vrf_uuid = vrf_uuids.get(data["vrf"])
+    if vrf_uuid is None:
+        return "VRF not found - No action taken", False, False, []
+    fabric_switches = client.get(
+        f"switches?fabrics={fabric_uuid}",
+    ).json()["result"] or []
+    names = {switch["uuid"]: switch.get("name") for switch in fabric_switches}
+    bgp = client.get(f"vrfs/{vrf_uuid}/bgp?switches=true").json()["result"]
+    configs = {
+        item["switch_uuid"]: item for item in (bgp or {}).get("switches") or []
+    }
+
+    common = {
+        key: value for key, value in data.items()
+        if key not in ["fabric", "vrf"] and value is not None
+    }
+    wanted = {}
+    try:
+        for entry in switch_settings:
+            values = {
+                key: value for key, value in entry.items()
+                if key != "switch" and value is not None
+            }
+            for switch_uuid in resolve_switches(
+                fabric_switches,
+                [entry.get("switch")],
+            ):
+                wanted.setdefault(switch_uuid, dict(common)).update(values)
+    except ValueError as exc:
+        return f"{exc} - No action taken", False, False, []
+
+    router_ids = {}
+    if any(
+        switch_uuid not in configs and not values.get("router_id")
+        for switch_uuid, values in wanted.items()
+    ):
+        loopbacks = client.get(
+            f"vrfs/{vrf_uuids.get('default')}/ip_interfaces?if_type=loopback",
+        ).json()["result"]
+        router_ids = {
+            loopback["switch_uuid"]: loopback["ipv4_primary_address"][
+                "address"
+            ]
+            for loopback in loopbacks or []
+            if loopback["name"] == "loopback0"
+        }
+
+    results = []
+    updates = []
+    for switch_uuid, values in wanted.items():
+        result = {"name": names.get(switch_uuid, switch_uuid)}
+        results.append(result)
+        current = configs.get(switch_uuid)
+        try:
+            if current is None:
+                payload = models.BGPConfig(**values).dict()
+                if not payload["router_id"]:
+                    payload["router_id"] = router_ids.get(switch_uuid)
+                if not payload["router_id"]:
+                    result.update(
+                        message="No Router ID can be found - "
+                        "No action taken",
+                        status=False,
+                        changed=False,
+                    )
+                    continue
+                payload["name"] = names.get(switch_uuid)
+                payload["switch_uuid"] = switch_uuid
+            else:
+                changes = bgp_switch_changes(current, values)
+                if not changes:
+                    result.update(
+                        message="BGP properties are the same. "
+                        "No action taken",
+                        status=True,
+                        changed=False,
+                    )
+                    continue
+                payload = {**current, **changes}
+        except ValueError as exc:
+            result.update(message=str(exc), status=False, changed=False)
+            continue
+        updates.append((switch_uuid, payload, result))
+
+    def apply_switch(update):
+        switch_uuid, payload, _result = update
+        request = client.put(
+            f"vrfs/{vrf_uuid}/bgp/{switch_uuid}",
+            data=json.dumps(payload),
+        )
+        if request.status_code in utils.response_ok:
+            return "Successfully applied BGP properties", True, True
+        return request.json()["result"], False, False
+
+    for (_uuid, _payload, result), outcome in zip(
+        updates,
+        run_concurrently(apply_switch, updates, max_workers=max_parallel),
+    ):
+        result.update(outcome)
+    return (*summarize_results(results, "switches"), results)
 
 
 def main():
@@ -297,6 +538,8 @@ def main():
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
         "data": {"type": "dict", "required": True},
+        "switches": {"type": "list", "elements": "dict", "required": False},
+        "max_parallel": {"type": "int", "required": False, "default": 8},
     }
 
     ansible_module = AnsibleModule(
@@ -309,8 +552,11 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    switch_settings = ansible_module.params["switches"]
+    max_parallel = ansible_module.params["max_parallel"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
@@ -324,37 +570,48 @@ def main():
     afc_instance = instantiate_afc_object(data=auth_data)
 
     if afc_instance.afc_connected:
-        fabric_instance = fabric.Fabric(
-            afc_instance.client,
-            name=data["fabric"],
-        )
-        if fabric_instance.uuid:
-            vrf_instance = vrf.Vrf(
+        if switch_settings is not None:
+            if operation == "update":
+                message, status, changed, results = sync_bgp_switches(
+                    afc_instance.client,
+                    data,
+                    switch_settings,
+                    max_parallel,
+                )
+            else:
+                message = "Operation not supported - No action taken"
+        else:
+            fabric_instance = fabric.Fabric(
                 afc_instance.client,
-                name=data["vrf"],
-                fabric_uuid=fabric_instance.uuid,
+                name=data["fabric"],
             )
-            if vrf_instance.uuid:
-                if operation == "enable":
-                    message, status, changed = vrf_instance.update_bgp_vrf(
-                        **data,
-                    )
-                elif operation == "update":
-                    message, status, changed = (
-                        vrf_instance.update_bgp_config_vrf(**data)
-                    )
-                elif operation == "disable":
-                    message, status, changed = (
-                        vrf_instance.update_bgp_config_vrf(enable=False)
-                    )
+            if fabric_instance.uuid:
+                vrf_instance = vrf.Vrf(
+                    afc_instance.client,
+                    name=data["vrf"],
+                    fabric_uuid=fabric_instance.uuid,
+                )
+                if vrf_instance.uuid:
+                    if operation == "enable":
+                        message, status, changed = vrf_instance.update_bgp_vrf(
+                            **data,
+                        )
+                    elif operation == "update":
+                        message, status, changed = (
+                            vrf_instance.update_bgp_config_vrf(**data)
+                        )
+                    elif operation == "disable":
+                        message, status, changed = (
+                            vrf_instance.update_bgp_config_vrf(enable=False)
+                        )
+                else:
+                    message = "VRF not found - No action taken"
+                    status = False
+                    changed = False
             else:
-                message = "VRF not found - No action taken"
+                message = "Fabric not found - No action taken"
                 status = False
                 changed = False
-        else:
-            message = "Fabric not found - No action taken"
-            status = False
-            changed = False
 
         # Disconnect session if username and password are passed
         if username and password:
@@ -367,11 +624,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
@@ -62,8 +62,10 @@ options:
                 type: str
                 required: true
             fabric:
-                description: Fabric on which the VSX worflow will be applied
-                type: str
+                description: >
+                    Fabric on which the VSX worflow will be applied. With
+                    auto, a list of fabrics is accepted.
+                type: raw
                 required: true
             system_mac_range:
                 description: MAC Resource Pool used for VSX System Mac
@@ -94,6 +96,34 @@ options:
                 type: str
                 required: false
         required: true
+    auto:
+        description: >
+            With operation create, detect the VSX pairs of the fabrics and
+            create the missing ones. The switches, their ports with the LLDP
+            neighbors and the existing VSX pairs of each fabric are read in
+            bulk, and the links between switches are indexed by switch pair.
+            Two switches of the same role linked by at least min_links ports
+            and having no other such peer form a pair. The VSX configuration
+            is only sent to the fabrics having missing pairs, the fabrics
+            running concurrently, and every detected pair is reported. When
+            the ports of a fabric report no LLDP link, the VSX configuration
+            is sent and AFC detects the pairs itself.
+        type: bool
+        default: false
+    min_links:
+        description: >
+            Minimum number of links between two switches for them to be
+            detected as a VSX pair when auto is used.
+        type: int
+        default: 1
+    max_parallel:
+        description: >
+            Maximum number of fabrics processed at the same time when auto
+            is used.
+        type: int
+        default: 4
+extends_documentation_fragment:
+    - arubanetworks.afc.reapply_queue
 author: Aruba Networks (@ArubaNetworks)
 """
 
@@ -124,6 +154,23 @@ EXAMPLES = r"""
             keep_alive_interface_mode: "management_interface"
             keep_alive_vrf: "mgmt"
 
+-   name: Detect and create the missing VSX pairs of several fabrics
+    arubanetworks.afc.afc_vsx:
+        afc_ip: "10.10.10.10"
+        afc_username: "afc_admin"
+        afc_password: "afc_password"
+        operation: "create"
+        auto: true
+        min_links: 2
+        data:
+            name: "Test-VSX"
+            fabric:
+                - "Aruba-Fabric-DC1"
+                - "Aruba-Fabric-DC2"
+            system_mac_range: "MAC POOL"
+            keepalive_ip_pool_range: "IP POOL"
+            keep_alive_interface_mode: "loopback"
+
 -   name: Reapply VSX using username and password
     arubanetworks.afc.afc_vsx:
         afc_ip: "10.10.10.10"
@@ -192,15 +239,288 @@ changed:
     type: bool
     returned: always
     sample: True
+results:
+    description: Outcome of each detected VSX pair when auto is used
+    type: list
+    elements: dict
+    returned: when auto is used
+    sample:
+        -   name: "Leaf1/Leaf2"
+            fabric: "Aruba-Fabric-DC1"
+            message: "Successfully created VSX pair"
+            status: True
+            changed: True
 """
 
+import json
+import time
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
+    adjacency_index,
     afc_argument_spec,
     build_auth_data,
     instantiate_afc_object,
+    queue_reapply,
+    run_concurrently,
+    summarize_results,
+    switch_ports,
 )
-from pyafc.fabric import fabric
+from pyafc.common import utils
+from pyafc.fabric import fabric, models
+from pyafc.services import resource_pools
+
+# AFC answers these while the ISL of new pairs are still being discovered
+VSX_RETRY_MESSAGES = [
+    "Minimum two ports required if KA interface mode is P2P",
+    "No new VSX Pairs found",
+]
+VSX_RETRIES = 10
+VSX_RETRY_INTERVAL = 2
+
+
+def detect_vsx_pairs(fabric_switches, links, min_links):
+    """Return the VSX pairs of a fabric and the ambiguous switches.
+
+    Two switches form a pair when they share a role, are linked by at least
+    min_links ports and have no other such peer.
+    """
+    switches = {switch["uuid"]: switch for switch in fabric_switches}
+    candidates = {}
+    for pair, pair_links in links.items():
+        first, second = tuple(pair)
+        if (
+            first in switches
+            and second in switches
+            and switches[first].get("role") == switches[second].get("role")
+            and len(pair_links) >= min_links
+        ):
+            candidates.setdefault(first, []).append(second)
+            candidates.setdefault(second, []).append(first)
+    pairs = []
+    ambiguous = []
+    for uuid, peers in candidates.items():
+        if len(peers) > 1:
+            ambiguous.append((switches[uuid], [switches[p] for p in peers]))
+        elif uuid < peers[0] and candidates[peers[0]] == [uuid]:
+            pairs.append(
+                sorted(
+                    (switches[uuid], switches[peers[0]]),
+                    key=lambda switch: switch.get("name") or "",
+                ),
+            )
+    return sorted(pairs, key=lambda pair: pair[0].get("name") or ""), ambiguous
+
+
+def vsx_members(client, fabric_uuid):
+    """Return the UUIDs of the switches already part of a VSX pair."""
+    request = client.get(f"fabrics/{fabric_uuid}/vsx")
+    return {
+        peer["switch_uuid"]
+        for pair in request.json()["result"] or []
+        for peer in pair.get("vsx_peers") or []
+    }
+
+
+def pair_name(pair):
+    return "/".join(switch.get("name") or switch["uuid"] for switch in pair)
+
+
+def send_vsx_request(client, fabric_uuid, payload):
+    """Send the automated VSX request of a fabric, retrying while busy.
+
+    Returns None on success, otherwise the error returned by AFC.
+    """
+    url_vsx = f"fabrics/{fabric_uuid}/vsxes"
+    request = client.post(url_vsx, data=json.dumps(payload))
+    retries = 0
+    while (
+        request.status_code not in utils.response_ok
+        and any(
+            text in str(request.json()["result"])
+            for text in VSX_RETRY_MESSAGES
+        )
+        and retries < VSX_RETRIES
+    ):
+        time.sleep(VSX_RETRY_INTERVAL)
+        request = client.post(url_vsx, data=json.dumps(payload))
+        retries += 1
+    if request.status_code not in utils.response_ok:
+        return request.json()["result"]
+    return None
+
+
+def auto_vsx_fabric(client, fabric_name, fabric_uuid, payload, min_links):
+    """Detect the VSX pairs of a fabric and create the missing ones.
+
+    AFC creates the VSX pairs of a fabric in one automated request, which
+    is only sent when pairs are missing. Each detected pair is then checked
+    against the VSX configuration read back from AFC.
+    """
+    fabric_switches = client.get(
+        f"switches?fabrics={fabric_uuid}",
+    ).json()["result"] or []
+    results = []
+    if not fabric_switches:
+        return results
+    links = adjacency_index(switch_ports(client, fabric_switches))
+    if not links:
+        # Without LLDP links AFC is left to detect the pairs itself
+        before = vsx_members(client, fabric_uuid)
+        error = send_vsx_request(client, fabric_uuid, payload)
+        if error is not None:
+            return [
+                {
+                    "name": fabric_name,
+                    "fabric": fabric_name,
+                    "message": error,
+                    "status": False,
+                    "changed": False,
+                },
+            ]
+        created = vsx_members(client, fabric_uuid) - before
+        message = (
+            f"No LLDP link found, AFC created {len(created) // 2} VSX pairs"
+        )
+        return [
+            {
+                "name": fabric_name,
+                "fabric": fabric_name,
+                "message": message,
+                "status": True,
+                "changed": bool(created),
+            },
+        ]
+    pairs, ambiguous = detect_vsx_pairs(fabric_switches, links, min_links)
+    for switch, peers in ambiguous:
+        results.append(
+            {
+                "name": switch.get("name"),
+                "fabric": fabric_name,
+                "message": "Several VSX peer candidates: "
+                + ", ".join(peer.get("name") for peer in peers),
+                "status": False,
+                "changed": False,
+            },
+        )
+
+    members = vsx_members(client, fabric_uuid)
+    missing = [
+        pair for pair in pairs
+        if not any(switch["uuid"] in members for switch in pair)
+    ]
+    for pair in pairs:
+        if pair not in missing:
+            results.append(
+                {
+                    "name": pair_name(pair),
+                    "fabric": fabric_name,
+                    "message": "VSX pair already configured. No action taken",
+                    "status": True,
+                    "changed": False,
+                },
+            )
+    if not missing:
+        return results
+
+    error = send_vsx_request(client, fabric_uuid, payload)
+    if error is not None:
+        members = set()
+    else:
+        error = "VSX pair not created by AFC"
+        members = vsx_members(client, fabric_uuid)
+    for pair in missing:
+        created = all(switch["uuid"] in members for switch in pair)
+        results.append(
+            {
+                "name": pair_name(pair),
+                "fabric": fabric_name,
+                "message": (
+                    "Successfully created VSX pair" if created else error
+                ),
+                "status": created,
+                "changed": created,
+            },
+        )
+    return results
+
+
+def auto_vsx(client, data, min_links, max_parallel):
+    """Create the missing VSX pairs of one or several fabrics.
+
+    The fabrics and resource pools are read once, then each fabric is
+    processed concurrently. Returns the per pair results.
+    """
+    fabric_names = data["fabric"]
+    if isinstance(fabric_names, str):
+        fabric_names = [fabric_names]
+    fabrics = {
+        item["name"]: item["uuid"]
+        for item in client.get("fabrics").json()["result"]
+    }
+
+    values = {
+        "name_prefix": data["name"],
+        "keep_alive_interface_mode": data["keep_alive_interface_mode"],
+    }
+    for key, pool_type in [
+        ("system_mac_range", "MAC"),
+        ("keepalive_ip_pool_range", "IPv4"),
+    ]:
+        if data.get(key):
+            pool = resource_pools.Pool.get_resource_pool(
+                client,
+                data[key],
+                pool_type,
+            )
+            if not pool:
+                raise ValueError(f"{data[key]} does not exist")
+            values[key] = pool["uuid"]
+    payload = models.Vsx(**values).dict(exclude_none=True)
+    if data.get("keep_alive_vrf"):
+        payload["keep_alive_vrf"] = data["keep_alive_vrf"]
+
+    results = []
+    found = [name for name in fabric_names if name in fabrics]
+    for name in fabric_names:
+        if name not in fabrics:
+            results.append(
+                {
+                    "name": name,
+                    "fabric": name,
+                    "message": "Fabric does not exist. No action taken",
+                    "status": False,
+                    "changed": False,
+                },
+            )
+    fabric_results = {}
+
+    def process(name):
+        fabric_results[name] = auto_vsx_fabric(
+            client,
+            name,
+            fabrics[name],
+            payload,
+            min_links,
+        )
+        return "", True, False
+
+    for name, outcome in zip(
+        found,
+        run_concurrently(process, found, max_workers=max_parallel),
+    ):
+        if not outcome["status"]:
+            results.append(
+                {
+                    "name": name,
+                    "fabric": name,
+                    "message": outcome["message"],
+                    "status": False,
+                    "changed": False,
+                },
+            )
+        results.extend(fabric_results.get(name, []))
+    return results
 
 
 def main():
@@ -208,6 +528,10 @@ def main():
         **afc_argument_spec(),
         "operation": {"type": "str", "required": False},
         "data": {"type": "dict", "required": True},
+        "reapply_queue": {"type": "path", "required": False},
+        "auto": {"type": "bool", "required": False, "default": False},
+        "min_links": {"type": "int", "required": False, "default": 1},
+        "max_parallel": {"type": "int", "required": False, "default": 4},
     }
 
     ansible_module = AnsibleModule(
@@ -220,12 +544,23 @@ def main():
     password = ansible_module.params["afc_password"]
     operation = ansible_module.params["operation"]
     data = ansible_module.params["data"]
+    reapply_queue = ansible_module.params["reapply_queue"]
+    auto = ansible_module.params["auto"]
 
     result = {"changed": False}
+    results = None
 
     if ansible_module.check_mode:
         ansible_module.exit_json(**result)
 
+    if operation == "reapply" and reapply_queue:
+        message, status, changed = queue_reapply(
+            reapply_queue,
+            ansible_module.params["afc_ip"],
+            {"type": "vsx", "fabric": data["fabric"]},
+        )
+        ansible_module.exit_json(changed=changed, msg=message)
+
     status = False
     changed = False
     message = ""
@@ -236,17 +571,37 @@ def main():
 
     if afc_instance.afc_connected:
 
-        fabric_instance = fabric.Fabric(
-            afc_instance.client,
-            name=data["fabric"],
-        )
-
-        if operation == "create":
-            message, status, changed = fabric_instance.create_vsx(**data)
-        elif operation == "reapply":
-            message, status, changed = fabric_instance.reapply_vsx()
+        if auto and operation == "create":
+            try:
+                results = auto_vsx(
+                    afc_instance.client,
+                    data,
+                    ansible_module.params["min_links"],
+                    ansible_module.params["max_parallel"],
+                )
+            except ValueError as exc:
+                message = str(exc)
+            else:
+                if results:
+                    message, status, changed = summarize_results(
+                        results,
+                        "VSX pairs",
+                    )
+                else:
+                    message = "No VSX pair detected - No action taken"
+                    status = True
         else:
-            message = "Operation not supported - No action taken"
+            fabric_instance = fabric.Fabric(
+                afc_instance.client,
+                name=data["fabric"],
+            )
+
+            if operation == "create":
+                message, status, changed = fabric_instance.create_vsx(**data)
+            elif operation == "reapply":
+                message, status, changed = fabric_instance.reapply_vsx()
+            else:
+                message = "Operation not supported - No action taken"
 
         # Disconnect session if username and password are passed
         if username and password:
@@ -259,11 +614,15 @@ def main():
     result["status"] = status
     result["changed"] = changed
 
+    exit_args = {"changed": changed, "msg": message}
+    if results:
+        exit_args["results"] = results
+
     # Exit
     if status:
-        ansible_module.exit_json(changed=changed, msg=message)
+        ansible_module.exit_json(**exit_args)
     else:
-        ansible_module.fail_json(changed=changed, msg=message)
+        ansible_module.fail_json(**exit_args)
 
 
 if __name__ == "__main__":
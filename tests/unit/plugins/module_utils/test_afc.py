@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+
+# (C) Copyright 2020-2025 Hewlett Packard Enterprise Development LP.
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import threading
+import time
+
+import pytest
+
+from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
+    chunked,
+    config_differences,
+    find_overlaps,
+    locked_json_file,
+    queue_reapply,
+    run_grouped,
+    run_rolling,
+    subtract_intervals,
+    vlan_intervals,
+)
+
+
+def test_chunked_splits_in_order():
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_chunked_accepts_generators_and_empty_input():
+    assert list(chunked((item for item in "abc"), 2)) == [["a", "b"], ["c"]]
+    assert list(chunked([], 5)) == []
+
+
+def test_chunked_sizes_below_one_send_one_item_per_chunk():
+    assert list(chunked([1, 2], 0)) == [[1], [2]]
+    assert list(chunked([1, 2], None)) == [[1], [2]]
+
+
+def test_find_overlaps_without_overlap():
+    assert find_overlaps([(1, 5, "a"), (6, 9, "b"), (20, 30, "c")]) == []
+
+
+def test_find_overlaps_reports_touching_and_nested_intervals():
+    overlaps = find_overlaps(
+        [(10, 20, "outer"), (1, 10, "left"), (12, 15, "inner")],
+    )
+    assert ("left", "outer") in overlaps
+    assert ("outer", "inner") in overlaps
+
+
+def test_find_overlaps_keeps_the_furthest_reaching_interval():
+    # c only overlaps a, which reaches further than the shorter b
+    overlaps = find_overlaps([(1, 100, "a"), (2, 3, "b"), (50, 60, "c")])
+    assert overlaps == [("a", "b"), ("a", "c")]
+
+
+def test_find_overlaps_reports_every_overlapping_interval():
+    intervals = [(start, start + 4, start) for start in range(0, 50, 3)]
+    keys = {key for pair in find_overlaps(intervals) for key in pair}
+    assert keys == {start for start, _end, _key in intervals}
+
+
+def test_locked_json_file_reads_missing_and_invalid_files_as_empty(tmp_path):
+    path = tmp_path / "cache.json"
+    with locked_json_file(str(path)) as content:
+        assert content == {}
+    assert not path.exists()
+
+    path.write_text("{not json")
+    with locked_json_file(str(path)) as content:
+        assert content == {}
+
+
+def test_locked_json_file_writes_only_changed_content(tmp_path):
+    path = tmp_path / "cache.json"
+    with locked_json_file(str(path)) as content:
+        content["afc"] = {"digest": {"collection": "rules"}}
+    assert json.loads(path.read_text()) == {
+        "afc": {"digest": {"collection": "rules"}},
+    }
+
+    # An unchanged object leaves the file as it was, formatting included
+    path.write_text(path.read_text() + "\n")
+    before = path.read_text()
+    with locked_json_file(str(path)) as content:
+        assert content["afc"]["digest"] == {"collection": "rules"}
+    assert path.read_text() == before
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_locked_json_file_serializes_concurrent_updates(tmp_path):
+    path = str(tmp_path / "cache.json")
+
+    def record(key):
+        with locked_json_file(path) as content:
+            content[key] = True
+
+    threads = [
+        threading.Thread(target=record, args=(f"key{index}",))
+        for index in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with open(path) as cache:
+        assert len(json.load(cache)) == 20
+
+
+def test_queue_reapply_records_each_object_once(tmp_path):
+    path = str(tmp_path / "queue.json")
+    target = {
+        "type": "overlay",
+        "fabric": "Fabric1",
+        "vrf": "default",
+        "name": "Overlay1",
+    }
+
+    assert queue_reapply(path, "10.10.10.10", target) == (
+        "Reapply of overlay/Fabric1/default/Overlay1 queued",
+        True,
+        True,
+    )
+    assert queue_reapply(path, "10.10.10.10", dict(target)) == (
+        "Reapply of overlay/Fabric1/default/Overlay1 already queued",
+        True,
+        False,
+    )
+    with open(path) as queue:
+        assert json.load(queue) == {"10.10.10.10": [target]}
+
+
+def test_queue_reapply_drops_unset_keys_and_separates_afcs(tmp_path):
+    path = str(tmp_path / "queue.json")
+    queue_reapply(path, "10.10.10.10", {"type": "vsx", "fabric": "F"})
+    _message, _status, changed = queue_reapply(
+        path,
+        "10.10.10.10",
+        {"type": "vsx", "fabric": "F", "vrf": None, "name": None},
+    )
+    assert not changed
+    assert queue_reapply(
+        path,
+        "10.10.10.11",
+        {"type": "vsx", "fabric": "F"},
+    )[2]
+    with open(path) as queue:
+        assert json.load(queue) == {
+            "10.10.10.10": [{"type": "vsx", "fabric": "F"}],
+            "10.10.10.11": [{"type": "vsx", "fabric": "F"}],
+        }
+
+
+def test_run_grouped_serializes_each_group_and_keeps_item_order():
+    lock = threading.Lock()
+    active = {}
+    overlapping = []
+
+    def worker(item):
+        group, index = item
+        with lock:
+            active[group] = active.get(group, 0) + 1
+            if active[group] > 1:
+                overlapping.append(item)
+        time.sleep(0.01)
+        with lock:
+            active[group] -= 1
+        if index == 1:
+            raise ValueError(f"{group} failed")
+        return f"{group}{index}", True, index == 0
+
+    items = [(group, index) for index in range(3) for group in "abc"]
+    results = run_grouped(worker, items, key=lambda item: item[0])
+    assert not overlapping
+    assert [result["message"] for result in results] == [
+        "a0", "b0", "c0", "a failed", "b failed", "c failed",
+        "a2", "b2", "c2",
+    ]
+    assert [result["changed"] for result in results[:3]] == [True] * 3
+    assert not any(result["status"] for result in results[3:6])
+
+
+def test_run_grouped_runs_groups_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def worker(item):
+        # Both groups must be running at the same time to pass the barrier
+        barrier.wait()
+        return item, True, False
+
+    results = run_grouped(worker, ["a", "b"], key=lambda item: item)
+    assert all(result["status"] for result in results)
+
+
+def test_config_differences_compares_the_wanted_keys_only():
+    current = {
+        "name": "Overlay1",
+        "ipv4_address": "10.0.0.1",
+        "keepalive": {"interval": 1, "timeout": 3},
+        "uuid": "o1",
+    }
+    wanted = {
+        "ipv4_address": "10.0.0.2",
+        "keepalive": {"interval": 1, "timeout": 5},
+        "unknown": True,
+    }
+    assert config_differences(current, wanted) == [
+        "ipv4_address",
+        "keepalive.timeout",
+    ]
+    assert config_differences(current, {"name": "Overlay1"}) == []
+
+
+def test_config_differences_compares_lists_regardless_of_order():
+    current = {
+        "route_targets": [
+            {"as_number": "65000:2", "address_family": "evpn", "uuid": "b"},
+            {"as_number": "65000:1", "address_family": "evpn", "uuid": "a"},
+        ],
+        "switches": ["s1", "s2"],
+    }
+    wanted = {
+        "route_targets": [
+            {"as_number": "65000:1", "address_family": "evpn"},
+            {"as_number": "65000:2", "address_family": "evpn"},
+        ],
+        "switches": ["s2", "s1"],
+    }
+    assert config_differences(current, wanted) == []
+    wanted["route_targets"].pop()
+    wanted["switches"].append("s3")
+    assert config_differences(current, wanted) == [
+        "route_targets",
+        "switches",
+    ]
+
+
+def test_vlan_intervals_sorts_and_merges_ranges():
+    assert vlan_intervals("30-40,1,2-3,41,100") == [
+        (1, 3),
+        (30, 41),
+        (100, 100),
+    ]
+    assert vlan_intervals(["10-20", 15, "5-12"]) == [(5, 20)]
+    assert vlan_intervals("") == []
+
+
+def test_vlan_intervals_rejects_invalid_ranges():
+    for value in ["0", "20-10", "4095"]:
+        with pytest.raises(ValueError, match="Invalid VLAN range"):
+            vlan_intervals(value)
+
+
+def test_subtract_intervals():
+    intervals = [(1, 100), (200, 300)]
+    assert subtract_intervals(intervals, []) == intervals
+    assert subtract_intervals(intervals, [(1, 300)]) == []
+    removed = [(50, 60), (95, 210), (300, 400)]
+    assert subtract_intervals(intervals, removed) == [
+        (1, 49),
+        (61, 94),
+        (211, 299),
+    ]
+    assert subtract_intervals([(10, 20)], [(1, 5), (25, 30)]) == [(10, 20)]
+
+
+def test_subtract_intervals_matches_set_difference():
+    wanted = vlan_intervals("1-500,1000-1999,4000")
+    removed = vlan_intervals("2,400-1200,1500,3000-4094")
+    expected = set(range(1, 501)) | set(range(1000, 2000)) | {4000}
+    expected -= {2, 1500} | set(range(400, 1201)) | set(range(3000, 4095))
+    result = subtract_intervals(wanted, removed)
+    assert {
+        vlan for first, last in result for vlan in range(first, last + 1)
+    } == expected
+
+
+def test_run_rolling_runs_batches_in_order():
+    started = []
+
+    def worker(item):
+        started.append(item)
+        return f"done {item}", True, True
+
+    results = run_rolling(worker, range(5), batch_size=2)
+    assert [result["batch"] for result in results] == [1, 1, 2, 2, 3]
+    assert [result["message"] for result in results] == [
+        f"done {item}" for item in range(5)
+    ]
+    # A batch only starts once the previous one is done
+    assert set(started[:2]) == {0, 1}
+    assert set(started[2:4]) == {2, 3}
+
+
+def test_run_rolling_aborts_when_max_fail_percentage_is_exceeded():
+    processed = []
+
+    def worker(item):
+        processed.append(item)
+        return "failed" if item == 3 else "ok", item != 3, item != 3
+
+    results = run_rolling(
+        worker,
+        range(8),
+        batch_size=4,
+        max_fail_percentage=20,
+    )
+    assert sorted(processed) == [0, 1, 2, 3]
+    assert [result["status"] for result in results[:4]] == [
+        True, True, True, False,
+    ]
+    assert results[4:] == [
+        {
+            "message": "Skipped - max_fail_percentage exceeded in batch 1",
+            "status": False,
+            "changed": False,
+            "elapsed": 0,
+            "batch": 2,
+        },
+    ] * 4
+
+
+def test_run_rolling_tolerates_failures_up_to_max_fail_percentage():
+    def worker(item):
+        return "", item % 4 != 0, False
+
+    results = run_rolling(
+        worker,
+        range(8),
+        batch_size=4,
+        max_fail_percentage=25,
+    )
+    assert [result["batch"] for result in results] == [1] * 4 + [2] * 4
+    assert sum(not result["status"] for result in results) == 2
+
+
+def test_run_rolling_gate_can_fail_a_batch():
+    def gate(batch, outcomes):
+        for item, outcome in zip(batch, outcomes):
+            if item == 1:
+                outcome.update(message="not healthy", status=False)
+
+    results = run_rolling(
+        lambda item: ("ok", True, True),
+        range(4),
+        batch_size=2,
+        gate=gate,
+    )
+    assert results[1]["message"] == "not healthy"
+    assert [result["status"] for result in results] == [
+        True, False, False, False,
+    ]
+    assert results[2]["batch"] == 2
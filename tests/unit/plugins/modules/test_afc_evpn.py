@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# (C) Copyright 2020-2025 Hewlett Packard Enterprise Development LP.
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import random
+
+import pytest
+
+from ansible_collections.arubanetworks.afc.plugins.modules import afc_evpn
+
+
+def lowest_free_base(first, last, used, vlans):
+    """Find the VNI base by trying every base, as a reference."""
+    for base in range(last + 1):
+        vnis = [base + vlan for vlan in vlans]
+        if all(first <= vni <= last and vni not in used for vni in vnis):
+            return base
+    return None
+
+
+def test_allocate_uses_the_lowest_free_base():
+    allocator = afc_evpn.VniAllocator("10000-10999", [10100, 10101])
+    assert allocator.allocate([100, 101]) == 9900
+    # 10000 and 10001 are now used, next free window starts at 10002
+    assert allocator.allocate([100, 101]) == 9902
+
+
+def test_allocate_places_vlans_around_used_vnis():
+    # VNI 12 stays between the VNIs 11 and 13 of VLANs 10 and 12
+    allocator = afc_evpn.VniAllocator("1-20", [12])
+    assert allocator.allocate([10, 12]) == 1
+    assert allocator.allocate([10, 11]) == 4
+
+
+def test_allocate_returns_none_when_the_pool_is_full():
+    allocator = afc_evpn.VniAllocator("100-104", [102])
+    assert allocator.allocate([1, 2, 3, 4, 5]) is None
+    assert allocator.allocate([1, 2]) == 99
+    assert allocator.allocate([1, 2]) == 102
+    assert allocator.allocate([1]) is None
+
+
+def test_allocate_never_uses_a_negative_base():
+    allocator = afc_evpn.VniAllocator("1-4000", [])
+    assert allocator.allocate([100]) == 0
+
+
+def test_pool_bounds_are_validated():
+    with pytest.raises(ValueError, match="Invalid VNI pool"):
+        afc_evpn.VniAllocator("200-100", [])
+    with pytest.raises(ValueError, match="Invalid VNI pool"):
+        afc_evpn.VniAllocator("0-100", [])
+
+
+def test_allocate_matches_an_exhaustive_search():
+    generator = random.Random(7)
+    for _trial in range(200):
+        first = generator.randint(1, 50)
+        last = first + generator.randint(0, 120)
+        used = {
+            generator.randint(first, last)
+            for _index in range(generator.randint(0, 40))
+        }
+        vlans = sorted(generator.sample(range(1, 60), generator.randint(1, 8)))
+        allocator = afc_evpn.VniAllocator(f"{first}-{last}", used)
+        expected = lowest_free_base(first, last, used, vlans)
+        assert allocator.allocate(vlans) == expected
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# (C) Copyright 2020-2025 Hewlett Packard Enterprise Development LP.
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.arubanetworks.afc.plugins.modules import afc_fabric
+
+FABRICS = {"DC1": "f1", "DC2": "f2"}
+
+INVENTORY = [
+    {"uuid": "s1", "name": "spine1", "ip_address": "10.0.0.1"},
+    {"uuid": "s2", "name": "leaf1", "ip_address": "10.0.0.2"},
+    {"uuid": "s3", "name": "leaf2", "ip_address": "10.0.0.3"},
+    {
+        "uuid": "s4",
+        "name": "leaf3",
+        "ip_address": "10.0.0.4",
+        "fabric_uuid": "f1",
+    },
+]
+
+
+def test_plan_assignments_resolves_ranges_names_and_roles():
+    plans = afc_fabric.plan_assignments(
+        FABRICS,
+        INVENTORY,
+        {"DC1": {"spine1": "spine", "10.0.0.2-10.0.0.5": "leaf"}},
+    )
+    assert len(plans) == 1
+    assert plans[0]["uuid"] == "f1"
+    assert plans[0]["roles"] == {"spine": ["s1"], "leaf": ["s2", "s3"]}
+    assert plans[0]["result"] == {
+        "name": "DC1",
+        "assigned": ["spine1", "10.0.0.2", "10.0.0.3"],
+        "skipped": ["10.0.0.4"],
+        "undiscovered": ["10.0.0.5"],
+    }
+
+
+def test_plan_assignments_reports_missing_fabrics_and_invalid_roles():
+    missing, invalid = afc_fabric.plan_assignments(
+        FABRICS,
+        INVENTORY,
+        {"DC9": {"spine1": "spine"}, "DC2": {"leaf1": "core"}},
+    )
+    assert missing["uuid"] is None
+    assert missing["result"]["status"] is False
+    assert invalid["result"]["message"] == "Invalid role core for leaf1"
+    assert invalid["roles"] == {}
+
+
+def test_plan_assignments_refuses_a_switch_requested_twice():
+    first, second = afc_fabric.plan_assignments(
+        FABRICS,
+        INVENTORY,
+        {
+            "DC1": {"leaf1": "leaf"},
+            "DC2": {"leaf2": "leaf", "10.0.0.2": "leaf"},
+        },
+    )
+    assert first["roles"] == {"leaf": ["s2"]}
+    assert second["result"]["message"] == (
+        "Switch 10.0.0.2 is also assigned to DC1"
+    )
+    # Nothing is kept from the invalid request, leaf2 stays available
+    assert second["roles"] == {}
+    assert second["result"]["assigned"] == []
+    third = afc_fabric.plan_assignments(
+        FABRICS,
+        INVENTORY,
+        {"DC1": {"leaf1": "leaf", "10.0.0.2": "leaf"}},
+    )[0]
+    assert third["roles"] == {"leaf": ["s2"]}
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# (C) Copyright 2020-2025 Hewlett Packard Enterprise Development LP.
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.arubanetworks.afc.plugins.modules import (
+    afc_ip_interface,
+)
+
+
+class FakeResponse:
+    def __init__(self, result):
+        self.result = result
+
+    def json(self):
+        return {"result": self.result}
+
+
+class FakeClient:
+    """Answer the GET requests of the planner from fixed collections."""
+
+    def __init__(self, interfaces):
+        self.requests = []
+        self.collections = {
+            "fabrics": [{"name": "Fabric1", "uuid": "f1"}],
+            "switches?fabrics=f1": [
+                {
+                    "uuid": f"s{index}",
+                    "name": f"leaf{index}",
+                    "ip_address": f"10.0.0.{index}",
+                    "role": "leaf",
+                }
+                for index in range(1, 4)
+            ],
+            "vrfs?fabrics=f1": [{"name": "Tenant", "uuid": "v1"}],
+            "vrfs/v1/ip_interfaces": interfaces,
+        }
+
+    def get(self, path):
+        self.requests.append(path)
+        return FakeResponse(self.collections[path])
+
+
+def svi(vlan, address, switches, prefix_length=24):
+    return {
+        "fabric": "Fabric1",
+        "vrf": "Tenant",
+        "name": f"VLAN{vlan}",
+        "if_type": "vlan",
+        "vlan": vlan,
+        "ipv4_primary_address": {
+            "address": address,
+            "prefix_length": prefix_length,
+        },
+        "switches": switches,
+    }
+
+
+EXISTING = {
+    "uuid": "i1",
+    "name": "VLAN10",
+    "if_type": "vlan",
+    "vlan": 10,
+    "switch_uuid": "s1",
+    "ipv4_primary_address": {"address": "10.1.10.2", "prefix_length": 24},
+}
+
+
+def addresses(records):
+    return [
+        (record["switch_uuid"], record["ipv4_primary_address"]["address"])
+        for record in records
+    ]
+
+
+def test_plan_hands_out_free_range_addresses_and_skips_existing():
+    planner = afc_ip_interface.InterfacePlanner(FakeClient([EXISTING]))
+    vrf_uuid, records = planner.plan(
+        svi(10, "10.1.10.1-10.1.10.9", ["all"]),
+    )
+    assert vrf_uuid == "v1"
+    # s1 already has VLAN 10 and its address stays reserved
+    assert addresses(records) == [("s2", "10.1.10.1"), ("s3", "10.1.10.3")]
+    assert records[0]["switch_name"] == "leaf2"
+
+
+def test_plan_reads_each_collection_once():
+    client = FakeClient([])
+    planner = afc_ip_interface.InterfacePlanner(client)
+    planner.plan(svi(20, "10.1.20.1-10.1.20.9", ["all"]))
+    planner.plan(svi(30, "10.1.30.1-10.1.30.9", ["leaf"]))
+    assert sorted(client.requests) == sorted(client.collections)
+
+
+def test_plan_rejects_a_subnet_overlapping_another_vlan():
+    planner = afc_ip_interface.InterfacePlanner(FakeClient([EXISTING]))
+    with pytest.raises(ValueError, match="overlaps VLAN10"):
+        planner.plan(svi(20, "10.1.10.128", ["leaf2"], prefix_length=25))
+
+
+def test_plan_releases_the_records_of_a_failed_item():
+    planner = afc_ip_interface.InterfacePlanner(FakeClient([]))
+    with pytest.raises(ValueError, match="Not enough IP addresses"):
+        planner.plan(svi(20, "10.1.20.1-10.1.20.2", ["all"]))
+    _vrf_uuid, records = planner.plan(
+        svi(30, "10.1.20.1-10.1.20.3", ["all"]),
+    )
+    assert len(records) == 3
+
+
+def test_plan_rejects_conflicts_between_requested_interfaces():
+    planner = afc_ip_interface.InterfacePlanner(FakeClient([]))
+    planner.plan(svi(20, "10.1.20.1", ["leaf1"]))
+    with pytest.raises(ValueError, match="overlaps"):
+        planner.plan(svi(21, "10.1.20.5", ["leaf2"]))
+
+
+def test_plan_lets_svis_of_one_vlan_share_their_subnet():
+    planner = afc_ip_interface.InterfacePlanner(FakeClient([EXISTING]))
+    _vrf_uuid, records = planner.plan(svi(10, "10.1.10.1", ["leaf2"]))
+    assert addresses(records) == [("s2", "10.1.10.1")]
+
+
+def test_plan_update_keeps_an_address_inside_the_new_range():
+    planner = afc_ip_interface.InterfacePlanner(FakeClient([EXISTING]))
+    _vrf_uuid, changes = planner.plan_update(
+        {
+            "fabric": "Fabric1",
+            "vrf": "Tenant",
+            "name": "VLAN10",
+            "ipv4_primary_address": {
+                "address": "10.1.10.1-10.1.10.5",
+                "prefix_length": 24,
+            },
+            "description": "Web",
+        },
+    )
+    assert [(uuid, operations) for uuid, operations, _record in changes] == [
+        ("i1", [{"op": "replace", "path": "/description", "value": "Web"}]),
+    ]
+
+
+def test_plan_update_requires_the_interface():
+    planner = afc_ip_interface.InterfacePlanner(FakeClient([EXISTING]))
+    with pytest.raises(ValueError, match="VLAN20 not found on leaf1"):
+        planner.plan_update(
+            {
+                "fabric": "Fabric1",
+                "vrf": "Tenant",
+                "name": "VLAN20",
+                "switches": ["leaf1"],
+            },
+        )
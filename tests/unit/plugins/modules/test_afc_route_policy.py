@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+# (C) Copyright 2020-2025 Hewlett Packard Enterprise Development LP.
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.arubanetworks.afc.plugins.modules import (
+    afc_route_policy,
+)
+
+
+def entry(seq, prefix, **bounds):
+    return afc_route_policy.normalize_prefix_entry(
+        {"seq": seq, "prefix": prefix, **bounds},
+        0,
+    )
+
+
+def trie_of(*entries):
+    trie = afc_route_policy.PrefixTrie()
+    for item in entries:
+        trie.insert(item)
+    return trie
+
+
+def test_shadowing_by_a_covering_prefix_with_le():
+    covering = entry(10, "10.0.0.0/8", le=32)
+    trie = trie_of(covering)
+    assert trie.shadowing(entry(20, "10.1.0.0/16")) is covering
+    assert trie.shadowing(entry(20, "10.1.2.0/24", ge=25, le=28)) is covering
+
+
+def test_exact_prefix_does_not_shadow_longer_prefixes():
+    trie = trie_of(entry(10, "10.0.0.0/8"))
+    assert trie.shadowing(entry(20, "10.1.0.0/16")) is None
+    assert trie.shadowing(entry(20, "10.0.0.0/8", le=24)) is None
+
+
+def test_length_ranges_must_contain_the_later_entry():
+    trie = trie_of(entry(10, "10.0.0.0/8", ge=16, le=24))
+    assert trie.shadowing(entry(20, "10.1.0.0/16", le=24)) is not None
+    assert trie.shadowing(entry(20, "10.1.0.0/16", le=28)) is None
+    assert trie.shadowing(entry(20, "10.1.2.0/24", ge=25)) is None
+
+
+def test_disjoint_prefixes_do_not_shadow():
+    trie = trie_of(entry(10, "10.0.0.0/8", le=32))
+    assert trie.shadowing(entry(20, "11.0.0.0/8", le=32)) is None
+    assert trie.shadowing(entry(20, "0.0.0.0/0", le=32)) is None
+
+
+def test_any_shadows_every_later_entry():
+    any_entry = entry(10, "any")
+    trie = trie_of(any_entry)
+    assert trie.shadowing(entry(20, "192.168.1.0/24")) is any_entry
+    assert trie.shadowing(entry(20, "10.0.0.0/8", ge=9, le=32)) is any_entry
+
+
+def test_check_prefix_entries_reports_duplicates_and_shadowed_entries():
+    duplicates, shadowed = afc_route_policy.check_prefix_entries(
+        [
+            entry(30, "10.1.0.0/16"),
+            entry(10, "10.0.0.0/8", le=24),
+            entry(20, "10.0.0.0/8", le=24),
+            entry(40, "172.16.0.0/12"),
+        ],
+    )
+    assert duplicates == ["seq 20 duplicates seq 10"]
+    assert shadowed == ["seq 30 is shadowed by seq 10"]
+
+
+def test_check_prefix_entries_follows_sequence_numbers():
+    # The covering entry only comes later, so nothing is shadowed
+    duplicates, shadowed = afc_route_policy.check_prefix_entries(
+        [entry(10, "10.1.0.0/16"), entry(20, "10.0.0.0/8", le=32)],
+    )
+    assert duplicates == []
+    assert shadowed == []
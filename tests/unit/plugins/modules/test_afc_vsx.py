@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# (C) Copyright 2020-2025 Hewlett Packard Enterprise Development LP.
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.arubanetworks.afc.plugins.module_utils.afc import (
+    adjacency_index,
+)
+from ansible_collections.arubanetworks.afc.plugins.modules import afc_vsx
+
+SWITCHES = [
+    {"uuid": "s1", "name": "leaf1a", "role": "leaf"},
+    {"uuid": "s2", "name": "leaf1b", "role": "leaf"},
+    {"uuid": "s3", "name": "leaf2a", "role": "leaf"},
+    {"uuid": "s4", "name": "leaf2b", "role": "leaf"},
+    {"uuid": "s5", "name": "spine1", "role": "spine"},
+    {"uuid": "s6", "name": "leaf3", "role": "leaf"},
+]
+
+
+def links(*pairs):
+    """Return the LLDP adjacency of pairs given as (first, second, count)."""
+    ports = []
+    for first, second, count in pairs:
+        for index in range(count):
+            ports.append(
+                {
+                    "uuid": f"{first}-{second}-{index}",
+                    "switch_uuid": first,
+                    "neighbors": [
+                        {
+                            "switch_uuid": second,
+                            "port_uuid": f"{second}-{first}-{index}",
+                        },
+                    ],
+                },
+            )
+    return adjacency_index(ports)
+
+
+def names(pairs):
+    return [[switch["name"] for switch in pair] for pair in pairs]
+
+
+def test_detect_vsx_pairs_pairs_switches_of_one_role():
+    pairs, ambiguous = afc_vsx.detect_vsx_pairs(
+        SWITCHES,
+        links(("s2", "s1", 2), ("s3", "s4", 2), ("s1", "s5", 2)),
+        2,
+    )
+    assert names(pairs) == [["leaf1a", "leaf1b"], ["leaf2a", "leaf2b"]]
+    assert ambiguous == []
+
+
+def test_detect_vsx_pairs_requires_min_links():
+    pairs, _ambiguous = afc_vsx.detect_vsx_pairs(
+        SWITCHES,
+        links(("s1", "s2", 1), ("s3", "s4", 2)),
+        2,
+    )
+    assert names(pairs) == [["leaf2a", "leaf2b"]]
+
+
+def test_detect_vsx_pairs_reports_switches_with_several_peers():
+    pairs, ambiguous = afc_vsx.detect_vsx_pairs(
+        SWITCHES,
+        links(("s1", "s2", 2), ("s1", "s6", 2), ("s3", "s4", 2)),
+        2,
+    )
+    assert names(pairs) == [["leaf2a", "leaf2b"]]
+    assert [
+        (switch["name"], sorted(peer["name"] for peer in peers))
+        for switch, peers in ambiguous
+    ] == [("leaf1a", ["leaf1b", "leaf3"])]
+
+
+def test_detect_vsx_pairs_ignores_switches_outside_the_fabric():
+    pairs, ambiguous = afc_vsx.detect_vsx_pairs(
+        SWITCHES[:1],
+        links(("s1", "s2", 2)),
+        2,
+    )
+    assert pairs == []
+    assert ambiguous == []